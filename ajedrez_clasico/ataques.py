@@ -0,0 +1,159 @@
+"""Tablas de ataque precalculadas al importar el módulo.
+
+Para cada casilla 0..63 se guardan los destinos de las piezas de salto
+(caballo, rey) y las capturas de peón por color, en dos formas:
+- Máscara de 64 bits (para consultas de jaque y operaciones con bitboards)
+- Lista de casillas (para generar movimientos sin recomprobar bordes)
+"""
+from typing import Dict, Iterator, List, Tuple
+from .bitboards import BB_CASILLAS
+
+DESPLAZAMIENTOS_CABALLO = (
+    (1, 2), (2, 1), (2, -1), (1, -2),
+    (-1, -2), (-2, -1), (-2, 1), (-1, 2),
+)
+DESPLAZAMIENTOS_REY = (
+    (-1, -1), (-1, 0), (-1, 1), (0, -1),
+    (0, 1), (1, -1), (1, 0), (1, 1),
+)
+
+
+def _destinos(sq: int, desplazamientos) -> List[int]:
+    """Casillas alcanzables desde `sq` con los desplazamientos dados."""
+    x, y = sq & 7, sq >> 3
+    return [
+        (x + dx) + 8 * (y + dy)
+        for dx, dy in desplazamientos
+        if 0 <= x + dx < 8 and 0 <= y + dy < 8
+    ]
+
+
+def _mascara(casillas: List[int]) -> int:
+    bb = 0
+    for sq in casillas:
+        bb |= BB_CASILLAS[sq]
+    return bb
+
+
+def _construir(desplazamientos) -> Tuple[List[List[int]], List[int]]:
+    listas = [_destinos(sq, desplazamientos) for sq in range(64)]
+    return listas, [_mascara(lista) for lista in listas]
+
+
+# ===== PIEZAS DE SALTO =====
+SALTOS_CABALLO, ATAQUES_CABALLO = _construir(DESPLAZAMIENTOS_CABALLO)
+SALTOS_REY, ATAQUES_REY = _construir(DESPLAZAMIENTOS_REY)
+
+# ===== CAPTURAS DE PEÓN (indexadas por lado y casilla) =====
+_capturas_blancas = _construir(((-1, 1), (1, 1)))
+_capturas_negras = _construir(((-1, -1), (1, -1)))
+CAPTURAS_PEON: List[List[List[int]]] = [_capturas_blancas[0], _capturas_negras[0]]
+ATAQUES_PEON: List[List[int]] = [_capturas_blancas[1], _capturas_negras[1]]
+
+# ===== PIEZAS DESLIZANTES =====
+# Tablas tipo PEXT: por casilla, un dict indexado por los bloqueadores
+# relevantes (`ocupadas & mascara`) que devuelve el bitboard de ataques.
+DIRECCIONES_TORRE = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DIRECCIONES_ALFIL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def ataques_rayos(sq: int, ocupadas: int, direcciones) -> int:
+    """Ataques deslizantes recorriendo cada rayo casilla a casilla (referencia)."""
+    ataques = 0
+    x, y = sq & 7, sq >> 3
+    for dx, dy in direcciones:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < 8 and 0 <= ny < 8:
+            bit = BB_CASILLAS[nx + 8 * ny]
+            ataques |= bit
+            if ocupadas & bit:
+                break
+            nx += dx
+            ny += dy
+    return ataques
+
+
+def _mascara_relevante(sq: int, direcciones) -> int:
+    """Casillas cuyo bloqueo cambia los ataques (los bordes de cada rayo no cuentan)."""
+    mascara = 0
+    x, y = sq & 7, sq >> 3
+    for dx, dy in direcciones:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx + dx < 8 and 0 <= ny + dy < 8:
+            mascara |= BB_CASILLAS[nx + 8 * ny]
+            nx += dx
+            ny += dy
+    return mascara
+
+
+def _subconjuntos(mascara: int) -> Iterator[int]:
+    """Itera todos los subconjuntos de bits de `mascara`, empezando por 0."""
+    subconjunto = 0
+    while True:
+        yield subconjunto
+        subconjunto = (subconjunto - mascara) & mascara
+        if not subconjunto:
+            return
+
+
+def _tabla_deslizante(sq: int, direcciones) -> Dict[int, int]:
+    """Enumera todos los subconjuntos de la máscara relevante (carry-rippler).
+
+    Cada rayo se resuelve por separado (pocos bloqueadores posibles) y las
+    entradas completas se componen uniendo los cuatro resultados.
+    """
+    rayos = []
+    for direccion in direcciones:
+        mascara_rayo = _mascara_relevante(sq, (direccion,))
+        rayos.append((mascara_rayo, {
+            sub: ataques_rayos(sq, sub, (direccion,))
+            for sub in _subconjuntos(mascara_rayo)
+        }))
+    (m0, t0), (m1, t1), (m2, t2), (m3, t3) = rayos
+    return {
+        sub: t0[sub & m0] | t1[sub & m1] | t2[sub & m2] | t3[sub & m3]
+        for sub in _subconjuntos(m0 | m1 | m2 | m3)
+    }
+
+
+MASCARA_TORRE = [_mascara_relevante(sq, DIRECCIONES_TORRE) for sq in range(64)]
+MASCARA_ALFIL = [_mascara_relevante(sq, DIRECCIONES_ALFIL) for sq in range(64)]
+TABLA_TORRE = [_tabla_deslizante(sq, DIRECCIONES_TORRE) for sq in range(64)]
+TABLA_ALFIL = [_tabla_deslizante(sq, DIRECCIONES_ALFIL) for sq in range(64)]
+
+
+def ataques_torre(sq: int, ocupadas: int) -> int:
+    """Ataques de torre desde `sq` con la ocupación dada (incluye piezas propias)."""
+    return TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]]
+
+
+def ataques_alfil(sq: int, ocupadas: int) -> int:
+    """Ataques de alfil desde `sq` con la ocupación dada (incluye piezas propias)."""
+    return TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]]
+
+
+def ataques_reina(sq: int, ocupadas: int) -> int:
+    """Unión de ataques de torre y alfil."""
+    return TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]] | TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]]
+
+
+# ===== ALINEACIONES =====
+def _entre(a: int, b: int) -> int:
+    """Casillas estrictamente entre `a` y `b` si están en la misma línea; si no, 0."""
+    ax, ay, bx, by = a & 7, a >> 3, b & 7, b >> 3
+    dx, dy = bx - ax, by - ay
+    if a == b or not (dx == 0 or dy == 0 or abs(dx) == abs(dy)):
+        return 0
+    paso_x = (dx > 0) - (dx < 0)
+    paso_y = (dy > 0) - (dy < 0)
+    mascara = 0
+    x, y = ax + paso_x, ay + paso_y
+    while (x, y) != (bx, by):
+        mascara |= BB_CASILLAS[x + 8 * y]
+        x += paso_x
+        y += paso_y
+    return mascara
+
+
+# ENTRE[a][b]: bloqueadores posibles entre dos casillas alineadas (clavadas, interposiciones)
+ENTRE: List[List[int]] = [[_entre(a, b) for b in range(64)] for a in range(64)]
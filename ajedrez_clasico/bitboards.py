@@ -0,0 +1,96 @@
+"""Utilidades de bitboards (enteros de 64 bits) para el tablero clásico.
+
+Convenciones:
+- Casilla `sq = x + 8 * y`, con x = columna (a..h -> 0..7) e y = fila - 1,
+  igual que `chess.square(columna, fila)` en python-chess
+- Índices compactos de color (0 blancas, 1 negras) y de tipo de pieza (0..5)
+- Índice de pieza `lado * 6 + tipo` para los 12 bitboards del tablero
+"""
+from typing import Iterator, List, Tuple
+from modelos import Color, TipoPieza
+
+# ===== COLORES Y TIPOS =====
+BLANCO = 0
+NEGRO = 1
+
+PEON = 0
+CABALLO = 1
+ALFIL = 2
+TORRE = 3
+REINA = 4
+REY = 5
+
+COLORES = [Color.BLANCO, Color.NEGRO]
+TIPOS = [
+    TipoPieza.PEON, TipoPieza.CABALLO, TipoPieza.ALFIL,
+    TipoPieza.TORRE, TipoPieza.REINA, TipoPieza.REY,
+]
+INDICE_COLOR = {color: i for i, color in enumerate(COLORES)}
+INDICE_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+# Letra FEN de cada tipo (minúscula = negras), en el mismo orden que TIPOS
+LETRAS_PIEZA = "pnbrqk"
+
+# ===== MÁSCARAS =====
+BB_VACIO = 0
+BB_TODO = 0xFFFF_FFFF_FFFF_FFFF
+BB_CASILLAS = [1 << sq for sq in range(64)]
+BB_COLUMNAS = [0x0101_0101_0101_0101 << x for x in range(8)]
+BB_FILAS = [0xFF << (8 * y) for y in range(8)]
+
+# Tuplas (x, y) precalculadas para no construirlas en los bucles calientes
+POSICIONES: List[Tuple[int, int]] = [(sq & 7, sq >> 3) for sq in range(64)]
+
+
+def casilla(pos: Tuple[int, int]) -> int:
+    """Convierte una posición (x, y) en índice de casilla 0..63."""
+    return pos[0] + 8 * pos[1]
+
+
+def es_posicion_valida(pos) -> bool:
+    """Indica si `pos` es una tupla (x, y) dentro del tablero."""
+    try:
+        x, y = pos
+    except (TypeError, ValueError):
+        return False
+    return 0 <= x < 8 and 0 <= y < 8
+
+
+def indice_pieza(lado: int, tipo: int) -> int:
+    """Índice 0..11 del bitboard de un tipo de pieza de un color."""
+    return lado * 6 + tipo
+
+
+def lsb(bb: int) -> int:
+    """Índice del bit menos significativo (bb no debe ser 0)."""
+    return (bb & -bb).bit_length() - 1
+
+
+def bits(bb: int) -> Iterator[int]:
+    """Itera las casillas con bit activo, de menor a mayor."""
+    while bb:
+        b = bb & -bb
+        yield b.bit_length() - 1
+        bb ^= b
+
+
+def popcount(bb: int) -> int:
+    """Cantidad de bits activos."""
+    return bb.bit_count()
+
+
+# ===== ENROQUES =====
+ENROQUE_BLANCO_CORTO = 1
+ENROQUE_BLANCO_LARGO = 2
+ENROQUE_NEGRO_CORTO = 4
+ENROQUE_NEGRO_LARGO = 8
+ENROQUES_TODOS = 15
+
+# Derechos que sobreviven cuando algo sale de (o llega a) cada casilla:
+# mover el rey o una torre, o capturar una torre, los anula.
+MASCARA_ENROQUE = [ENROQUES_TODOS] * 64
+MASCARA_ENROQUE[0] &= ~ENROQUE_BLANCO_LARGO
+MASCARA_ENROQUE[4] &= ~(ENROQUE_BLANCO_CORTO | ENROQUE_BLANCO_LARGO)
+MASCARA_ENROQUE[7] &= ~ENROQUE_BLANCO_CORTO
+MASCARA_ENROQUE[56] &= ~ENROQUE_NEGRO_LARGO
+MASCARA_ENROQUE[60] &= ~(ENROQUE_NEGRO_CORTO | ENROQUE_NEGRO_LARGO)
+MASCARA_ENROQUE[63] &= ~ENROQUE_NEGRO_CORTO
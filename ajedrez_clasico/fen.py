@@ -0,0 +1,340 @@
+"""Códec de posiciones FEN/EPD para `Tablero` (sin pygame).
+
+Responsabilidades:
+- Analizar FEN completa o EPD (cuatro campos más operaciones) validando cada
+  campo, y escribirlas desde un `Tablero` con enroques, al paso y contadores
+- Rechazar posiciones imposibles (sin un rey por bando, peones en las filas
+  1 u 8, al paso sin el peón que acaba de avanzar dos casillas) y descartar
+  los enroques cuyo rey o torre no está en su casilla inicial
+- Leer y escribir las operaciones EPD (`bm`, `am`, `id`, `hmvc`...)
+- Procesar lotes en streaming: cada línea se carga en el mismo `Tablero`,
+  sin crear uno nuevo por posición ni guardar el lote en memoria
+
+Uso típico:
+    with open("suite.epd") as f:
+        for tablero, operaciones in decodificar_lote(f):
+            ...
+
+El tablero que entrega `decodificar_lote` se reutiliza: hay que copiarlo
+(`tablero.copiar()`) si se quiere conservar tras avanzar al siguiente.
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .bitboards import (
+    BLANCO, NEGRO, PEON, TORRE, REY, LETRAS_PIEZA,
+    ENROQUE_BLANCO_CORTO, ENROQUE_BLANCO_LARGO, ENROQUE_NEGRO_CORTO, ENROQUE_NEGRO_LARGO,
+)
+from .zobrist import clave_estado
+
+FEN_INICIAL = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# ===== TABLAS DE TRADUCCIÓN =====
+# Letra FEN -> (lado, tipo); dígito -> casillas vacías
+_PIEZA_DE_LETRA: Dict[str, Tuple[int, int]] = {}
+for _tipo, _letra in enumerate(LETRAS_PIEZA):
+    _PIEZA_DE_LETRA[_letra.upper()] = (BLANCO, _tipo)
+    _PIEZA_DE_LETRA[_letra] = (NEGRO, _tipo)
+_VACIAS = {str(n): n for n in range(1, 9)}
+# Índice de pieza (lado * 6 + tipo) -> letra FEN
+_LETRA_DE_INDICE = [letra.upper() for letra in LETRAS_PIEZA] + list(LETRAS_PIEZA)
+_BIT_ENROQUE = {"K": 1, "Q": 2, "k": 4, "q": 8}
+_TEXTO_ENROQUES = ["".join(l for bit, l in enumerate("KQkq") if mascara & (1 << bit)) or "-"
+                   for mascara in range(16)]
+_NOMBRES_CASILLA = [c + f for f in "12345678" for c in "abcdefgh"]
+_CASILLA_DE_NOMBRE = {nombre: sq for sq, nombre in enumerate(_NOMBRES_CASILLA)}
+# Derecho de enroque -> (lado, casilla del rey, casilla de la torre)
+_PIEZAS_ENROQUE = (
+    (ENROQUE_BLANCO_CORTO, BLANCO, 4, 7),
+    (ENROQUE_BLANCO_LARGO, BLANCO, 4, 0),
+    (ENROQUE_NEGRO_CORTO, NEGRO, 60, 63),
+    (ENROQUE_NEGRO_LARGO, NEGRO, 60, 56),
+)
+
+
+class PosicionFEN(NamedTuple):
+    """Campos de una FEN ya validados, sin crear piezas."""
+    piezas: List[Tuple[int, int, int]]  # (casilla, lado, tipo)
+    lado_turno: int
+    enroques: int
+    al_paso: Optional[int]
+    reloj_medio: int
+    numero_jugada: int
+
+
+def _colocacion(texto: str, fen: str) -> List[Tuple[int, int, int]]:
+    filas = texto.split("/")
+    if len(filas) != 8:
+        raise ValueError(f"FEN inválida: {fen!r}")
+    piezas = []
+    reyes = [0, 0]
+    for i, fila in enumerate(filas):
+        sq = (7 - i) * 8
+        fin = sq + 8
+        tras_digito = False
+        for letra in fila:
+            vacias = _VACIAS.get(letra)
+            if vacias is not None:
+                # Dos dígitos seguidos ("44") no son FEN: se escribe "8"
+                if tras_digito:
+                    raise ValueError(f"FEN inválida: {fen!r}")
+                tras_digito = True
+                sq += vacias
+                continue
+            tras_digito = False
+            pieza = _PIEZA_DE_LETRA.get(letra)
+            if pieza is None or sq >= fin:
+                raise ValueError(f"FEN inválida: {fen!r}")
+            if pieza[1] == REY:
+                reyes[pieza[0]] += 1
+            elif pieza[1] == PEON and i in (0, 7):
+                raise ValueError(f"FEN inválida: {fen!r}")
+            piezas.append((sq, pieza[0], pieza[1]))
+            sq += 1
+        if sq != fin:
+            raise ValueError(f"FEN inválida: {fen!r}")
+    if reyes != [1, 1]:
+        raise ValueError(f"FEN inválida: {fen!r}")
+    return piezas
+
+
+def _al_paso_posible(casillas: Dict[int, Tuple[int, int]], al_paso: int, lado_turno: int) -> bool:
+    """Si un peón del rival pudo llegar avanzando dos casillas a través de `al_paso`."""
+    if lado_turno == BLANCO:
+        fila, peon, origen, rival = 5, al_paso - 8, al_paso + 8, NEGRO
+    else:
+        fila, peon, origen, rival = 2, al_paso + 8, al_paso - 8, BLANCO
+    return (al_paso >> 3 == fila and casillas.get(peon) == (rival, PEON)
+            and al_paso not in casillas and origen not in casillas)
+
+
+def _analizar_campos(campos: List[str], fen: str, reloj_medio: int = 0,
+                     numero_jugada: int = 1) -> PosicionFEN:
+    """Valida los cuatro primeros campos; los contadores llegan ya leídos.
+
+    Los derechos de enroque sin el rey o la torre en su casilla inicial se
+    descartan en lugar de rechazar la FEN.
+    """
+    if len(campos) < 4:
+        raise ValueError(f"FEN incompleta: {fen!r}")
+    piezas = _colocacion(campos[0], fen)
+    if campos[1] == "w":
+        lado_turno = BLANCO
+    elif campos[1] == "b":
+        lado_turno = NEGRO
+    else:
+        raise ValueError(f"FEN inválida: {fen!r}")
+    enroques = 0
+    if campos[2] != "-":
+        for letra in campos[2]:
+            bit = _BIT_ENROQUE.get(letra)
+            if bit is None:
+                raise ValueError(f"FEN inválida: {fen!r}")
+            enroques |= bit
+    al_paso = None
+    if enroques or campos[3] != "-":
+        casillas = {sq: (lado, tipo) for sq, lado, tipo in piezas}
+        for derecho, lado, rey, torre in _PIEZAS_ENROQUE:
+            if enroques & derecho and (casillas.get(rey) != (lado, REY)
+                                       or casillas.get(torre) != (lado, TORRE)):
+                enroques &= ~derecho
+        if campos[3] != "-":
+            al_paso = _CASILLA_DE_NOMBRE.get(campos[3])
+            if al_paso is None or not _al_paso_posible(casillas, al_paso, lado_turno):
+                raise ValueError(f"FEN inválida: {fen!r}")
+    return PosicionFEN(piezas, lado_turno, enroques, al_paso, reloj_medio, numero_jugada)
+
+
+def analizar_fen(fen: str) -> PosicionFEN:
+    """Analiza una FEN completa o sus cuatro primeros campos; ValueError si no es válida."""
+    campos = fen.split()
+    reloj_medio = int(campos[4]) if len(campos) > 4 and campos[4].isdigit() else 0
+    numero_jugada = int(campos[5]) if len(campos) > 5 and campos[5].isdigit() else 1
+    return _analizar_campos(campos, fen, reloj_medio, numero_jugada)
+
+
+def _dividir_operaciones(texto: str) -> Iterator[str]:
+    """Trozos separados por ';' que no estén dentro de comillas."""
+    inicio = 0
+    en_comillas = False
+    for i, c in enumerate(texto):
+        if c == '"':
+            en_comillas = not en_comillas
+        elif c == ";" and not en_comillas:
+            yield texto[inicio:i]
+            inicio = i + 1
+    if texto[inicio:].strip():
+        yield texto[inicio:]
+
+
+def analizar_operaciones(texto: str) -> Dict[str, str]:
+    """Operaciones EPD (`bm Nf3 Ng5; id "WAC.001";`) -> {"bm": "Nf3 Ng5", "id": "WAC.001"}."""
+    operaciones = {}
+    for trozo in _dividir_operaciones(texto):
+        trozo = trozo.strip()
+        if not trozo:
+            continue
+        codigo, _, operando = trozo.partition(" ")
+        operando = operando.strip()
+        if len(operando) >= 2 and operando[0] == operando[-1] == '"':
+            operando = operando[1:-1]
+        operaciones[codigo] = operando
+    return operaciones
+
+
+def analizar_epd(linea: str) -> Tuple[PosicionFEN, Dict[str, str]]:
+    """Analiza una línea EPD o FEN (con o sin operaciones detrás).
+
+    Los contadores salen de los campos quinto y sexto si son números (FEN) o
+    de las operaciones `hmvc` y `fmvn` (EPD).
+    """
+    campos = linea.split(None, 4)
+    resto = campos.pop() if len(campos) == 5 else ""
+    reloj_medio, numero_jugada = 0, 1
+    contadores = resto.split(None, 2)
+    if len(contadores) >= 2 and contadores[0].isdigit() and contadores[1].isdigit():
+        reloj_medio, numero_jugada = int(contadores[0]), int(contadores[1])
+        resto = contadores[2] if len(contadores) > 2 else ""
+    operaciones = analizar_operaciones(resto) if resto else {}
+    if operaciones.get("hmvc", "").isdigit():
+        reloj_medio = int(operaciones["hmvc"])
+    if operaciones.get("fmvn", "").isdigit():
+        numero_jugada = int(operaciones["fmvn"])
+    return _analizar_campos(campos, linea, reloj_medio, numero_jugada), operaciones
+
+
+def cargar(tablero, posicion: PosicionFEN):
+    """Sustituye la posición de `tablero` por `posicion` y reinicia su historial.
+
+    Las piezas de la posición anterior se reutilizan en lugar de crear otras
+    (en un lote cada línea cuesta lo mismo que analizarla y colocarla), y el
+    estado de la partida (jaque, mate, tablas) queda para cuando se consulte.
+    """
+    reserva: List[List[object]] = [[] for _ in range(12)]
+    for lista in tablero.listas_piezas:
+        for pieza in lista:
+            reserva[pieza.indice].append(pieza)
+    colocadas = []
+    for sq, lado, tipo in posicion.piezas:
+        libres = reserva[lado * 6 + tipo]
+        pieza = libres.pop() if libres else tablero._crear_pieza(lado, tipo)
+        # Un peón fuera de su fila inicial ya no puede avanzar dos casillas
+        pieza.movimientos = int(tipo == PEON and sq >> 3 != (1 if lado == BLANCO else 6))
+        colocadas.append((sq, pieza))
+    tablero._vaciar()
+    tablero._colocar_todas(colocadas)
+    tablero.lado_turno = posicion.lado_turno
+    tablero.enroques = posicion.enroques
+    tablero.al_paso = posicion.al_paso
+    tablero.reloj_medio = posicion.reloj_medio
+    tablero.numero_jugada = posicion.numero_jugada
+    tablero._deshacer = []
+    tablero.historial_movimientos = []
+    # `_colocar_todas` ya sumó las claves de las piezas
+    tablero.hash ^= clave_estado(tablero)
+    tablero.reiniciar_historial()
+    tablero.estado = None
+
+
+def _campos_posicion(tablero) -> str:
+    """Los cuatro primeros campos: colocación, turno, enroques y al paso."""
+    tabla = tablero._tabla
+    filas = []
+    for inicio in range(56, -1, -8):
+        fila = ""
+        vacias = 0
+        for sq in range(inicio, inicio + 8):
+            pieza = tabla[sq]
+            if pieza is None:
+                vacias += 1
+                continue
+            if vacias:
+                fila += str(vacias)
+                vacias = 0
+            fila += _LETRA_DE_INDICE[pieza.indice]
+        if vacias:
+            fila += str(vacias)
+        filas.append(fila)
+    turno = "w" if tablero.lado_turno == BLANCO else "b"
+    al_paso = "-" if tablero.al_paso is None else _NOMBRES_CASILLA[tablero.al_paso]
+    return f"{'/'.join(filas)} {turno} {_TEXTO_ENROQUES[tablero.enroques]} {al_paso}"
+
+
+def codificar(tablero) -> str:
+    """FEN completa de la posición de `tablero`."""
+    return f"{_campos_posicion(tablero)} {tablero.reloj_medio} {tablero.numero_jugada}"
+
+
+def _operando(valor: str) -> str:
+    # Los operandos con espacios o ';' van entre comillas (p. ej. `id`)
+    if any(c in valor for c in ' ;"') or not valor:
+        return '"' + valor.replace('"', "'") + '"'
+    return valor
+
+
+def codificar_epd(tablero, operaciones: Optional[Dict[str, str]] = None) -> str:
+    """Línea EPD: cuatro campos y las operaciones en el orden dado.
+
+    `bm`/`am` con varias jugadas se escriben sin comillas, separadas por espacios.
+    """
+    partes = [_campos_posicion(tablero)]
+    for codigo, valor in (operaciones or {}).items():
+        if codigo in ("bm", "am", "pv") or valor.isdigit():
+            partes.append(f" {codigo} {valor};")
+        else:
+            partes.append(f" {codigo} {_operando(valor)};")
+    return "".join(partes)
+
+
+def decodificar(fen: str, tablero=None):
+    """`Tablero` con la posición de `fen` (FEN o EPD); reutiliza `tablero` si se pasa."""
+    if tablero is None:
+        from .tablero import Tablero
+        tablero = Tablero()
+    cargar(tablero, analizar_epd(fen)[0])
+    return tablero
+
+
+def decodificar_lote(lineas: Iterable[str], tablero=None,
+                     omitir_invalidas: bool = False) -> Iterator[Tuple[object, Dict[str, str]]]:
+    """Carga cada línea FEN/EPD en el mismo `Tablero` y lo entrega con sus operaciones.
+
+    Salta líneas vacías y comentarios (`#`). Una línea mal formada lanza
+    ValueError con su número, o se ignora con `omitir_invalidas`.
+    """
+    if tablero is None:
+        from .tablero import Tablero
+        tablero = Tablero()
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea[0] == "#":
+            continue
+        try:
+            posicion, operaciones = analizar_epd(linea)
+        except ValueError:
+            if omitir_invalidas:
+                continue
+            raise ValueError(f"línea {numero}: posición inválida: {linea!r}") from None
+        cargar(tablero, posicion)
+        yield tablero, operaciones
+
+
+def analizar_lote(lineas: Iterable[str],
+                  omitir_invalidas: bool = False) -> Iterator[Tuple[PosicionFEN, Dict[str, str]]]:
+    """Como `decodificar_lote` pero sin tablero: solo valida y separa los campos."""
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea or linea[0] == "#":
+            continue
+        try:
+            yield analizar_epd(linea)
+        except ValueError:
+            if omitir_invalidas:
+                continue
+            raise ValueError(f"línea {numero}: posición inválida: {linea!r}") from None
+
+
+def codificar_lote(tableros: Iterable, epd: bool = False) -> Iterator[str]:
+    """FEN (o EPD sin operaciones) de cada tablero, una por línea y sin salto final."""
+    convertir = _campos_posicion if epd else codificar
+    for tablero in tableros:
+        yield convertir(tablero)
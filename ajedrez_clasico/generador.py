@@ -0,0 +1,207 @@
+"""Generador de movimientos estrictamente legales.
+
+Responsabilidades:
+- Calcular una vez por posición los jaques y las piezas clavadas
+- Responder "¿está atacada esta casilla?" mirando hacia fuera desde ella
+- Emitir solo movimientos legales (incluye enroque, al paso y promociones)
+  sin hacer/deshacer cada candidato para comprobar el jaque
+- Emitir solo capturas y promociones para la búsqueda de quiescencia
+"""
+from typing import List
+from .bitboards import (
+    BB_CASILLAS, BB_FILAS, BB_TODO, BLANCO,
+    PEON, CABALLO, ALFIL, TORRE, REINA, REY,
+    ENROQUE_BLANCO_CORTO, ENROQUE_BLANCO_LARGO, ENROQUE_NEGRO_CORTO, ENROQUE_NEGRO_LARGO,
+    lsb,
+)
+from .ataques import (
+    ATAQUES_CABALLO, ATAQUES_REY, ATAQUES_PEON, ENTRE,
+    TABLA_TORRE, TABLA_ALFIL, MASCARA_TORRE, MASCARA_ALFIL,
+)
+from .movimiento import Movimiento
+
+_FILA_PROMOCION = (BB_FILAS[7], BB_FILAS[0])
+_PROMOCIONES = (REINA, TORRE, ALFIL, CABALLO)
+
+# Enroques por lado: (derecho, casillas que deben estar vacías,
+# casilla que cruza el rey, origen del rey, destino del rey, casilla de la torre)
+_ENROQUES = (
+    (
+        (ENROQUE_BLANCO_CORTO, 0x60, 5, 4, 6, 7),
+        (ENROQUE_BLANCO_LARGO, 0x0E, 3, 4, 2, 0),
+    ),
+    (
+        (ENROQUE_NEGRO_CORTO, 0x60 << 56, 61, 60, 62, 63),
+        (ENROQUE_NEGRO_LARGO, 0x0E << 56, 59, 60, 58, 56),
+    ),
+)
+
+
+def atacantes(piezas_bb: List[int], sq: int, lado: int, ocupadas: int) -> int:
+    """Bitboard de las piezas de `lado` que atacan la casilla `sq`."""
+    base = lado * 6
+    damas = piezas_bb[base + REINA]
+    return (
+        (ATAQUES_CABALLO[sq] & piezas_bb[base + CABALLO])
+        | (ATAQUES_PEON[lado ^ 1][sq] & piezas_bb[base + PEON])
+        | (ATAQUES_REY[sq] & piezas_bb[base + REY])
+        | (TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]] & (piezas_bb[base + ALFIL] | damas))
+        | (TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]] & (piezas_bb[base + TORRE] | damas))
+    )
+
+
+def casilla_atacada(piezas_bb: List[int], sq: int, lado: int, ocupadas: int) -> bool:
+    """Indica si `lado` ataca `sq`, mirando hacia fuera desde la propia casilla.
+
+    Se consultan las tablas de salto, de peón y de rayos de la casilla
+    objetivo contra los bitboards del atacante, saliendo en el primer acierto.
+    """
+    base = lado * 6
+    if ATAQUES_CABALLO[sq] & piezas_bb[base + CABALLO]:
+        return True
+    if ATAQUES_PEON[lado ^ 1][sq] & piezas_bb[base + PEON]:
+        return True
+    if ATAQUES_REY[sq] & piezas_bb[base + REY]:
+        return True
+    damas = piezas_bb[base + REINA]
+    diagonales = piezas_bb[base + ALFIL] | damas
+    if diagonales and TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]] & diagonales:
+        return True
+    rectas = piezas_bb[base + TORRE] | damas
+    return bool(rectas and TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]] & rectas)
+
+
+def generar_legales(tablero, lado: int = None, solo_capturas: bool = False) -> List[Movimiento]:
+    """Lista de movimientos legales (codificados como enteros) para `lado`.
+
+    Por defecto genera para el bando con el turno; la captura al paso solo se
+    considera en ese caso. Con `solo_capturas` se omiten los movimientos
+    tranquilos salvo los avances de peón que promocionan.
+    """
+    if lado is None:
+        lado = tablero.lado_turno
+    enemigo = lado ^ 1
+    piezas_bb = tablero.piezas_bb
+    base = lado * 6
+    ebase = enemigo * 6
+    rey = tablero.casilla_rey[lado]
+    if rey is None:
+        return []
+    bb_rey = BB_CASILLAS[rey]
+    propias = tablero.ocupacion[lado]
+    enemigas = tablero.ocupacion[enemigo]
+    ocupadas = propias | enemigas
+    movimientos: List[Movimiento] = []
+    agregar = movimientos.append
+    filtro = enemigas if solo_capturas else BB_TODO
+
+    # Rey: se comprueba cada destino sin nuestro rey, para no "esconderlo" tras sí mismo
+    sin_rey = ocupadas ^ bb_rey
+    destinos = ATAQUES_REY[rey] & ~propias & filtro
+    while destinos:
+        b = destinos & -destinos
+        destinos ^= b
+        d = b.bit_length() - 1
+        if not casilla_atacada(piezas_bb, d, enemigo, sin_rey):
+            agregar(rey | (d << 6))
+
+    jaques = atacantes(piezas_bb, rey, enemigo, ocupadas)
+    if jaques & (jaques - 1):
+        # Jaque doble: solo puede mover el rey
+        return movimientos
+    if jaques:
+        # Jaque simple: capturar la pieza o interponerse
+        objetivo = (jaques | ENTRE[rey][lsb(jaques)]) & ~propias
+    else:
+        objetivo = ~propias & BB_TODO
+        for derecho, vacias, paso, origen, destino, torre in _ENROQUES[lado]:
+            # El derecho solo no basta: una posición cargada puede traerlo sin rey ni torre en casa
+            if (not solo_capturas and tablero.enroques & derecho and rey == origen
+                    and piezas_bb[base + TORRE] & BB_CASILLAS[torre] and not ocupadas & vacias
+                    and not casilla_atacada(piezas_bb, paso, enemigo, ocupadas)
+                    and not casilla_atacada(piezas_bb, destino, enemigo, ocupadas)):
+                agregar(origen | (destino << 6))
+
+    # Clavadas: deslizantes rivales alineados con el rey con una sola pieza propia en medio
+    rayos_clavada = {}
+    damas = piezas_bb[ebase + REINA]
+    francotiradores = (
+        (TABLA_TORRE[rey][enemigas & MASCARA_TORRE[rey]] & (piezas_bb[ebase + TORRE] | damas))
+        | (TABLA_ALFIL[rey][enemigas & MASCARA_ALFIL[rey]] & (piezas_bb[ebase + ALFIL] | damas))
+    )
+    while francotiradores:
+        b = francotiradores & -francotiradores
+        francotiradores ^= b
+        entre = ENTRE[rey][b.bit_length() - 1]
+        bloqueo = entre & ocupadas
+        if bloqueo and not bloqueo & (bloqueo - 1) and bloqueo & propias:
+            rayos_clavada[bloqueo.bit_length() - 1] = entre | b
+
+    # Caballos (un caballo clavado nunca puede moverse)
+    bb = piezas_bb[base + CABALLO]
+    while bb:
+        b = bb & -bb
+        bb ^= b
+        sq = b.bit_length() - 1
+        if sq in rayos_clavada:
+            continue
+        destinos = ATAQUES_CABALLO[sq] & objetivo & filtro
+        while destinos:
+            d = destinos & -destinos
+            agregar(sq | ((d.bit_length() - 1) << 6))
+            destinos ^= d
+
+    # Deslizantes
+    for tabla, mascaras, bb in (
+        (TABLA_ALFIL, MASCARA_ALFIL, piezas_bb[base + ALFIL] | piezas_bb[base + REINA]),
+        (TABLA_TORRE, MASCARA_TORRE, piezas_bb[base + TORRE] | piezas_bb[base + REINA]),
+    ):
+        while bb:
+            b = bb & -bb
+            bb ^= b
+            sq = b.bit_length() - 1
+            destinos = tabla[sq][ocupadas & mascaras[sq]] & objetivo & filtro
+            if sq in rayos_clavada:
+                destinos &= rayos_clavada[sq]
+            while destinos:
+                d = destinos & -destinos
+                agregar(sq | ((d.bit_length() - 1) << 6))
+                destinos ^= d
+
+    # Peones
+    paso = 8 if lado == BLANCO else -8
+    fila_inicial = BB_FILAS[1] if lado == BLANCO else BB_FILAS[6]
+    fila_promocion = _FILA_PROMOCION[lado]
+    ataques_peon = ATAQUES_PEON[lado]
+    al_paso = tablero.al_paso if lado == tablero.lado_turno else None
+    bb = piezas_bb[base + PEON]
+    while bb:
+        b = bb & -bb
+        bb ^= b
+        sq = b.bit_length() - 1
+        permitidas = objetivo
+        if sq in rayos_clavada:
+            permitidas &= rayos_clavada[sq]
+        destinos = ataques_peon[sq] & enemigas & permitidas
+        avance = sq + paso
+        if not ocupadas & BB_CASILLAS[avance] and (not solo_capturas or BB_CASILLAS[avance] & fila_promocion):
+            destinos |= BB_CASILLAS[avance] & permitidas
+            if b & fila_inicial and not ocupadas & BB_CASILLAS[avance + paso]:
+                destinos |= BB_CASILLAS[avance + paso] & permitidas
+        while destinos:
+            d = destinos & -destinos
+            destinos ^= d
+            mov = sq | ((d.bit_length() - 1) << 6)
+            if d & fila_promocion:
+                for tipo in _PROMOCIONES:
+                    agregar(mov | (tipo << 12))
+            else:
+                agregar(mov)
+        if al_paso is not None and ataques_peon[sq] & BB_CASILLAS[al_paso]:
+            # Al paso: se simula la posición resultante (cubre clavadas horizontales)
+            capturado = al_paso - paso
+            ocupacion = (ocupadas ^ b ^ BB_CASILLAS[capturado]) | BB_CASILLAS[al_paso]
+            if not atacantes(piezas_bb, rey, enemigo, ocupacion) & ~BB_CASILLAS[capturado]:
+                agregar(sq | (al_paso << 6))
+
+    return movimientos
@@ -0,0 +1,91 @@
+"""Motor nativo en Python puro sobre `Tablero` (sin binarios externos).
+
+Responsabilidades:
+- Exponer la búsqueda alfa-beta con profundización iterativa
+- Mantener una tabla de transposición compartida entre jugadas de la partida
+- Mantener un único motor Lazy SMP por proceso, con sus auxiliares vivos
+  entre jugadas, para buscar con varios procesos
+- Ofrecer `sugerir_movimiento`, equivalente nativo del de `reglas`
+- Dar una huella del código del motor para no reutilizar jugadas guardadas
+  por otra versión
+"""
+from typing import Optional
+import functools
+import hashlib
+import os
+
+from .busqueda import Busqueda, ResultadoBusqueda, buscar, MATE
+from .paralelo import BusquedaParalela, BusquedaLazySMP
+from .transposicion import TablaTransposicion
+
+# Tiempo por jugada según el nivel (mismos nombres que en reglas)
+NIVELES_MS = {"facil": 200, "medio": 500, "dificil": 2000}
+
+_tabla: Optional[TablaTransposicion] = None
+_paralela: Optional[BusquedaParalela] = None
+
+
+def tabla_por_defecto() -> TablaTransposicion:
+    """Tabla de transposición del proceso, creada al primer uso y reutilizada."""
+    global _tabla
+    if _tabla is None:
+        _tabla = TablaTransposicion()
+    return _tabla
+
+
+def busqueda_paralela(procesos: int) -> BusquedaParalela:
+    """Motor Lazy SMP del proceso; se recrea solo si cambia el número de procesos."""
+    global _paralela
+    if _paralela is None or _paralela.procesos != procesos:
+        cerrar_paralela()
+        _paralela = BusquedaParalela(procesos)
+    return _paralela
+
+
+def cerrar_paralela():
+    """Detiene los auxiliares de Lazy SMP y libera su memoria compartida."""
+    global _paralela
+    if _paralela is not None:
+        _paralela.cerrar()
+        _paralela = None
+
+
+def crear_busqueda(tablero, procesos: int = 1) -> Busqueda:
+    """Búsqueda sobre `tablero`: de un proceso con la tabla por defecto, o Lazy SMP."""
+    if procesos > 1:
+        return busqueda_paralela(procesos).busqueda(tablero)
+    return Busqueda(tablero, tabla_por_defecto())
+
+
+@functools.lru_cache(maxsize=None)
+def huella() -> str:
+    """Resumen del código fuente de `ajedrez_clasico` (evaluación, búsqueda, reglas).
+
+    Cualquier cambio en el motor da otra huella, así la caché de jugadas no
+    devuelve respuestas calculadas por una versión anterior.
+    """
+    resumen = hashlib.sha1()
+    paquete = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for carpeta in (paquete, os.path.join(paquete, "motor")):
+        for nombre in sorted(os.listdir(carpeta)):
+            if not nombre.endswith(".py"):
+                continue
+            try:
+                with open(os.path.join(carpeta, nombre), "rb") as f:
+                    resumen.update(nombre.encode() + f.read())
+            except OSError:
+                pass
+    return resumen.hexdigest()[:12]
+
+
+def sugerir_movimiento(tablero, tiempo_ms: int = 500, procesos: int = 1) -> Optional[str]:
+    """Mejor jugada en UCI (e2e4) buscando sobre una copia de `tablero`."""
+    return crear_busqueda(tablero.copiar(), procesos).buscar(tiempo_ms=tiempo_ms).uci
+
+
+__all__ = [
+    'Busqueda', 'BusquedaLazySMP', 'BusquedaParalela', 'ResultadoBusqueda',
+    'TablaTransposicion', 'buscar', 'busqueda_paralela', 'cerrar_paralela',
+    'crear_busqueda', 'huella', 'sugerir_movimiento', 'tabla_por_defecto',
+    'MATE', 'NIVELES_MS',
+]
@@ -0,0 +1,103 @@
+"""Banco de pruebas de la búsqueda nativa a profundidad fija.
+
+Responsabilidades:
+- Buscar un conjunto fijo de posiciones a la misma profundidad
+- Informar de nodos y tiempo hasta la profundidad por posición y en total
+- Comparar la configuración completa con cada técnica desactivada
+- Medir la aceleración de Lazy SMP con varios procesos
+
+Uso:
+    python -m ajedrez_clasico.motor.bench -p 5
+    python -m ajedrez_clasico.motor.bench -p 5 --comparar ordenacion
+    python -m ajedrez_clasico.motor.bench -p 6 --comparar --procesos 8
+
+Lazy SMP solo acelera con un núcleo libre por proceso. Con menos núcleos que
+`--procesos` los procesos compiten por la CPU y el tiempo hasta la
+profundidad empeora. La aceleración no se ha medido todavía en una máquina
+de varios núcleos: solo se ha comprobado el resultado y el cierre con un núcleo.
+"""
+import argparse
+import sys
+from typing import List, Optional, Tuple
+
+from ..tablero import Tablero
+from ..perft import POSICIONES_REFERENCIA
+from .busqueda import Busqueda, Opciones
+from .paralelo import BusquedaParalela
+from .transposicion import TablaTransposicion
+
+POSICIONES_BENCH: List[Tuple[str, str]] = [(nombre, fen) for nombre, fen, _ in POSICIONES_REFERENCIA]
+
+
+def ejecutar(opciones: Opciones, profundidad: int, tamano_mb: int = 16,
+             detalle: bool = False) -> Tuple[int, float]:
+    """Busca todas las posiciones con tabla nueva; devuelve (nodos, segundos) totales."""
+    nodos = 0
+    segundos = 0.0
+    for nombre, fen in POSICIONES_BENCH:
+        tablero = Tablero()
+        tablero.cargar_fen(fen)
+        resultado = Busqueda(tablero, TablaTransposicion(tamano_mb), opciones).buscar(
+            profundidad=profundidad)
+        nodos += resultado.nodos
+        segundos += resultado.segundos
+        if detalle:
+            print(f"  {nombre:<10} {resultado.uci:<6} {resultado.puntuacion:>7} "
+                  f"{resultado.nodos:>10} nodos {resultado.segundos:>8.3f} s")
+    return nodos, segundos
+
+
+def ejecutar_paralelo(opciones: Opciones, profundidad: int, procesos: int,
+                      tamano_mb: int = 16, detalle: bool = False) -> Tuple[int, float]:
+    """Como `ejecutar`, con Lazy SMP; los nodos suman todos los procesos."""
+    nodos = 0
+    segundos = 0.0
+    with BusquedaParalela(procesos, tamano_mb, opciones) as paralela:
+        for nombre, fen in POSICIONES_BENCH:
+            tablero = Tablero()
+            tablero.cargar_fen(fen)
+            paralela.limpiar()
+            resultado = paralela.buscar(tablero, profundidad=profundidad)
+            nodos += resultado.nodos
+            segundos += resultado.segundos
+            if detalle:
+                print(f"  {nombre:<10} {resultado.uci:<6} {resultado.puntuacion:>7} "
+                      f"{resultado.nodos:>10} nodos {resultado.segundos:>8.3f} s")
+    return nodos, segundos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    campos = list(Opciones._fields)
+    parser = argparse.ArgumentParser(description="Banco de pruebas del motor nativo.")
+    parser.add_argument("-p", "--profundidad", type=int, default=4)
+    parser.add_argument("--tt-mb", type=int, default=16, help="tamaño de la tabla de transposición")
+    parser.add_argument("--comparar", nargs="*", choices=campos, default=campos,
+                        help="técnicas a desactivar una a una (por defecto, todas)")
+    parser.add_argument("--detalle", action="store_true", help="mostrar cada posición")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="comparar además con Lazy SMP en N procesos")
+    args = parser.parse_args(argv)
+
+    completa = Opciones()
+    print(f"completa (p{args.profundidad})")
+    nodos_base, segundos_base = ejecutar(completa, args.profundidad, args.tt_mb, args.detalle)
+    print(f"  total: {nodos_base} nodos, {segundos_base:.3f} s, "
+          f"{nodos_base / max(segundos_base, 1e-9):,.0f} nps")
+    if args.procesos > 1:
+        print(f"lazy smp ({args.procesos} procesos)")
+        nodos, segundos = ejecutar_paralelo(completa, args.profundidad, args.procesos,
+                                            args.tt_mb, args.detalle)
+        print(f"  total: {nodos} nodos, {segundos:.3f} s, {nodos / max(segundos, 1e-9):,.0f} nps "
+              f"-> {segundos_base / max(segundos, 1e-9):.2f}x más rápido hasta p{args.profundidad}")
+    for campo in args.comparar:
+        print(f"sin {campo}")
+        nodos, segundos = ejecutar(completa._replace(**{campo: False}), args.profundidad,
+                                   args.tt_mb, args.detalle)
+        print(f"  total: {nodos} nodos, {segundos:.3f} s "
+              f"-> {nodos / max(nodos_base, 1):.2f}x nodos, "
+              f"{segundos / max(segundos_base, 1e-9):.2f}x tiempo respecto a la completa")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
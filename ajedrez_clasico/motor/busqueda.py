@@ -0,0 +1,427 @@
+"""Búsqueda alfa-beta con profundización iterativa sobre `Tablero`.
+
+Responsabilidades:
+- Negamax con poda alfa-beta usando make/unmake del tablero
+- Profundización iterativa: cada iteración completa deja una jugada válida
+- Respetar un límite de tiempo o de nodos (o una parada externa) abortando
+  la iteración en curso y devolviendo la mejor jugada conocida
+- Pensar en el tiempo del rival (ponder) sin límite hasta `ponderhit`
+- Reconocer mate, ahogado, triple repetición y regla de los 50 movimientos
+- Reutilizar resultados de posiciones transpuestas mediante la tabla de
+  transposición (cortes por cota y jugada del hash primero)
+- Ordenar las jugadas (hash, MVV-LVA, killers, historia) para podar antes
+- Resolver las capturas pendientes en las hojas (quiescencia), descartando
+  las que pierden material según SEE
+- Búsqueda selectiva: variante principal (PVS), movimiento nulo, reducciones
+  de jugadas tardías (LMR) y ventanas de aspiración, activables por separado
+"""
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from ..evaluacion import evaluar
+from ..generador import generar_legales
+from ..movimiento import Movimiento, movimiento_a_uci
+from .transposicion import TablaTransposicion, EXACTA, INFERIOR, SUPERIOR
+from .ordenacion import Ordenacion
+
+# ===== PUNTUACIONES =====
+MATE = 100000
+INFINITO = MATE + 1
+# Cualquier puntuación por encima de este umbral es un mate a distancia conocida
+UMBRAL_MATE = MATE - 1000
+
+PROFUNDIDAD_MAXIMA = 64
+# Cada cuántos nodos se consulta el reloj (potencia de dos menos uno)
+_INTERVALO_RELOJ = 1023
+# Semiancho inicial de la ventana de aspiración (centipeones)
+VENTANA_ASPIRACION = 50
+
+
+class Opciones(NamedTuple):
+    """Técnicas activables por separado (para comparar con el banco de pruebas)."""
+    ordenacion: bool = True
+    quiescencia: bool = True
+    poda_see: bool = True
+    pvs: bool = True
+    nulo: bool = True
+    lmr: bool = True
+    aspiracion: bool = True
+
+
+class ResultadoBusqueda(NamedTuple):
+    mejor: Optional[Movimiento]
+    puntuacion: int
+    profundidad: int
+    nodos: int
+    segundos: float
+    pv: List[Movimiento]
+    tasa_tt: float = 0.0
+
+    @property
+    def uci(self) -> Optional[str]:
+        return movimiento_a_uci(self.mejor) if self.mejor is not None else None
+
+
+def _a_tabla(puntuacion: int, ply: int) -> int:
+    """Los mates se guardan relativos al nodo, no a la raíz."""
+    if puntuacion >= UMBRAL_MATE:
+        return puntuacion + ply
+    if puntuacion <= -UMBRAL_MATE:
+        return puntuacion - ply
+    return puntuacion
+
+
+def _desde_tabla(puntuacion: int, ply: int) -> int:
+    if puntuacion >= UMBRAL_MATE:
+        return puntuacion - ply
+    if puntuacion <= -UMBRAL_MATE:
+        return puntuacion + ply
+    return puntuacion
+
+
+class _BusquedaDetenida(Exception):
+    """Se lanza dentro del árbol al agotar el tiempo; el tablero se restaura al desapilar."""
+
+
+class Busqueda:
+    """Estado de una búsqueda sobre un tablero (se modifica y se restaura)."""
+
+    def __init__(self, tablero, tt: Optional[TablaTransposicion] = None,
+                 opciones: Opciones = Opciones()):
+        self.tablero = tablero
+        self.tt = tt if tt is not None else TablaTransposicion()
+        self.opciones = opciones
+        self.orden = Ordenacion()
+        self.nodos = 0
+        self._limite: Optional[float] = None
+        self._limite_nodos: Optional[int] = None
+        self._inicio: Optional[float] = None
+        self._tiempo_ms: Optional[int] = None
+        self._ponderhit = False
+        self._detener = False
+        self._mejor_parcial: Optional[Movimiento] = None
+        # Señal de parada compartida (p. ej. multiprocessing.Event en Lazy SMP)
+        self.parada = None
+
+    def detener(self):
+        """Pide que la búsqueda termine cuanto antes (seguro desde otro hilo)."""
+        self._detener = True
+
+    def ponderhit(self):
+        """El rival jugó la respuesta esperada: la búsqueda en ponder pasa a tener reloj.
+
+        El tiempo cuenta desde que empezó a ponderar, así que si el rival tardó
+        más que `tiempo_ms` la búsqueda termina enseguida. Seguro desde otro
+        hilo, también antes de que `buscar` haya empezado.
+        """
+        self._ponderhit = True
+        if self._inicio is not None and self._tiempo_ms is not None:
+            self._limite = self._inicio + self._tiempo_ms / 1000.0
+
+    def buscar(self, tiempo_ms: Optional[int] = None,
+               profundidad: int = PROFUNDIDAD_MAXIMA,
+               informar: Optional[Callable[[ResultadoBusqueda], None]] = None,
+               desfase: int = 0, ponder: bool = False,
+               nodos: Optional[int] = None) -> ResultadoBusqueda:
+        """Profundización iterativa hasta `profundidad` o hasta agotar `tiempo_ms` o `nodos`.
+
+        `informar` recibe el resultado de cada iteración completada. Con
+        `desfase` cada iteración busca esos plies más (auxiliares de Lazy SMP).
+        Con `ponder` el reloj no corre hasta que se llama a `ponderhit`.
+        """
+        inicio = time.perf_counter()
+        self._inicio = inicio
+        self._tiempo_ms = tiempo_ms
+        limite = inicio + tiempo_ms / 1000.0 if tiempo_ms is not None else None
+        # Primero sin reloj y después se mira `_ponderhit`: un ponderhit desde
+        # otro hilo entre ambos pasos ya ve `_inicio` y fija el límite él mismo
+        self._limite = None if ponder else limite
+        if ponder and self._ponderhit:
+            self._limite = limite
+        # El contador se mira junto al reloj: se puede pasar en hasta _INTERVALO_RELOJ nodos
+        self._limite_nodos = nodos
+        self._detener = False
+        self.nodos = 0
+        self.tt.nueva_busqueda()
+        self.tt.reiniciar_estadisticas()
+        self.orden.nueva_busqueda()
+
+        movimientos = self.tablero.movimientos_legales()
+        if not movimientos:
+            puntuacion = -MATE if self._en_jaque() else 0
+            return ResultadoBusqueda(None, puntuacion, 0, 0, 0.0, [])
+        if self.opciones.ordenacion:
+            entrada = self.tt.sondear(self.tablero.hash)
+            movimientos = self.orden.ordenar(self.tablero, movimientos,
+                                             entrada[0] if entrada else 0)
+        resultado = ResultadoBusqueda(movimientos[0], 0, 0, 0, 0.0, [movimientos[0]])
+
+        for prof in range(1, max(1, profundidad) + 1):
+            prof = min(prof + desfase, max(1, profundidad))
+            try:
+                if self.opciones.aspiracion and prof >= 4 and abs(resultado.puntuacion) < UMBRAL_MATE:
+                    puntuacion, mejor = self._raiz_aspiracion(movimientos, prof, resultado.puntuacion)
+                else:
+                    puntuacion, mejor = self._raiz(movimientos, prof)
+            except _BusquedaDetenida:
+                if self._mejor_parcial is not None:
+                    # La primera jugada es la de la iteración anterior: si otra la
+                    # superó antes del corte, ya es una mejora demostrada. Su
+                    # variante está en la tabla: se acaba de buscar entera
+                    pv = self._variante_principal(self._mejor_parcial, prof)
+                    resultado = resultado._replace(mejor=self._mejor_parcial, pv=pv)
+                break
+            # La mejor jugada pasa al frente para la siguiente iteración
+            movimientos.remove(mejor)
+            movimientos.insert(0, mejor)
+            self.tt.guardar(self.tablero.hash, prof, puntuacion, EXACTA, mejor)
+            resultado = ResultadoBusqueda(mejor, puntuacion, prof, self.nodos,
+                                          time.perf_counter() - inicio,
+                                          self._variante_principal(mejor, prof),
+                                          self.tt.tasa_aciertos())
+            if informar is not None:
+                informar(resultado)
+            if abs(puntuacion) >= UMBRAL_MATE or len(movimientos) == 1 or prof >= profundidad:
+                break
+        return resultado._replace(nodos=self.nodos, segundos=time.perf_counter() - inicio,
+                                  tasa_tt=self.tt.tasa_aciertos())
+
+    def _variante_principal(self, mejor: Movimiento, profundidad: int) -> List[Movimiento]:
+        """Reconstruye la variante siguiendo las jugadas guardadas en la tabla."""
+        tablero = self.tablero
+        pv = [mejor]
+        tablero.hacer_movimiento(mejor)
+        while len(pv) < profundidad and tablero.veces_repetida() < 2:
+            entrada = self.tt.sondear(tablero.hash)
+            if entrada is None or entrada[0] not in tablero.movimientos_legales():
+                break
+            pv.append(entrada[0])
+            tablero.hacer_movimiento(entrada[0])
+        for _ in pv:
+            tablero.deshacer_movimiento()
+        return pv
+
+    def _en_jaque(self) -> bool:
+        tablero = self.tablero
+        return tablero.esta_en_jaque(tablero.turno)
+
+    def _comprobar_reloj(self):
+        if (self._detener
+                or (self._limite is not None and time.perf_counter() >= self._limite)
+                or (self._limite_nodos is not None and self.nodos >= self._limite_nodos)
+                or (self.parada is not None and self.parada.is_set())):
+            raise _BusquedaDetenida()
+
+    def _raiz(self, movimientos: List[Movimiento], profundidad: int,
+              alfa: int = -INFINITO, beta: int = INFINITO):
+        """Busca la raíz dentro de la ventana (alfa, beta); devuelve (puntuación, jugada).
+
+        Si ninguna jugada supera `alfa` la puntuación es una cota superior y
+        la jugada devuelta es la primera.
+        """
+        tablero = self.tablero
+        pvs = self.opciones.pvs
+        mejor = movimientos[0]
+        mejor_puntuacion = -INFINITO
+        self._mejor_parcial = None
+        for i, mov in enumerate(movimientos):
+            tablero.hacer_movimiento(mov)
+            try:
+                if i == 0 or not pvs:
+                    puntuacion = -self._negamax(profundidad - 1, -beta, -alfa, 1)
+                else:
+                    puntuacion = -self._negamax(profundidad - 1, -alfa - 1, -alfa, 1)
+                    if alfa < puntuacion < beta:
+                        puntuacion = -self._negamax(profundidad - 1, -beta, -alfa, 1)
+            finally:
+                tablero.deshacer_movimiento()
+            if puntuacion > mejor_puntuacion:
+                mejor_puntuacion = puntuacion
+            if puntuacion > alfa:
+                alfa = puntuacion
+                mejor = mov
+                if i:
+                    self._mejor_parcial = mov
+                if alfa >= beta:
+                    break
+        return mejor_puntuacion, mejor
+
+    def _raiz_aspiracion(self, movimientos: List[Movimiento], profundidad: int, previa: int):
+        """Ventana estrecha centrada en la puntuación anterior, ensanchada al fallar."""
+        delta = VENTANA_ASPIRACION
+        alfa = max(previa - delta, -INFINITO)
+        beta = min(previa + delta, INFINITO)
+        while True:
+            puntuacion, mejor = self._raiz(movimientos, profundidad, alfa, beta)
+            if puntuacion <= alfa and alfa > -INFINITO:
+                alfa = max(alfa - delta, -INFINITO)
+            elif puntuacion >= beta and beta < INFINITO:
+                beta = min(beta + delta, INFINITO)
+            else:
+                return puntuacion, mejor
+            delta *= 2
+            if delta > VENTANA_ASPIRACION * 16:
+                alfa, beta = -INFINITO, INFINITO
+
+    def _tiene_piezas(self, lado: int) -> bool:
+        """Si `lado` tiene algo más que rey y peones (sin ello el nulo falla por zugzwang)."""
+        bbs = self.tablero.piezas_bb
+        base = lado * 6
+        return bool(bbs[base + 1] | bbs[base + 2] | bbs[base + 3] | bbs[base + 4])
+
+    def _negamax(self, profundidad: int, alfa: int, beta: int, ply: int,
+                 nulo_permitido: bool = True) -> int:
+        self.nodos += 1
+        if not self.nodos & _INTERVALO_RELOJ:
+            self._comprobar_reloj()
+        tablero = self.tablero
+        if tablero.reloj_medio >= 100 or tablero.veces_repetida() > 1:
+            return 0
+        if profundidad <= 0:
+            if self.opciones.quiescencia:
+                return self._quiescencia(alfa, beta, ply)
+            return evaluar(tablero)
+
+        clave = tablero.hash
+        entrada = self.tt.sondear(clave)
+        mov_tt = 0
+        if entrada is not None:
+            mov_tt, puntuacion, prof_tt, cota = entrada
+            if prof_tt >= profundidad:
+                puntuacion = _desde_tabla(puntuacion, ply)
+                if (cota == EXACTA
+                        or (cota == INFERIOR and puntuacion >= beta)
+                        or (cota == SUPERIOR and puntuacion <= alfa)):
+                    return puntuacion
+
+        opciones = self.opciones
+        en_jaque = self._en_jaque()
+        nodo_pv = beta - alfa > 1
+
+        # Movimiento nulo: si ceder el turno sigue superando beta, la posición
+        # es tan buena que no merece búsqueda completa. Nunca en jaque, dos
+        # veces seguidas, con solo rey y peones (zugzwang) ni buscando mates.
+        if (opciones.nulo and nulo_permitido and not nodo_pv and not en_jaque
+                and profundidad >= 3 and beta < UMBRAL_MATE
+                and self._tiene_piezas(tablero.lado_turno) and evaluar(tablero) >= beta):
+            reduccion = 3 if profundidad >= 6 else 2
+            tablero.hacer_nulo()
+            try:
+                puntuacion = -self._negamax(profundidad - 1 - reduccion, -beta, -beta + 1,
+                                            ply + 1, False)
+            finally:
+                tablero.deshacer_nulo()
+            if puntuacion >= beta:
+                return beta
+
+        movimientos = tablero.movimientos_legales()
+        if not movimientos:
+            return -MATE + ply if en_jaque else 0
+        if opciones.ordenacion:
+            movimientos = self.orden.ordenar(tablero, movimientos, mov_tt, ply)
+        elif mov_tt and mov_tt in movimientos:
+            movimientos.remove(mov_tt)
+            movimientos.insert(0, mov_tt)
+
+        hacer = tablero.hacer_movimiento
+        deshacer = tablero.deshacer_movimiento
+        pvs = opciones.pvs
+        reducir = opciones.lmr and profundidad >= 3 and not en_jaque
+        killers = self.orden.killers[ply] if ply < len(self.orden.killers) else ()
+        alfa_original = alfa
+        mejor = -INFINITO
+        mejor_mov = 0
+        for i, mov in enumerate(movimientos):
+            # Reducción tardía: jugadas tranquilas al final de una lista bien ordenada
+            reduccion = 0
+            if (reducir and i >= 3 and mov not in killers
+                    and self.orden.es_tranquilo(tablero, mov)):
+                reduccion = 1 if i < 6 else 2
+            hacer(mov)
+            try:
+                if reduccion and self._en_jaque():
+                    reduccion = 0
+                if i == 0:
+                    puntuacion = -self._negamax(profundidad - 1, -beta, -alfa, ply + 1)
+                else:
+                    # Ventana nula con PVS: basta demostrar que no supera alfa
+                    abajo = -alfa - 1 if pvs else -beta
+                    puntuacion = -self._negamax(profundidad - 1 - reduccion, abajo, -alfa, ply + 1)
+                    if reduccion and puntuacion > alfa:
+                        puntuacion = -self._negamax(profundidad - 1, abajo, -alfa, ply + 1)
+                    if pvs and alfa < puntuacion < beta:
+                        puntuacion = -self._negamax(profundidad - 1, -beta, -alfa, ply + 1)
+            finally:
+                deshacer()
+            if puntuacion > mejor:
+                mejor = puntuacion
+                if puntuacion > alfa:
+                    alfa = puntuacion
+                    mejor_mov = mov
+                    if alfa >= beta:
+                        if opciones.ordenacion:
+                            self.orden.registrar_corte(tablero, mov, profundidad, ply)
+                        break
+
+        if mejor >= beta:
+            cota = INFERIOR
+        elif mejor > alfa_original:
+            cota = EXACTA
+        else:
+            cota = SUPERIOR
+        self.tt.guardar(clave, profundidad, _a_tabla(mejor, ply), cota, mejor_mov)
+        return mejor
+
+    def _quiescencia(self, alfa: int, beta: int, ply: int) -> int:
+        """Solo capturas y promociones hasta llegar a una posición tranquila.
+
+        Sin jaque el bando al turno puede plantarse con la evaluación estática;
+        en jaque se buscan todas las evasiones para no pasar por alto un mate.
+        """
+        self.nodos += 1
+        if not self.nodos & _INTERVALO_RELOJ:
+            self._comprobar_reloj()
+        tablero = self.tablero
+        en_jaque = self._en_jaque()
+        if en_jaque:
+            movimientos = tablero.movimientos_legales()
+            if not movimientos:
+                return -MATE + ply
+            mejor = -INFINITO
+        else:
+            mejor = evaluar(tablero)
+            if mejor >= beta:
+                return mejor
+            if mejor > alfa:
+                alfa = mejor
+            movimientos = generar_legales(tablero, solo_capturas=True)
+        if en_jaque:
+            movimientos = self.orden.ordenar(tablero, movimientos, 0, ply)
+        else:
+            movimientos = self.orden.ordenar_capturas(tablero, movimientos, self.opciones.poda_see)
+
+        hacer = tablero.hacer_movimiento
+        deshacer = tablero.deshacer_movimiento
+        for mov in movimientos:
+            hacer(mov)
+            try:
+                puntuacion = -self._quiescencia(-beta, -alfa, ply + 1)
+            finally:
+                deshacer()
+            if puntuacion > mejor:
+                mejor = puntuacion
+                if puntuacion > alfa:
+                    alfa = puntuacion
+                    if alfa >= beta:
+                        break
+        return mejor
+
+
+def buscar(tablero, tiempo_ms: Optional[int] = None,
+           profundidad: int = PROFUNDIDAD_MAXIMA,
+           tt: Optional[TablaTransposicion] = None,
+           opciones: Opciones = Opciones(),
+           nodos: Optional[int] = None) -> ResultadoBusqueda:
+    """Atajo: busca la mejor jugada de `tablero` con los límites dados."""
+    return Busqueda(tablero, tt, opciones).buscar(tiempo_ms=tiempo_ms, profundidad=profundidad,
+                                                  nodos=nodos)
@@ -0,0 +1,61 @@
+"""Evaluación estática de intercambios (SEE).
+
+Responsabilidades:
+- Calcular el saldo material de una secuencia de capturas sobre una casilla,
+  recapturando siempre con la pieza menos valiosa
+- Descubrir atacantes en rayos X al retirar cada pieza de la ocupación
+"""
+from ..bitboards import BB_CASILLAS, BLANCO, PEON, REY
+from ..evaluacion import VALORES_PIEZA
+from ..generador import atacantes
+from ..movimiento import Movimiento
+
+# El rey vale más que cualquier ganancia: capturar con él solo cuenta si nadie recaptura
+VALORES_SEE = VALORES_PIEZA[:REY] + (20000,)
+
+
+def see(tablero, mov: Movimiento) -> int:
+    """Ganancia (en centipeones) del intercambio que empieza con `mov`."""
+    o = mov & 63
+    d = (mov >> 6) & 63
+    promo = mov >> 12
+    tabla = tablero._tabla
+    piezas_bb = tablero.piezas_bb
+    pieza = tabla[o]
+    victima = tabla[d]
+    ocupadas = tablero.ocupadas ^ BB_CASILLAS[o]
+    if victima is not None:
+        ganancia = VALORES_SEE[victima.indice_tipo]
+    elif pieza.indice_tipo == PEON and d == tablero.al_paso:
+        ganancia = VALORES_SEE[PEON]
+        ocupadas ^= BB_CASILLAS[d - 8 if pieza.lado == BLANCO else d + 8]
+    else:
+        ganancia = 0
+    if promo:
+        ganancia += VALORES_SEE[promo] - VALORES_SEE[PEON]
+        en_casilla = VALORES_SEE[promo]
+    else:
+        en_casilla = VALORES_SEE[pieza.indice_tipo]
+
+    ganancias = [ganancia]
+    lado = pieza.lado ^ 1
+    while True:
+        candidatos = atacantes(piezas_bb, d, lado, ocupadas) & ocupadas
+        if not candidatos:
+            break
+        base = lado * 6
+        for tipo in range(6):
+            bb = candidatos & piezas_bb[base + tipo]
+            if bb:
+                break
+        # Ganancia de `lado` si captura lo que hay en la casilla y nadie responde
+        ganancias.append(en_casilla - ganancias[-1])
+        en_casilla = VALORES_SEE[tipo]
+        ocupadas ^= bb & -bb
+        lado ^= 1
+
+    # Cada bando puede no recapturar: se propaga el mínimo-máximo hacia atrás
+    while len(ganancias) > 1:
+        ultima = ganancias.pop()
+        ganancias[-1] = -max(-ganancias[-1], ultima)
+    return ganancias[0]
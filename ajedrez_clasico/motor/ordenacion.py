@@ -0,0 +1,129 @@
+"""Ordenación de movimientos para la búsqueda alfa-beta.
+
+Responsabilidades:
+- Poner primero la jugada de la tabla de transposición
+- Ordenar capturas y promociones por MVV-LVA (víctima más valiosa, atacante
+  menos valioso), dejando al final las que pierden material según SEE
+- Recordar dos jugadas asesinas (killer) por ply que provocaron cortes
+- Puntuar el resto con la tabla de historia (indexada por lado, origen, destino)
+"""
+from typing import List
+
+from ..bitboards import PEON
+from ..movimiento import Movimiento
+from .intercambio import see, VALORES_SEE
+
+PLIES_MAXIMOS = 128
+
+# ===== BANDAS DE PUNTUACIÓN (de mayor a menor prioridad) =====
+PUNTOS_HASH = 1 << 30
+PUNTOS_CAPTURA = 1 << 26
+PUNTOS_KILLER = 1 << 25
+PUNTOS_CAPTURA_MALA = -(1 << 26)
+# La historia se reescala a la mitad al superar este valor
+LIMITE_HISTORIA = 1 << 20
+
+
+class Ordenacion:
+    """Heurísticas de ordenación que se aprenden durante una búsqueda."""
+
+    def __init__(self):
+        self.killers: List[List[int]] = [[0, 0] for _ in range(PLIES_MAXIMOS)]
+        # Historia "mariposa": lado * 4096 + origen + 64 * destino
+        self.historia: List[int] = [0] * 8192
+
+    def nueva_busqueda(self):
+        """Olvida las killers y envejece la historia de búsquedas anteriores."""
+        for par in self.killers:
+            par[0] = par[1] = 0
+        self.historia = [valor >> 1 for valor in self.historia]
+
+    def es_tranquilo(self, tablero, mov: Movimiento) -> bool:
+        """Ni captura (incluida al paso) ni promoción."""
+        if mov >> 12:
+            return False
+        d = (mov >> 6) & 63
+        if tablero._tabla[d] is not None:
+            return False
+        return not (d == tablero.al_paso and tablero._tabla[mov & 63].indice_tipo == PEON)
+
+    def ordenar(self, tablero, movimientos: List[Movimiento], mov_tt: int = 0,
+                ply: int = 0) -> List[Movimiento]:
+        """Devuelve `movimientos` de más a menos prometedor."""
+        tabla = tablero._tabla
+        al_paso = tablero.al_paso
+        killer1, killer2 = self.killers[ply] if ply < PLIES_MAXIMOS else (0, 0)
+        historia = self.historia
+        base = tablero.lado_turno << 12
+        puntuados = []
+        for mov in movimientos:
+            if mov == mov_tt:
+                puntos = PUNTOS_HASH
+            else:
+                d = (mov >> 6) & 63
+                victima = tabla[d]
+                promo = mov >> 12
+                if victima is not None or promo:
+                    atacante = tabla[mov & 63].indice_tipo
+                    valor = victima.indice_tipo + 1 if victima is not None else 0
+                    puntos = ((valor + promo) << 4) - atacante
+                    # Solo puede perder material si el atacante vale más que la víctima
+                    if (VALORES_SEE[atacante] > (VALORES_SEE[valor - 1] if valor else 0)
+                            and see(tablero, mov) < 0):
+                        puntos += PUNTOS_CAPTURA_MALA
+                    else:
+                        puntos += PUNTOS_CAPTURA
+                elif d == al_paso and tabla[mov & 63].indice_tipo == PEON:
+                    puntos = PUNTOS_CAPTURA + ((PEON + 1) << 4)
+                elif mov == killer1:
+                    puntos = PUNTOS_KILLER
+                elif mov == killer2:
+                    puntos = PUNTOS_KILLER - 1
+                else:
+                    puntos = historia[base | (mov & 4095)]
+            puntuados.append((puntos, mov))
+        puntuados.sort(reverse=True)
+        return [mov for _, mov in puntuados]
+
+    def ordenar_capturas(self, tablero, movimientos: List[Movimiento],
+                         descartar_perdedoras: bool = True) -> List[Movimiento]:
+        """Capturas y promociones por MVV-LVA (quiescencia).
+
+        Con `descartar_perdedoras` se eliminan las que pierden material según
+        SEE; solo se calcula cuando el atacante vale más que la víctima.
+        """
+        tabla = tablero._tabla
+        puntuados = []
+        for mov in movimientos:
+            victima = tabla[(mov >> 6) & 63]
+            atacante = tabla[mov & 63].indice_tipo
+            promo = mov >> 12
+            if victima is not None:
+                orden = victima.indice_tipo + 1
+                valor = VALORES_SEE[victima.indice_tipo]
+            elif promo:
+                orden = valor = 0
+            else:
+                # Al paso: la víctima es un peón que no está en la casilla de destino
+                orden = PEON + 1
+                valor = VALORES_SEE[PEON]
+            if (descartar_perdedoras and (promo or VALORES_SEE[atacante] > valor)
+                    and see(tablero, mov) < 0):
+                continue
+            puntuados.append((((orden + promo) << 4) - atacante, mov))
+        puntuados.sort(reverse=True)
+        return [mov for _, mov in puntuados]
+
+    def registrar_corte(self, tablero, mov: Movimiento, profundidad: int, ply: int):
+        """Premia una jugada tranquila que produjo un corte beta."""
+        if not self.es_tranquilo(tablero, mov):
+            return
+        if ply < PLIES_MAXIMOS:
+            par = self.killers[ply]
+            if par[0] != mov:
+                par[1] = par[0]
+                par[0] = mov
+        i = (tablero.lado_turno << 12) | (mov & 4095)
+        self.historia[i] += profundidad * profundidad
+        if self.historia[i] > LIMITE_HISTORIA:
+            self.historia = [valor >> 1 for valor in self.historia]
@@ -0,0 +1,194 @@
+"""Búsqueda Lazy SMP en varios procesos con tabla de transposición compartida.
+
+Responsabilidades:
+- Reservar la tabla de transposición en `multiprocessing.shared_memory` para
+  que todos los procesos lean y escriban las mismas entradas
+- Mantener procesos auxiliares persistentes que buscan la misma raíz que el
+  proceso principal, alternando profundidades para repartirse el árbol
+- Detener a los auxiliares cuando termina la búsqueda principal y quedarse
+  con el resultado completo más profundo
+- Ofrecer la búsqueda principal como una `Busqueda` más (`busqueda`), con
+  parada externa y ponder, para usarla desde la partida
+
+Los hilos de Python no aceleran una búsqueda ligada a CPU; los procesos sí.
+No hay cerrojos: cada entrada guarda `clave ^ datos`, así que una escritura
+a medias de otro proceso se lee como un fallo de la tabla.
+"""
+import itertools
+import os
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+from ..tablero import Tablero
+from .busqueda import Busqueda, Opciones, ResultadoBusqueda, PROFUNDIDAD_MAXIMA
+from .transposicion import TablaTransposicion, TAMANO_MB_POR_DEFECTO
+
+# Margen para que los auxiliares respondan tras la señal de parada
+_ESPERA_AUXILIARES_S = 10.0
+
+
+def _trabajador(nombre: str, indice: int, opciones: Opciones, trabajos, resultados, parada):
+    """Bucle de un proceso auxiliar: busca cada raíz recibida hasta la señal de parada."""
+    memoria = shared_memory.SharedMemory(name=nombre)
+    vista = memoria.buf.cast('Q')
+    tt = busqueda = None
+    try:
+        tt = TablaTransposicion(buffer=vista)
+        tablero = Tablero()
+        busqueda = Busqueda(tablero, tt, opciones)
+        busqueda.parada = parada
+        while True:
+            trabajo = trabajos.get()
+            if trabajo is None:
+                break
+            id_trabajo, fen, historial, profundidad, generacion = trabajo
+            try:
+                tablero.cargar_fen(fen)
+                tablero.cargar_historial(historial)
+                # buscar() avanza la generación: se parte de la anterior a la del principal
+                tt.generacion = (generacion - 1) & 63
+                # Los auxiliares impares van un ply por delante del principal
+                r = busqueda.buscar(profundidad=profundidad, desfase=indice % 2)
+                resultados.put((id_trabajo, r.mejor, r.puntuacion, r.profundidad, r.nodos))
+            except Exception:
+                resultados.put((id_trabajo, None, 0, 0, busqueda.nodos))
+    finally:
+        # La vista no puede liberarse mientras la tabla la siga usando
+        tt = busqueda = None
+        vista.release()
+        memoria.close()
+
+
+class BusquedaParalela:
+    """Motor Lazy SMP: el proceso actual más `procesos - 1` auxiliares persistentes."""
+
+    def __init__(self, procesos: Optional[int] = None, tamano_mb: int = TAMANO_MB_POR_DEFECTO,
+                 opciones: Opciones = Opciones()):
+        self.procesos = max(1, procesos or os.cpu_count() or 1)
+        self.opciones = opciones
+        enteros = TablaTransposicion.enteros_necesarios(tamano_mb)
+        self._memoria = shared_memory.SharedMemory(create=True, size=enteros * 8)
+        self._vista = self._memoria.buf.cast('Q')
+        self.tt = TablaTransposicion(buffer=self._vista)
+        self._ids = itertools.count(1)
+        contexto = multiprocessing.get_context()
+        self._parada = contexto.Event()
+        self._resultados = contexto.Queue()
+        self._colas = []
+        self._auxiliares = []
+        for indice in range(1, self.procesos):
+            cola = contexto.Queue()
+            proceso = contexto.Process(
+                target=_trabajador,
+                args=(self._memoria.name, indice, opciones, cola, self._resultados, self._parada),
+                daemon=True,
+            )
+            proceso.start()
+            self._colas.append(cola)
+            self._auxiliares.append(proceso)
+
+    def __enter__(self) -> 'BusquedaParalela':
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def limpiar(self):
+        """Vacía la tabla compartida (entre posiciones sin relación)."""
+        self.tt.limpiar()
+
+    def busqueda(self, tablero: Tablero) -> 'BusquedaLazySMP':
+        """Búsqueda principal sobre `tablero` que arrastra a los auxiliares en cada `buscar`."""
+        return BusquedaLazySMP(self, tablero)
+
+    def buscar(self, tablero: Tablero, tiempo_ms: Optional[int] = None,
+               profundidad: int = PROFUNDIDAD_MAXIMA,
+               informar: Optional[Callable[[ResultadoBusqueda], None]] = None,
+               nodos: Optional[int] = None) -> ResultadoBusqueda:
+        """Busca `tablero` en todos los procesos; `tablero` se restaura al terminar.
+
+        Los nodos del resultado suman los de todos los procesos; el límite
+        `nodos` solo cuenta los del proceso principal.
+        """
+        return self.busqueda(tablero).buscar(tiempo_ms=tiempo_ms, profundidad=profundidad,
+                                             informar=informar, nodos=nodos)
+
+    def _lanzar(self, tablero: Tablero, profundidad: int) -> int:
+        """Envía la raíz a los auxiliares; devuelve el id del trabajo."""
+        id_trabajo = next(self._ids)
+        self._parada.clear()
+        trabajo = (id_trabajo, tablero.a_fen(), list(tablero.historial_hashes),
+                   profundidad, (self.tt.generacion + 1) & 63)
+        for cola in self._colas:
+            cola.put(trabajo)
+        return id_trabajo
+
+    def _recoger(self, id_trabajo: int):
+        """Espera la respuesta de cada auxiliar; devuelve (nodos, (jugada, puntuación, prof))."""
+        nodos = 0
+        mejor = None
+        pendientes = len(self._auxiliares)
+        while pendientes:
+            try:
+                recibido, mov, puntuacion, prof, nodos_aux = self._resultados.get(
+                    timeout=_ESPERA_AUXILIARES_S)
+            except queue.Empty:
+                break
+            if recibido != id_trabajo:
+                continue
+            pendientes -= 1
+            nodos += nodos_aux
+            if mov is not None and (mejor is None or prof > mejor[2]):
+                mejor = (mov, puntuacion, prof)
+        return nodos, mejor
+
+    def cerrar(self):
+        """Detiene los auxiliares y libera la memoria compartida."""
+        if self._memoria is None:
+            return
+        self._parada.set()
+        for cola in self._colas:
+            cola.put(None)
+        for proceso in self._auxiliares:
+            proceso.join(timeout=_ESPERA_AUXILIARES_S)
+            if proceso.is_alive():
+                proceso.terminate()
+        self.tt = None
+        self._vista.release()
+        self._memoria.close()
+        self._memoria.unlink()
+        self._memoria = None
+
+
+class BusquedaLazySMP(Busqueda):
+    """Búsqueda del proceso principal de una `BusquedaParalela`.
+
+    Se usa igual que `Busqueda` (parada, `detener`, ponder y `ponderhit`);
+    cada `buscar` lanza la misma raíz en los auxiliares y los detiene al acabar.
+    """
+
+    def __init__(self, paralela: BusquedaParalela, tablero: Tablero):
+        super().__init__(tablero, paralela.tt, paralela.opciones)
+        self.paralela = paralela
+
+    def buscar(self, tiempo_ms: Optional[int] = None,
+               profundidad: int = PROFUNDIDAD_MAXIMA,
+               informar: Optional[Callable[[ResultadoBusqueda], None]] = None,
+               desfase: int = 0, ponder: bool = False,
+               nodos: Optional[int] = None) -> ResultadoBusqueda:
+        paralela = self.paralela
+        id_trabajo = paralela._lanzar(self.tablero, profundidad)
+        try:
+            resultado = super().buscar(tiempo_ms, profundidad, informar, desfase, ponder, nodos)
+        finally:
+            paralela._parada.set()
+            nodos_auxiliares, mejor_auxiliar = paralela._recoger(id_trabajo)
+
+        nodos_total = resultado.nodos + nodos_auxiliares
+        if mejor_auxiliar is not None and mejor_auxiliar[2] > resultado.profundidad:
+            mov, puntuacion, prof = mejor_auxiliar
+            return resultado._replace(mejor=mov, puntuacion=puntuacion, profundidad=prof,
+                                      nodos=nodos_total, pv=[mov])
+        return resultado._replace(nodos=nodos_total)
@@ -0,0 +1,132 @@
+"""Tabla de transposición de tamaño fijo indexada por hash Zobrist.
+
+Responsabilidades:
+- Reservar toda la memoria al crearse (un array de enteros de 64 bits) para
+  que el consumo no crezca durante análisis largos
+- Guardar por posición profundidad, puntuación, tipo de cota y mejor jugada
+- Reemplazo por cubetas de dos entradas: una preferente por profundidad y
+  otra que siempre se sobrescribe
+- Contar sondeos y aciertos para informar de la tasa de aciertos
+
+Cada cubeta ocupa cuatro enteros: `clave ^ datos, datos` para cada entrada.
+Guardar la clave mezclada con los datos permite detectar entradas a medio
+escribir cuando la memoria la comparten varios procesos.
+"""
+from array import array
+from typing import Optional, Tuple
+
+# ===== TIPOS DE COTA =====
+EXACTA = 1
+INFERIOR = 2   # la puntuación real es >= (corte beta)
+SUPERIOR = 3   # la puntuación real es <= (ningún movimiento superó alfa)
+
+TAMANO_MB_POR_DEFECTO = 16
+_BYTES_CUBETA = 32
+_MASCARA_64 = (1 << 64) - 1
+
+# Empaquetado de `datos`: jugada (16 bits) | puntuación desplazada (21) |
+# profundidad (8) | cota (2) | generación (6)
+_DESPLAZAMIENTO_PUNTUACION = 1 << 20
+
+
+def _empaquetar(mov: int, puntuacion: int, profundidad: int, cota: int, generacion: int) -> int:
+    return (mov
+            | ((puntuacion + _DESPLAZAMIENTO_PUNTUACION) << 16)
+            | (profundidad << 37)
+            | (cota << 45)
+            | (generacion << 47))
+
+
+class TablaTransposicion:
+    """Tabla de transposición sobre un buffer de enteros de 64 bits sin signo.
+
+    `buffer` permite montar la tabla sobre memoria ya reservada (por ejemplo
+    una vista `memoryview(...).cast('Q')` de memoria compartida).
+    """
+
+    def __init__(self, tamano_mb: int = TAMANO_MB_POR_DEFECTO, buffer=None):
+        if buffer is None:
+            cubetas = 1 << max(0, (tamano_mb * 1024 * 1024 // _BYTES_CUBETA).bit_length() - 1)
+            buffer = array('Q', bytes(cubetas * _BYTES_CUBETA))
+        else:
+            cubetas = 1 << max(0, (len(buffer) // 4).bit_length() - 1)
+        self.datos = buffer
+        self.cubetas = cubetas
+        self._mascara = cubetas - 1
+        self.generacion = 0
+        self.sondeos = 0
+        self.aciertos = 0
+
+    @staticmethod
+    def enteros_necesarios(tamano_mb: int) -> int:
+        """Longitud (en enteros de 64 bits) del buffer para una tabla de `tamano_mb`."""
+        cubetas = 1 << max(0, (tamano_mb * 1024 * 1024 // _BYTES_CUBETA).bit_length() - 1)
+        return cubetas * 4
+
+    def limpiar(self):
+        self.datos[:] = array('Q', bytes(len(self.datos) * 8))
+        self.generacion = 0
+        self.reiniciar_estadisticas()
+
+    def nueva_busqueda(self):
+        """Marca el inicio de una búsqueda: las entradas anteriores pasan a ser reemplazables."""
+        self.generacion = (self.generacion + 1) & 63
+
+    def reiniciar_estadisticas(self):
+        self.sondeos = 0
+        self.aciertos = 0
+
+    def tasa_aciertos(self) -> float:
+        return self.aciertos / self.sondeos if self.sondeos else 0.0
+
+    def sondear(self, clave: int) -> Optional[Tuple[int, int, int, int]]:
+        """Devuelve (jugada, puntuación, profundidad, cota) o None si no está."""
+        self.sondeos += 1
+        datos = self.datos
+        i = (clave & self._mascara) << 2
+        for j in (i, i + 2):
+            empaquetado = datos[j + 1]
+            if datos[j] ^ empaquetado == clave and empaquetado:
+                self.aciertos += 1
+                return (empaquetado & 0xFFFF,
+                        ((empaquetado >> 16) & 0x1FFFFF) - _DESPLAZAMIENTO_PUNTUACION,
+                        (empaquetado >> 37) & 0xFF,
+                        (empaquetado >> 45) & 3)
+        return None
+
+    def guardar(self, clave: int, profundidad: int, puntuacion: int, cota: int, mov: int = 0):
+        """Guarda la entrada en la cubeta de `clave`.
+
+        La entrada preferente solo se sustituye por una búsqueda igual o más
+        profunda, por la misma posición o si es de una búsqueda anterior; en
+        otro caso se usa la entrada de reemplazo siempre.
+        """
+        clave &= _MASCARA_64
+        datos = self.datos
+        i = (clave & self._mascara) << 2
+        generacion = self.generacion
+        preferente = datos[i + 1]
+        if (not preferente
+                or datos[i] ^ preferente == clave
+                or profundidad >= (preferente >> 37) & 0xFF
+                or (preferente >> 47) != generacion):
+            if not mov and datos[i] ^ preferente == clave:
+                # Conservar la jugada conocida si la nueva entrada no aporta una
+                mov = preferente & 0xFFFF
+            j = i
+        else:
+            j = i + 2
+        empaquetado = _empaquetar(mov, puntuacion, min(max(profundidad, 0), 255), cota, generacion)
+        datos[j] = clave ^ empaquetado
+        datos[j + 1] = empaquetado
+
+    def ocupacion(self, muestra: int = 1000) -> float:
+        """Fracción de entradas de la generación actual entre las primeras `muestra` cubetas."""
+        datos = self.datos
+        n = min(muestra, self.cubetas)
+        usadas = 0
+        for i in range(0, n * 4, 2):
+            empaquetado = datos[i + 1]
+            if empaquetado and (empaquetado >> 47) == self.generacion:
+                usadas += 1
+        return usadas / (2 * n) if n else 0.0
@@ -0,0 +1,57 @@
+"""Codificación compacta de movimientos como enteros.
+
+Un movimiento ocupa 15 bits: `origen | destino << 6 | promocion << 12`, con
+casillas 0..63 y la promoción como índice de tipo (CABALLO..REINA) o 0.
+Enroque y captura al paso no necesitan marca: se deducen de la pieza movida.
+"""
+from typing import Optional, Tuple
+from .bitboards import CABALLO, ALFIL, TORRE, REINA
+
+Movimiento = int
+
+LETRAS_PROMOCION = {CABALLO: "n", ALFIL: "b", TORRE: "r", REINA: "q"}
+PROMOCION_POR_LETRA = {letra: tipo for tipo, letra in LETRAS_PROMOCION.items()}
+
+
+def crear_movimiento(origen: int, destino: int, promocion: int = 0) -> Movimiento:
+    """Codifica un movimiento a partir de casillas 0..63."""
+    return origen | (destino << 6) | (promocion << 12)
+
+
+def origen(mov: Movimiento) -> int:
+    return mov & 63
+
+
+def destino(mov: Movimiento) -> int:
+    return (mov >> 6) & 63
+
+
+def promocion(mov: Movimiento) -> int:
+    return mov >> 12
+
+
+def posiciones(mov: Movimiento) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Devuelve el movimiento como ((x, y) origen, (x, y) destino)."""
+    o, d = mov & 63, (mov >> 6) & 63
+    return (o & 7, o >> 3), (d & 7, d >> 3)
+
+
+def movimiento_a_uci(mov: Movimiento) -> str:
+    """Convierte a notación UCI/LAN (e2e4, e7e8q)."""
+    o, d = mov & 63, (mov >> 6) & 63
+    texto = "abcdefgh"[o & 7] + str((o >> 3) + 1) + "abcdefgh"[d & 7] + str((d >> 3) + 1)
+    return texto + LETRAS_PROMOCION.get(mov >> 12, "")
+
+
+def uci_a_movimiento(uci: str) -> Optional[Movimiento]:
+    """Convierte 'e2e4' / 'e7e8q' en movimiento; None si el texto no es válido."""
+    if not uci or len(uci) < 4:
+        return None
+    columnas = "abcdefgh"
+    filas = "12345678"
+    if not (uci[0] in columnas and uci[1] in filas and uci[2] in columnas and uci[3] in filas):
+        return None
+    o = columnas.index(uci[0]) + 8 * filas.index(uci[1])
+    d = columnas.index(uci[2]) + 8 * filas.index(uci[3])
+    promo = PROMOCION_POR_LETRA.get(uci[4:5].lower(), 0)
+    return crear_movimiento(o, d, promo)
@@ -0,0 +1,175 @@
+"""Perft: recuento de nodos del generador de movimientos.
+
+Responsabilidades:
+- Contar las posiciones alcanzables a una profundidad dada (con make/unmake)
+- Desglosar el recuento por movimiento raíz (divide) para localizar errores
+- Medir nodos por segundo como referencia de rendimiento del núcleo
+- Contrastar los recuentos con python-chess y con posiciones de referencia
+
+Uso:
+    python -m ajedrez_clasico.perft "<fen>" -p 4 --divide --verificar
+    python -m ajedrez_clasico.perft --suite -p 4
+"""
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import chess
+except Exception:
+    chess = None
+
+from .tablero import Tablero
+from .fen import FEN_INICIAL
+from .movimiento import movimiento_a_uci
+
+
+# ===== POSICIONES DE REFERENCIA =====
+# (nombre, FEN, nodos esperados para profundidad 1, 2, 3...)
+POSICIONES_REFERENCIA: List[Tuple[str, str, List[int]]] = [
+    ("inicial", FEN_INICIAL,
+     [20, 400, 8902, 197281, 4865609]),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("posicion3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624]),
+    ("posicion4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("posicion5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("posicion6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594]),
+]
+
+
+def perft(tablero: Tablero, profundidad: int) -> int:
+    """Número de posiciones hoja a `profundidad` medias jugadas.
+
+    En el último nivel se cuentan los movimientos legales sin ejecutarlos.
+    """
+    movimientos = tablero.movimientos_legales()
+    if profundidad <= 1:
+        return len(movimientos) if profundidad == 1 else 1
+    nodos = 0
+    hacer = tablero.hacer_movimiento
+    deshacer = tablero.deshacer_movimiento
+    for mov in movimientos:
+        hacer(mov)
+        nodos += perft(tablero, profundidad - 1)
+        deshacer()
+    return nodos
+
+
+def dividir(tablero: Tablero, profundidad: int) -> Dict[str, int]:
+    """Recuento perft de cada movimiento raíz, con el movimiento en UCI."""
+    resultado = {}
+    for mov in tablero.movimientos_legales():
+        tablero.hacer_movimiento(mov)
+        resultado[movimiento_a_uci(mov)] = perft(tablero, profundidad - 1)
+        tablero.deshacer_movimiento()
+    return resultado
+
+
+def perft_python_chess(fen: str, profundidad: int) -> Optional[Dict[str, int]]:
+    """Divide calculado con python-chess; None si la librería no está instalada."""
+    if chess is None:
+        return None
+
+    def contar(board, restante: int) -> int:
+        if restante <= 1:
+            return board.legal_moves.count() if restante == 1 else 1
+        nodos = 0
+        for move in board.legal_moves:
+            board.push(move)
+            nodos += contar(board, restante - 1)
+            board.pop()
+        return nodos
+
+    board = chess.Board(fen)
+    resultado = {}
+    for move in list(board.legal_moves):
+        board.push(move)
+        resultado[move.uci()] = contar(board, profundidad - 1)
+        board.pop()
+    return resultado
+
+
+def medir(fen: str, profundidad: int) -> Tuple[Dict[str, int], float]:
+    """Ejecuta divide sobre `fen` y devuelve (recuento por movimiento, segundos)."""
+    tablero = Tablero()
+    tablero.cargar_fen(fen)
+    inicio = time.perf_counter()
+    resultado = dividir(tablero, profundidad)
+    return resultado, time.perf_counter() - inicio
+
+
+def _informar(nombre: str, nodos: int, segundos: float, esperado: Optional[int] = None) -> bool:
+    nps = nodos / segundos if segundos > 0 else 0.0
+    estado = ""
+    correcto = True
+    if esperado is not None:
+        correcto = nodos == esperado
+        estado = "  OK" if correcto else f"  FALLO (esperado {esperado})"
+    print(f"{nombre}: {nodos} nodos en {segundos:.3f} s ({nps:,.0f} nps){estado}")
+    return correcto
+
+
+def _comparar(propio: Dict[str, int], referencia: Dict[str, int]) -> bool:
+    """Imprime las diferencias de divide respecto a python-chess."""
+    diferencias = sorted(set(propio) | set(referencia))
+    correcto = True
+    for uci in diferencias:
+        a, b = propio.get(uci), referencia.get(uci)
+        if a != b:
+            correcto = False
+            print(f"  {uci}: propio={a} python-chess={b}")
+    return correcto
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Perft del generador de movimientos nativo.")
+    parser.add_argument("fen", nargs="?", default=FEN_INICIAL, help="posición en FEN")
+    parser.add_argument("-p", "--profundidad", type=int, default=4)
+    parser.add_argument("--divide", action="store_true", help="desglose por movimiento raíz")
+    parser.add_argument("--verificar", action="store_true",
+                        help="contrastar el desglose con python-chess")
+    parser.add_argument("--suite", action="store_true",
+                        help="recorrer las posiciones de referencia hasta la profundidad indicada")
+    args = parser.parse_args(argv)
+    if args.profundidad < 1:
+        parser.error("la profundidad debe ser al menos 1")
+    if args.verificar and chess is None:
+        parser.error("--verificar requiere python-chess instalado")
+
+    correcto = True
+    if args.suite:
+        total_nodos = 0
+        total_segundos = 0.0
+        for nombre, fen, esperados in POSICIONES_REFERENCIA:
+            profundidad = min(args.profundidad, len(esperados))
+            resultado, segundos = medir(fen, profundidad)
+            nodos = sum(resultado.values())
+            total_nodos += nodos
+            total_segundos += segundos
+            correcto &= _informar(f"{nombre} p{profundidad}", nodos, segundos,
+                                  esperados[profundidad - 1])
+        _informar("total", total_nodos, total_segundos)
+        return 0 if correcto else 1
+
+    resultado, segundos = medir(args.fen, args.profundidad)
+    if args.divide:
+        for uci in sorted(resultado):
+            print(f"{uci}: {resultado[uci]}")
+    nodos = sum(resultado.values())
+    esperado = None
+    if args.verificar:
+        referencia = perft_python_chess(args.fen, args.profundidad)
+        esperado = sum(referencia.values())
+        correcto = _comparar(resultado, referencia)
+    correcto &= _informar(f"perft p{args.profundidad}", nodos, segundos, esperado)
+    return 0 if correcto else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
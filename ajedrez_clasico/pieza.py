@@ -3,11 +3,16 @@
 Responsabilidades:
 - Mantener estado por pieza (color, tipo, posición, imagen)
 - Proveer movimientos por tipo, sin validar reglas globales (jaque, etc.)
+- Consultar la ocupación del tablero mediante sus bitboards, no por casillas
 """
 from __future__ import annotations
-import pygame
 from typing import List, Tuple
 from modelos import Color, TipoPieza
+from .bitboards import BB_CASILLAS, INDICE_COLOR, INDICE_TIPO, POSICIONES, BLANCO
+from .ataques import (
+    SALTOS_CABALLO, SALTOS_REY, CAPTURAS_PEON, ATAQUES_PEON,
+    TABLA_TORRE, TABLA_ALFIL, MASCARA_TORRE, MASCARA_ALFIL,
+)
 
 class Pieza:
     def __init__(self, color: Color, tipo: TipoPieza):
@@ -17,7 +22,11 @@ class Pieza:
         self.posicion = None
         self.movimientos = 0
         self.imagen = None
-        
+        # Índices compactos usados por los bitboards del tablero
+        self.lado = INDICE_COLOR[color]
+        self.indice_tipo = INDICE_TIPO[tipo]
+        self.indice = self.lado * 6 + self.indice_tipo
+
     def obtener_movimientos_validos(self, tablero) -> List[Tuple[int, int]]:
         tipo_val = getattr(self.tipo, 'value', None)
         if tipo_val == 'peon':
@@ -33,144 +42,75 @@ class Pieza:
         elif tipo_val == 'rey':
             return self._movimientos_rey(tablero)
         return []
-    
+
     def _movimientos_peon(self, tablero) -> List[Tuple[int, int]]:
         """Genera movimientos del peón (avance y capturas diagonales)."""
         movimientos = []
         x, y = self.posicion
-        
-        # Dirección de movimiento según el color (usa .value para evitar dependencias de enum)
-        direccion = 1 if getattr(self.color, 'value', None) == 'blanco' else -1
-        
+        sq = x + 8 * y
+        ocupadas = tablero.ocupadas
+
+        # Dirección de movimiento según el color (en casillas: ±8)
+        paso = 8 if self.lado == BLANCO else -8
+        destino = sq + paso
+
         # Movimiento hacia adelante (1 casilla)
-        nueva_pos = (x, y + direccion)
-        if 0 <= nueva_pos[1] < 8 and tablero.casillas.get(nueva_pos) is None:
-            movimientos.append(nueva_pos)
-            
+        if 0 <= destino < 64 and not ocupadas & BB_CASILLAS[destino]:
+            movimientos.append(POSICIONES[destino])
+
             # Movimiento inicial (2 casillas)
-            if self.movimientos == 0:
-                nueva_pos = (x, y + 2 * direccion)
-                if 0 <= nueva_pos[1] < 8 and tablero.casillas.get(nueva_pos) is None:
-                    movimientos.append(nueva_pos)
-        
-        # Capturas en diagonal
-        for dx in [-1, 1]:
-            nueva_pos = (x + dx, y + direccion)
-            if 0 <= nueva_pos[0] < 8 and 0 <= nueva_pos[1] < 8:
-                if tablero.casillas.get(nueva_pos) and tablero.casillas[nueva_pos].color != self.color:
-                    movimientos.append(nueva_pos)
-        
+            destino += paso
+            if self.movimientos == 0 and 0 <= destino < 64 and not ocupadas & BB_CASILLAS[destino]:
+                movimientos.append(POSICIONES[destino])
+
+        # Capturas en diagonal (tabla precalculada por color)
+        capturas = ATAQUES_PEON[self.lado][sq] & tablero.ocupacion[self.lado ^ 1]
+        for destino in CAPTURAS_PEON[self.lado][sq]:
+            if capturas & BB_CASILLAS[destino]:
+                movimientos.append(POSICIONES[destino])
+
         return movimientos
-    
+
+    def _destinos(self, tablero, ataques: int) -> List[Tuple[int, int]]:
+        """Convierte un bitboard de ataques en destinos, descartando piezas propias."""
+        destinos = ataques & ~tablero.ocupacion[self.lado]
+        movimientos = []
+        while destinos:
+            b = destinos & -destinos
+            movimientos.append(POSICIONES[b.bit_length() - 1])
+            destinos ^= b
+        return movimientos
+
     def _movimientos_torre(self, tablero) -> List[Tuple[int, int]]:
         """Genera movimientos en líneas rectas hasta encontrar bloqueo o borde."""
-        movimientos = []
         x, y = self.posicion
-        
-        # Direcciones: horizontal y vertical
-        direcciones = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        
-        for dx, dy in direcciones:
-            for i in range(1, 8):
-                nueva_pos = (x + i * dx, y + i * dy)
-                
-                # Verificar si está dentro del tablero
-                if not (0 <= nueva_pos[0] < 8 and 0 <= nueva_pos[1] < 8):
-                    break
-                
-                # Verificar si hay una pieza en la casilla
-                if nueva_pos in tablero.casillas and tablero.casillas[nueva_pos]:
-                    # Si es una pieza enemiga, se puede capturar
-                    if tablero.casillas[nueva_pos].color != self.color:
-                        movimientos.append(nueva_pos)
-                    break
-                
-                movimientos.append(nueva_pos)
-        
-        return movimientos
-    
+        sq = x + 8 * y
+        return self._destinos(tablero, TABLA_TORRE[sq][tablero.ocupadas & MASCARA_TORRE[sq]])
+
     def _movimientos_alfil(self, tablero) -> List[Tuple[int, int]]:
         """Genera movimientos diagonales hasta encontrar bloqueo o borde."""
-        movimientos = []
         x, y = self.posicion
-        
-        # Direcciones diagonales
-        direcciones = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        
-        for dx, dy in direcciones:
-            for i in range(1, 8):
-                nueva_pos = (x + i * dx, y + i * dy)
-                
-                # Verificar si está dentro del tablero
-                if not (0 <= nueva_pos[0] < 8 and 0 <= nueva_pos[1] < 8):
-                    break
-                
-                # Verificar si hay una pieza en la casilla
-                if nueva_pos in tablero.casillas and tablero.casillas[nueva_pos]:
-                    # Si es una pieza enemiga, se puede capturar
-                    if tablero.casillas[nueva_pos].color != self.color:
-                        movimientos.append(nueva_pos)
-                    break
-                
-                movimientos.append(nueva_pos)
-        
-        return movimientos
-    
+        sq = x + 8 * y
+        return self._destinos(tablero, TABLA_ALFIL[sq][tablero.ocupadas & MASCARA_ALFIL[sq]])
+
+    def _movimientos_saltos(self, tablero, saltos) -> List[Tuple[int, int]]:
+        """Filtra los destinos precalculados ocupados por piezas propias."""
+        x, y = self.posicion
+        propias = tablero.ocupacion[self.lado]
+        return [POSICIONES[d] for d in saltos[x + 8 * y] if not propias & BB_CASILLAS[d]]
+
     def _movimientos_caballo(self, tablero) -> List[Tuple[int, int]]:
         """Genera saltos en L (caballo), ignorando ocupación intermedia."""
-        movimientos = []
-        x, y = self.posicion
-        
-        # Movimientos del caballo (en L)
-        desplazamientos = [
-            (1, 2), (2, 1), (2, -1), (1, -2),
-            (-1, -2), (-2, -1), (-2, 1), (-1, 2)
-        ]
-        
-        for dx, dy in desplazamientos:
-            nueva_pos = (x + dx, y + dy)
-            
-            # Verificar si está dentro del tablero
-            if not (0 <= nueva_pos[0] < 8 and 0 <= nueva_pos[1] < 8):
-                continue
-            
-            # Verificar si hay una pieza en la casilla
-            if nueva_pos in tablero.casillas and tablero.casillas[nueva_pos]:
-                # Si es una pieza enemiga, se puede capturar
-                if tablero.casillas[nueva_pos].color != self.color:
-                    movimientos.append(nueva_pos)
-            else:
-                movimientos.append(nueva_pos)
-        
-        return movimientos
-    
+        return self._movimientos_saltos(tablero, SALTOS_CABALLO)
+
     def _movimientos_reina(self, tablero) -> List[Tuple[int, int]]:
-        """Combina movimientos de torre y alfil."""
-        return self._movimientos_torre(tablero) + self._movimientos_alfil(tablero)
-    
+        """Combina ataques de torre y alfil en un único bitboard."""
+        x, y = self.posicion
+        sq = x + 8 * y
+        ocupadas = tablero.ocupadas
+        return self._destinos(tablero, TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]]
+                              | TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]])
+
     def _movimientos_rey(self, tablero) -> List[Tuple[int, int]]:
         """Genera movimientos a casillas adyacentes (sin enroque)."""
-        movimientos = []
-        x, y = self.posicion
-        
-        # El rey puede moverse una casilla en cualquier dirección
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                
-                nueva_pos = (x + dx, y + dy)
-                
-                # Verificar si está dentro del tablero
-                if not (0 <= nueva_pos[0] < 8 and 0 <= nueva_pos[1] < 8):
-                    continue
-                
-                # Verificar si hay una pieza en la casilla
-                if nueva_pos in tablero.casillas and tablero.casillas[nueva_pos]:
-                    # Si es una pieza enemiga, se puede capturar
-                    if tablero.casillas[nueva_pos].color != self.color:
-                        movimientos.append(nueva_pos)
-                else:
-                    movimientos.append(nueva_pos)
-        
-        return movimientos
+        return self._movimientos_saltos(tablero, SALTOS_REY)
@@ -1,115 +1,535 @@
 """Lógica del tablero y estado del juego.
 
 Responsabilidades:
-- Mantener casillas, turno y estado (jugando, jaque, mate)
-- Ejecutar movimientos y validar jaque/jaque mate básicos
-- Inicializar las piezas en posiciones estándar
+- Mantener la posición en bitboards: 12 por tipo de pieza más ocupación
+- Mantener listas de piezas por color y la casilla de cada rey
+- Exponer `casillas` como vista derivada (dict-like) para la UI y utilidades
+- Mantener turno y estado (jugando, jaque, mate)
+- Hacer/deshacer movimientos con una pila de registros (enroque, al paso, promoción)
+- Mantener un hash Zobrist de la posición actualizado en cada movimiento
+- Mantener las sumas de evaluación pieza-casilla y la fase de forma incremental
+- Ejecutar movimientos validándolos contra el generador de movimientos legales
+- Detectar jaque (consulta inversa de casilla atacada), jaque mate y ahogado
+- Detectar tablas por triple repetición y regla de los 50 movimientos en O(1)
+- Inicializar las piezas en posiciones estándar o desde una FEN
 """
-from typing import List, Tuple, Optional, Dict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Tuple, Optional
 from modelos import Color, TipoPieza, EstadoJuego, GestorRecursos
 from .pieza import Pieza
+from .bitboards import (
+    BB_CASILLAS, POSICIONES, COLORES, INDICE_COLOR, INDICE_TIPO, TIPOS,
+    PEON, REY, BLANCO, ENROQUES_TODOS, MASCARA_ENROQUE,
+)
+from .movimiento import Movimiento, crear_movimiento
+from .generador import generar_legales, casilla_atacada
+from .evaluacion import PST_MG, PST_EG, FASE_PIEZA
+from . import fen as fen_codec
+from .zobrist import (
+    ZOBRIST_PIEZAS, ZOBRIST_TURNO, ZOBRIST_ENROQUE, clave_al_paso, calcular_hash,
+)
+
+
+class VistaCasillas(MutableMapping):
+    """Vista `{(x, y): Pieza | None}` de las 64 casillas, derivada del tablero.
+
+    Las lecturas consultan el tablero directamente; las escrituras colocan o
+    retiran piezas manteniendo sincronizados los bitboards.
+    """
+    __slots__ = ('tablero',)
+
+    def __init__(self, tablero: 'Tablero'):
+        self.tablero = tablero
+
+    def __getitem__(self, pos: Tuple[int, int]) -> Optional[Pieza]:
+        try:
+            x, y = pos
+            if 0 <= x < 8 and 0 <= y < 8:
+                return self.tablero._tabla[x + 8 * y]
+        except (TypeError, ValueError):
+            pass
+        raise KeyError(pos)
+
+    def get(self, pos, default=None):
+        try:
+            x, y = pos
+            if 0 <= x < 8 and 0 <= y < 8:
+                return self.tablero._tabla[x + 8 * y]
+        except (TypeError, ValueError):
+            pass
+        return default
+
+    def __contains__(self, pos) -> bool:
+        try:
+            x, y = pos
+        except (TypeError, ValueError):
+            return False
+        return 0 <= x < 8 and 0 <= y < 8
+
+    def __setitem__(self, pos: Tuple[int, int], pieza: Optional[Pieza]):
+        if pos not in self:
+            raise KeyError(pos)
+        self.tablero._colocar(pos[0] + 8 * pos[1], pieza)
+
+    def __delitem__(self, pos: Tuple[int, int]):
+        if pos not in self:
+            raise KeyError(pos)
+        self.tablero._retirar(pos[0] + 8 * pos[1])
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(POSICIONES)
+
+    def __len__(self) -> int:
+        return 64
+
+    def items(self):
+        return zip(POSICIONES, self.tablero._tabla)
+
 
 class Tablero:
-    def __init__(self, gestor_recursos: GestorRecursos):
-        """Inicializa el tablero con recursos y disposición inicial."""
-        self.casillas: Dict[Tuple[int, int], Optional[Pieza]] = {}
-        self.estado = EstadoJuego.JUGANDO
-        self.turno = Color.BLANCO
+    def __init__(self, gestor_recursos: Optional[GestorRecursos] = None):
+        """Inicializa el tablero con recursos y disposición inicial.
+        - Sin gestor de recursos las piezas no tienen imagen (análisis sin UI).
+        """
+        # Núcleo de bitboards: uno por tipo/color, ocupación por color y total
+        self.piezas_bb: List[int] = [0] * 12
+        self.ocupacion: List[int] = [0, 0]
+        self.ocupadas = 0
+        self._tabla: List[Optional[Pieza]] = [None] * 64
+        # Listas de piezas por lado y casilla del rey, mantenidas incrementalmente
+        self.listas_piezas: Tuple[List[Pieza], List[Pieza]] = ([], [])
+        self.casilla_rey: List[Optional[int]] = [None, None]
+        self.casillas = VistaCasillas(self)
+        # Jaque, mate o tablas; None si hay que recalcularlo al consultarlo
+        self._estado: Optional[EstadoJuego] = EstadoJuego.JUGANDO
+        self.lado_turno = BLANCO
+        # Estado que no se deduce de las piezas (necesario para deshacer)
+        self.enroques = ENROQUES_TODOS
+        self.al_paso: Optional[int] = None
+        self.reloj_medio = 0
+        self.numero_jugada = 1
+        self.hash = 0
+        # Sumas pieza-casilla (medio juego / final, vista blanca) y fase de la partida
+        self.pst_mg = 0
+        self.pst_eg = 0
+        self.fase = 0
+        # Pila de registros (mov, pieza, capturada, enroques, al_paso, reloj_medio, hash)
+        self._deshacer: List[tuple] = []
+        # Pila de hashes de la partida y cuántas veces apareció cada uno
+        self.historial_hashes: List[int] = []
+        self._repeticiones: Dict[int, int] = {}
+        # (longitud del historial, hash tras ceder el turno) de cada nulo en curso
+        self._nulos: List[Tuple[int, int]] = []
         self.historial_movimientos: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
         self.gestor_recursos = gestor_recursos
         self.inicializar_tablero()
-        
-    def realizar_movimiento(self, origen: Tuple[int, int], 
-                           destino: Tuple[int, int]) -> bool:
+        self.hash = calcular_hash(self)
+        self.reiniciar_historial()
+
+    @property
+    def estado(self) -> EstadoJuego:
+        """Estado de la partida; tras cargar una FEN se calcula en la primera consulta."""
+        if self._estado is None:
+            self._actualizar_estado()
+        return self._estado
+
+    @estado.setter
+    def estado(self, estado: Optional[EstadoJuego]):
+        self._estado = estado
+
+    @property
+    def turno(self) -> Color:
+        return COLORES[self.lado_turno]
+
+    @turno.setter
+    def turno(self, color: Color):
+        """Cambia el bando al turno; el al paso pendiente era del otro bando y se pierde."""
+        lado = INDICE_COLOR[color]
+        if lado != self.lado_turno:
+            if self.al_paso is not None:
+                self.hash ^= clave_al_paso(self.piezas_bb, self.al_paso, self.lado_turno)
+                self.al_paso = None
+            self.hash ^= ZOBRIST_TURNO
+            self.lado_turno = lado
+
+    def recalcular_hash(self) -> int:
+        """Recalcula el hash desde cero (tras editar enroques/al paso a mano)."""
+        self.hash = calcular_hash(self)
+        return self.hash
+
+    def reiniciar_historial(self):
+        """Toma la posición actual como inicio del historial de repeticiones."""
+        self.historial_hashes = [self.hash]
+        self._repeticiones = {self.hash: 1}
+        self._nulos = []
+
+    def cargar_historial(self, hashes: List[int]):
+        """Sustituye el historial de repeticiones (la posición actual debe ser la última)."""
+        self.historial_hashes = list(hashes)
+        self._repeticiones = {}
+        self._nulos = []
+        for clave in self.historial_hashes:
+            self._repeticiones[clave] = self._repeticiones.get(clave, 0) + 1
+
+    @property
+    def profundidad_pila(self) -> int:
+        """Movimientos hechos (y aún no deshechos) desde el último `cargar_fen`."""
+        return len(self._deshacer)
+
+    def registro_pila(self, indice: int) -> Tuple[Movimiento, int]:
+        """(movimiento, hash antes de hacerlo) del movimiento `indice` de la pila."""
+        registro = self._deshacer[indice]
+        return registro[0], registro[6]
+
+    def veces_repetida(self) -> int:
+        """Cuántas veces ha aparecido la posición actual en la partida.
+
+        Tras un movimiento nulo solo cuenta lo jugado desde él: el nulo no es
+        una jugada legal y no puede completar una repetición con lo anterior.
+        """
+        if self._nulos:
+            inicio, clave_nulo = self._nulos[-1]
+            return self.historial_hashes[inicio:].count(self.hash) + (self.hash == clave_nulo)
+        return self._repeticiones.get(self.hash, 0)
+
+    def es_triple_repeticion(self) -> bool:
+        return self._repeticiones.get(self.hash, 0) >= 3
+
+    def es_regla_cincuenta(self) -> bool:
+        """50 jugadas completas (100 medias) sin captura ni movimiento de peón."""
+        return self.reloj_medio >= 100
+
+    def _vaciar(self):
+        """Quita todas las piezas de golpe (antes de cargar otra posición)."""
+        self.piezas_bb[:] = [0] * 12
+        self.ocupacion[:] = [0, 0]
+        self.ocupadas = 0
+        self._tabla[:] = [None] * 64
+        for lista in self.listas_piezas:
+            lista.clear()
+        self.casilla_rey[:] = [None, None]
+        self.hash = 0
+        self.pst_mg = 0
+        self.pst_eg = 0
+        self.fase = 0
+
+    def _colocar_todas(self, colocadas: List[Tuple[int, Pieza]]):
+        """Coloca de golpe `(casilla, pieza)` en un tablero recién vaciado (carga de FEN).
+
+        Hace lo mismo que `_colocar` pieza a pieza, pero acumulando en locales.
+        """
+        tabla = self._tabla
+        piezas_bb = self.piezas_bb
+        ocupacion = self.ocupacion
+        listas = self.listas_piezas
+        clave = mg = eg = fase = 0
+        for sq, pieza in colocadas:
+            bit = BB_CASILLAS[sq]
+            i = pieza.indice
+            tabla[sq] = pieza
+            piezas_bb[i] |= bit
+            ocupacion[pieza.lado] |= bit
+            clave ^= ZOBRIST_PIEZAS[i][sq]
+            mg += PST_MG[i][sq]
+            eg += PST_EG[i][sq]
+            fase += FASE_PIEZA[pieza.indice_tipo]
+            pieza.posicion = POSICIONES[sq]
+            listas[pieza.lado].append(pieza)
+            if pieza.indice_tipo == REY:
+                self.casilla_rey[pieza.lado] = sq
+        self.ocupadas = ocupacion[0] | ocupacion[1]
+        self.hash ^= clave
+        self.pst_mg += mg
+        self.pst_eg += eg
+        self.fase += fase
+
+    def _colocar(self, sq: int, pieza: Optional[Pieza]):
+        """Pone `pieza` en el tablero en la casilla `sq` (reemplazando la que hubiera)."""
+        if self._tabla[sq] is not None:
+            self._retirar(sq)
+        if pieza is None:
+            return
+        bit = BB_CASILLAS[sq]
+        self._tabla[sq] = pieza
+        self.piezas_bb[pieza.indice] |= bit
+        self.ocupacion[pieza.lado] |= bit
+        self.ocupadas |= bit
+        self.hash ^= ZOBRIST_PIEZAS[pieza.indice][sq]
+        self.pst_mg += PST_MG[pieza.indice][sq]
+        self.pst_eg += PST_EG[pieza.indice][sq]
+        self.fase += FASE_PIEZA[pieza.indice_tipo]
+        pieza.posicion = POSICIONES[sq]
+        self.listas_piezas[pieza.lado].append(pieza)
+        if pieza.indice_tipo == REY:
+            self.casilla_rey[pieza.lado] = sq
+
+    def _retirar(self, sq: int) -> Optional[Pieza]:
+        """Quita del tablero y devuelve la pieza de la casilla `sq`."""
+        pieza = self._tabla[sq]
+        if pieza is None:
+            return None
+        bit = BB_CASILLAS[sq]
+        self._tabla[sq] = None
+        self.piezas_bb[pieza.indice] ^= bit
+        self.ocupacion[pieza.lado] ^= bit
+        self.ocupadas ^= bit
+        self.hash ^= ZOBRIST_PIEZAS[pieza.indice][sq]
+        self.pst_mg -= PST_MG[pieza.indice][sq]
+        self.pst_eg -= PST_EG[pieza.indice][sq]
+        self.fase -= FASE_PIEZA[pieza.indice_tipo]
+        self.listas_piezas[pieza.lado].remove(pieza)
+        if pieza.indice_tipo == REY and self.casilla_rey[pieza.lado] == sq:
+            self.casilla_rey[pieza.lado] = None
+        return pieza
+
+    def _mover(self, origen: int, destino: int) -> Pieza:
+        """Traslada la pieza de `origen` a `destino` (vacía); las listas no cambian."""
+        tabla = self._tabla
+        pieza = tabla[origen]
+        tabla[origen] = None
+        tabla[destino] = pieza
+        cambio = BB_CASILLAS[origen] | BB_CASILLAS[destino]
+        self.piezas_bb[pieza.indice] ^= cambio
+        self.ocupacion[pieza.lado] ^= cambio
+        self.ocupadas ^= cambio
+        i = pieza.indice
+        claves = ZOBRIST_PIEZAS[i]
+        self.hash ^= claves[origen] ^ claves[destino]
+        self.pst_mg += PST_MG[i][destino] - PST_MG[i][origen]
+        self.pst_eg += PST_EG[i][destino] - PST_EG[i][origen]
+        pieza.posicion = POSICIONES[destino]
+        if pieza.indice_tipo == REY:
+            self.casilla_rey[pieza.lado] = destino
+        return pieza
+
+    def cargar_fen(self, fen: str):
+        """Sustituye la posición por la descrita en `fen` y reinicia el historial.
+
+        Acepta FEN completa o EPD (cuatro campos y operaciones, que se
+        ignoran); lanza ValueError si el texto no describe una posición.
+        """
+        fen_codec.cargar(self, fen_codec.analizar_epd(fen)[0])
+
+    def a_fen(self) -> str:
+        """Devuelve la posición actual en notación FEN completa."""
+        return fen_codec.codificar(self)
+
+    def copiar(self) -> 'Tablero':
+        """Copia independiente de la posición y su historial de repeticiones (sin imágenes)."""
+        copia = Tablero()
+        copia.cargar_fen(self.a_fen())
+        copia.cargar_historial(self.historial_hashes)
+        copia.estado = self.estado
+        return copia
+
+    def obtener_piezas(self, color: Color) -> List[Pieza]:
+        """Piezas en juego del color indicado (sin recorrer las 64 casillas)."""
+        return list(self.listas_piezas[INDICE_COLOR[color]])
+
+    def _crear_pieza(self, lado: int, tipo: int) -> Pieza:
+        """Crea una pieza nueva (promociones) con su imagen si hay recursos."""
+        pieza = Pieza(COLORES[lado], TIPOS[tipo])
+        if self.gestor_recursos is not None:
+            pieza.imagen = self.gestor_recursos.obtener_imagen(pieza.color, pieza.tipo)
+        return pieza
+
+    def hacer_movimiento(self, mov: Movimiento):
+        """Ejecuta `mov` sin validar legalidad y apila lo necesario para deshacerlo.
+
+        Enroque (rey que se desplaza dos columnas), captura al paso y promoción
+        se deducen del propio movimiento y de la pieza movida.
+        """
+        o = mov & 63
+        d = (mov >> 6) & 63
+        promo = mov >> 12
+        tabla = self._tabla
+        pieza = tabla[o]
+        tipo = pieza.indice_tipo
+        capturada = tabla[d]
+        al_paso = self.al_paso
+        enroques = self.enroques
+        lado = self.lado_turno
+        clave = self.hash
+        # La clave de al paso depende de los peones: se retira antes de moverlos
+        if al_paso is not None:
+            self.hash ^= clave_al_paso(self.piezas_bb, al_paso, lado)
+        if capturada is not None:
+            self._retirar(d)
+        elif tipo == PEON and d == al_paso:
+            capturada = self._retirar(d - 8 if pieza.lado == BLANCO else d + 8)
+        self._deshacer.append((mov, pieza, capturada, enroques, al_paso, self.reloj_medio, clave))
+
+        if promo:
+            self._retirar(o)
+            self._colocar(d, self._crear_pieza(pieza.lado, promo))
+        else:
+            self._mover(o, d)
+        pieza.movimientos += 1
+
+        if tipo == REY and (d - o == 2 or o - d == 2):
+            # Enroque: la torre salta al otro lado del rey
+            if d > o:
+                self._mover(o + 3, o + 1)
+            else:
+                self._mover(o - 4, o - 1)
+
+        self.enroques = enroques & MASCARA_ENROQUE[o] & MASCARA_ENROQUE[d]
+        self.reloj_medio = 0 if tipo == PEON or capturada is not None else self.reloj_medio + 1
+        if lado != BLANCO:
+            self.numero_jugada += 1
+        self.lado_turno = lado ^ 1
+        self.hash ^= ZOBRIST_TURNO ^ ZOBRIST_ENROQUE[enroques] ^ ZOBRIST_ENROQUE[self.enroques]
+        if tipo == PEON and (d - o == 16 or o - d == 16):
+            self.al_paso = (o + d) >> 1
+            self.hash ^= clave_al_paso(self.piezas_bb, self.al_paso, lado ^ 1)
+        else:
+            self.al_paso = None
+
+        nueva = self.hash
+        self.historial_hashes.append(nueva)
+        self._repeticiones[nueva] = self._repeticiones.get(nueva, 0) + 1
+
+    def deshacer_movimiento(self):
+        """Revierte el último movimiento hecho con `hacer_movimiento`."""
+        mov, pieza, capturada, enroques, al_paso, reloj_medio, clave = self._deshacer.pop()
+        actual = self.historial_hashes.pop()
+        veces = self._repeticiones[actual] - 1
+        if veces:
+            self._repeticiones[actual] = veces
+        else:
+            del self._repeticiones[actual]
+        o = mov & 63
+        d = (mov >> 6) & 63
+        self.lado_turno ^= 1
+        if self.lado_turno != BLANCO:
+            self.numero_jugada -= 1
+
+        tipo = pieza.indice_tipo
+        if tipo == REY and (d - o == 2 or o - d == 2):
+            if d > o:
+                self._mover(o + 1, o + 3)
+            else:
+                self._mover(o - 1, o - 4)
+
+        if mov >> 12:
+            self._retirar(d)
+            self._colocar(o, pieza)
+        else:
+            self._mover(d, o)
+        pieza.movimientos -= 1
+        if capturada is not None:
+            if tipo == PEON and d == al_paso:
+                self._colocar(d - 8 if pieza.lado == BLANCO else d + 8, capturada)
+            else:
+                self._colocar(d, capturada)
+
+        self.enroques = enroques
+        self.al_paso = al_paso
+        self.reloj_medio = reloj_medio
+        self.hash = clave
+
+    def hacer_nulo(self):
+        """Cede el turno sin mover pieza (poda de movimiento nulo del motor).
+
+        No entra en el historial de repeticiones y hace de barrera para
+        `veces_repetida`; se revierte con `deshacer_nulo`.
+        """
+        al_paso = self.al_paso
+        self._deshacer.append((0, None, None, self.enroques, al_paso, self.reloj_medio, self.hash))
+        if al_paso is not None:
+            self.hash ^= clave_al_paso(self.piezas_bb, al_paso, self.lado_turno)
+            self.al_paso = None
+        self.lado_turno ^= 1
+        self.hash ^= ZOBRIST_TURNO
+        self._nulos.append((len(self.historial_hashes), self.hash))
+
+    def deshacer_nulo(self):
+        self._nulos.pop()
+        _, _, _, _, al_paso, _, clave = self._deshacer.pop()
+        self.lado_turno ^= 1
+        self.al_paso = al_paso
+        self.hash = clave
+
+    def movimientos_legales(self) -> List[Movimiento]:
+        """Movimientos estrictamente legales del bando con el turno."""
+        return generar_legales(self)
+
+    def realizar_movimiento(self, origen: Tuple[int, int],
+                           destino: Tuple[int, int],
+                           promocion: TipoPieza = TipoPieza.REINA) -> bool:
         """Intenta mover una pieza de origen a destino; actualiza turno y estado."""
         try:
-            if origen not in self.casillas:
+            pieza = self.casillas.get(origen)
+            if pieza is None or pieza.color != self.turno or destino not in self.casillas:
                 return False
-                
-            pieza = self.casillas[origen]
-            if pieza is None or pieza.color != self.turno:
-                return False
-                
-            movimientos_validos = pieza.obtener_movimientos_validos(self)
-            if destino not in movimientos_validos:
-                return False
-            
-            pieza_destino = self.casillas.get(destino)
-            self.casillas[destino] = pieza
-            self.casillas[origen] = None
-            posicion_anterior = pieza.posicion
-            pieza.posicion = destino
-            pieza.movimientos += 1
-            
-            color_actual = pieza.color
-            if self.esta_en_jaque(color_actual):
-                self.casillas[origen] = pieza
-                self.casillas[destino] = pieza_destino
-                pieza.posicion = posicion_anterior
-                pieza.movimientos -= 1
+
+            mov = self._movimiento_desde(origen, destino, promocion)
+            if mov not in self.movimientos_legales():
                 return False
-            
+
+            self.hacer_movimiento(mov)
             self.historial_movimientos.append((origen, destino))
-            
-            color_oponente = Color.NEGRO if color_actual == Color.BLANCO else Color.BLANCO
-            self.turno = color_oponente
-            
-            if self.esta_en_jaque(color_oponente):
-                if self.esta_en_jaque_mate(color_oponente):
-                    self.estado = EstadoJuego.JAQUE_MATE
-                else:
-                    self.estado = EstadoJuego.JAQUE
-            else:
-                self.estado = EstadoJuego.JUGANDO
-            
+            self._actualizar_estado()
             return True
         except Exception as e:
             print(f"Error en realizar_movimiento: {e}")
             return False
-            
+
+    def deshacer_jugada(self) -> bool:
+        """Retrocede la última jugada de la partida (takeback)."""
+        if not self.historial_movimientos or not self._deshacer:
+            return False
+        self.deshacer_movimiento()
+        self.historial_movimientos.pop()
+        self._actualizar_estado()
+        return True
+
+    def _movimiento_desde(self, origen: Tuple[int, int], destino: Tuple[int, int],
+                          promocion: TipoPieza = TipoPieza.REINA) -> Movimiento:
+        """Codifica un movimiento (x, y) -> (x, y); promociona si un peón llega al final."""
+        sq_origen = origen[0] + 8 * origen[1]
+        sq_destino = destino[0] + 8 * destino[1]
+        pieza = self._tabla[sq_origen]
+        promo = 0
+        if pieza is not None and pieza.indice_tipo == PEON and destino[1] in (0, 7):
+            promo = INDICE_TIPO[promocion]
+        return crear_movimiento(sq_origen, sq_destino, promo)
+
+    def _actualizar_estado(self):
+        """Recalcula jaque, jaque mate o tablas (ahogado, repetición, 50 movimientos)."""
+        en_jaque = self.esta_en_jaque(self.turno)
+        if not self.movimientos_legales():
+            self.estado = EstadoJuego.JAQUE_MATE if en_jaque else EstadoJuego.EMPATE
+        elif self.es_triple_repeticion() or self.es_regla_cincuenta():
+            self.estado = EstadoJuego.EMPATE
+        elif en_jaque:
+            self.estado = EstadoJuego.JAQUE
+        else:
+            self.estado = EstadoJuego.JUGANDO
+
+    def casilla_atacada(self, pos: Tuple[int, int], por_color: Color) -> bool:
+        """Indica si alguna pieza de `por_color` ataca la casilla `pos`."""
+        return casilla_atacada(self.piezas_bb, pos[0] + 8 * pos[1],
+                               INDICE_COLOR[por_color], self.ocupadas)
+
     def esta_en_jaque(self, color: Color) -> bool:
         """Comprueba si el rey del color indicado está bajo ataque."""
-        posicion_rey = None
-        for pos, pieza in self.casillas.items():
-            if pieza and pieza.color == color and pieza.tipo == TipoPieza.REY:
-                posicion_rey = pos
-                break
-        if not posicion_rey:
+        lado = INDICE_COLOR[color]
+        rey = self.casilla_rey[lado]
+        if rey is None:
             return False
-        for pos, pieza in self.casillas.items():
-            if pieza and pieza.color != color:
-                movimientos = pieza.obtener_movimientos_validos(self)
-                if posicion_rey in movimientos:
-                    return True
-        return False
-        
+        return casilla_atacada(self.piezas_bb, rey, lado ^ 1, self.ocupadas)
+
     def esta_en_jaque_mate(self, color: Color) -> bool:
         """Determina si el color indicado está en jaque y no tiene movimientos que lo eviten."""
-        if not self.esta_en_jaque(color):
-            return False
-        for pos, pieza in self.casillas.items():
-            if pieza and pieza.color == color:
-                movimientos = pieza.obtener_movimientos_validos(self)
-                for mov in movimientos:
-                    pieza_destino = self.casillas.get(mov)
-                    self.casillas[mov] = pieza
-                    self.casillas[pos] = None
-                    posicion_anterior = pieza.posicion
-                    pieza.posicion = mov
-                    sigue_en_jaque = self.esta_en_jaque(color)
-                    self.casillas[pos] = pieza
-                    self.casillas[mov] = pieza_destino
-                    pieza.posicion = posicion_anterior
-                    if not sigue_en_jaque:
-                        return False
-        return True
-        
+        return self.esta_en_jaque(color) and not generar_legales(self, INDICE_COLOR[color])
+
+    def esta_ahogado(self, color: Color) -> bool:
+        """El color indicado no está en jaque pero no tiene movimientos legales."""
+        return not self.esta_en_jaque(color) and not generar_legales(self, INDICE_COLOR[color])
+
     def inicializar_tablero(self):
         """Coloca piezas y peones en el tablero en su posición inicial estándar."""
-        for i in range(8):
-            self.casillas[(i, 1)] = Pieza(Color.BLANCO, TipoPieza.PEON)
-            self.casillas[(i, 6)] = Pieza(Color.NEGRO, TipoPieza.PEON)
-            
         piezas_blancas = [
             (0, 0, Color.BLANCO, TipoPieza.TORRE),
             (1, 0, Color.BLANCO, TipoPieza.CABALLO),
@@ -122,15 +542,15 @@ class Tablero:
         ]
         peones_blancos = [(i, 1, Color.BLANCO, TipoPieza.PEON) for i in range(8)]
         piezas_blancas.extend(peones_blancos)
-        
+
         piezas_negras = [
             (i, 7, Color.NEGRO, tipo) for i, _, _, tipo in piezas_blancas[:8]
         ]
         peones_negros = [(i, 6, Color.NEGRO, TipoPieza.PEON) for i in range(8)]
         piezas_negras.extend(peones_negros)
-        
+
         for x, y, color, tipo in piezas_blancas + piezas_negras:
             pieza = Pieza(color, tipo)
-            pieza.posicion = (x, y)
-            pieza.imagen = self.gestor_recursos.obtener_imagen(color, tipo)
-            self.casillas[(x, y)] = pieza
+            if self.gestor_recursos is not None:
+                pieza.imagen = self.gestor_recursos.obtener_imagen(color, tipo)
+            self._colocar(x + 8 * y, pieza)
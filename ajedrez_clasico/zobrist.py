@@ -0,0 +1,64 @@
+"""Claves Zobrist de 64 bits para identificar posiciones en O(1).
+
+Las claves se generan con una semilla fija, así que el mismo tablero produce
+el mismo hash en cualquier proceso o equipo (LAN, trabajadores, cachés).
+El tablero mantiene su hash de forma incremental; `calcular_hash` lo
+reconstruye desde cero para inicializar o verificar.
+"""
+import random
+from typing import List
+from .bitboards import BB_CASILLAS, NEGRO, PEON
+from .ataques import ATAQUES_PEON
+
+_rng = random.Random(0x5A0B_2157)
+
+# ===== CLAVES =====
+ZOBRIST_PIEZAS: List[List[int]] = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+ZOBRIST_TURNO = _rng.getrandbits(64)
+
+
+def _claves_enroque() -> List[int]:
+    """Una clave por combinación de los 4 derechos (XOR de las claves de cada uno)."""
+    por_derecho = [_rng.getrandbits(64) for _ in range(4)]
+    claves = [0] * 16
+    for derechos in range(16):
+        for i in range(4):
+            if derechos & (1 << i):
+                claves[derechos] ^= por_derecho[i]
+    return claves
+
+
+ZOBRIST_ENROQUE: List[int] = _claves_enroque()
+ZOBRIST_AL_PASO: List[int] = [_rng.getrandbits(64) for _ in range(8)]
+
+
+def clave_al_paso(piezas_bb: List[int], al_paso, lado_turno: int) -> int:
+    """Clave de la columna al paso, solo si algún peón del bando al turno puede capturar.
+
+    Así dos posiciones que solo difieren en un al paso imposible comparten hash
+    (criterio de repetición de la FIDE).
+    """
+    if al_paso is None:
+        return 0
+    if ATAQUES_PEON[lado_turno ^ 1][al_paso] & piezas_bb[lado_turno * 6 + PEON]:
+        return ZOBRIST_AL_PASO[al_paso & 7]
+    return 0
+
+
+def clave_estado(tablero) -> int:
+    """Parte del hash que no depende de dónde están las piezas: turno, enroques y al paso."""
+    clave = ZOBRIST_ENROQUE[tablero.enroques]
+    if tablero.lado_turno == NEGRO:
+        clave ^= ZOBRIST_TURNO
+    return clave ^ clave_al_paso(tablero.piezas_bb, tablero.al_paso, tablero.lado_turno)
+
+
+def calcular_hash(tablero) -> int:
+    """Hash completo de la posición (piezas, turno, enroques y al paso)."""
+    clave = 0
+    for indice, bb in enumerate(tablero.piezas_bb):
+        claves = ZOBRIST_PIEZAS[indice]
+        for sq in range(64):
+            if bb & BB_CASILLAS[sq]:
+                clave ^= claves[sq]
+    return clave ^ clave_estado(tablero)
@@ -0,0 +1,251 @@
+"""Anotación de partidas PGN en lote con varios motores UCI.
+
+Responsabilidades:
+- Leer el PGN en streaming (python-chess), partida a partida
+- Repartir las partidas entre N motores UCI persistentes; cada partida la
+  analiza un solo motor sin `ucinewgame` entre jugadas, así la tabla hash de
+  una posición sirve para las siguientes
+- Anotar cada jugada con su evaluación (`[%eval]`), marcar imprecisiones,
+  errores y errores graves (?!, ?, ??) y añadir la mejor jugada como variante
+- Escribir cada partida anotada en cuanto termina e informar del progreso
+
+Uso:
+    python anotar_pgn.py partidas.pgn -o anotadas.pgn -j 4 --tiempo-ms 300
+    python anotar_pgn.py - --motor /ruta/a/stockfish --nodos 500000 < partidas.pgn
+
+Las posiciones de una partida se analizan de la última a la primera: la
+tabla hash llega a cada jugada con lo que ya se sabe de las posiciones que
+vienen después, que es lo que decide si la jugada fue un error.
+"""
+import argparse
+import functools
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, TextIO
+
+try:
+    import chess
+    import chess.engine
+    import chess.pgn
+except Exception:
+    chess = None
+
+from reglas import GrupoMotores
+from suite_epd import opciones_uci, repartir, ruta_motor
+
+# ===== CONFIGURACIÓN POR DEFECTO =====
+TIEMPO_MS_POR_DEFECTO = 200
+PLIES_VARIANTE = 6
+
+# ===== UMBRALES (centipeones que pierde quien mueve) =====
+IMPRECISION = 50
+ERROR = 100
+ERROR_GRAVE = 300
+# Las pérdidas se miden con la evaluación recortada: pasar de +15 a +9 no es un error
+LIMITE_CP = 1000
+MATE_CP = 100000
+
+# Marca PGN (NAG) por umbral, de mayor a menor
+_MARCAS = ((ERROR_GRAVE, 4), (ERROR, 2), (IMPRECISION, 6))
+
+
+class Evaluacion(NamedTuple):
+    """Resultado del motor en una posición, desde el punto de vista de las blancas."""
+    puntuacion: "chess.engine.Score"
+    pv: List["chess.Move"]
+
+
+class ResumenPartida(NamedTuple):
+    partida: "chess.pgn.Game"
+    jugadas: int
+    # Cuántas jugadas de cada marca: (??, ?, ?!)
+    marcas: tuple
+    nodos: int
+    segundos: float
+    completa: bool
+
+
+def leer_partidas(archivo: TextIO) -> Iterator["chess.pgn.Game"]:
+    """Partidas del PGN una a una, sin leer el archivo entero."""
+    while True:
+        partida = chess.pgn.read_game(archivo)
+        if partida is None:
+            return
+        yield partida
+
+
+def _evaluacion_final(board: "chess.Board") -> Evaluacion:
+    """Mate o ahogado: se evalúa sin preguntar al motor."""
+    if board.is_checkmate():
+        # Mate(0) es "mateado" para quien tiene el turno
+        return Evaluacion(chess.engine.PovScore(chess.engine.Mate(0), board.turn).white(), [])
+    return Evaluacion(chess.engine.Cp(0), [])
+
+
+def _centipeones(puntuacion: "chess.engine.Score", blancas: bool) -> int:
+    """Puntuación para quien mueve, recortada a ±LIMITE_CP."""
+    cp = puntuacion.score(mate_score=MATE_CP)
+    cp = cp if blancas else -cp
+    return max(-LIMITE_CP, min(LIMITE_CP, cp))
+
+
+def _texto_eval(puntuacion: "chess.engine.Score") -> str:
+    """Comentario `[%eval]`: peones con dos decimales o `#N` para mate ("" si ya es mate)."""
+    mate = puntuacion.mate()
+    if mate == 0:
+        return ""
+    if mate is not None:
+        return f"[%eval #{mate}]"
+    return f"[%eval {puntuacion.score() / 100:.2f}]"
+
+
+def _comentar(nodo, texto: str):
+    if not texto:
+        return
+    nodo.comment = f"{nodo.comment} {texto}".strip() if nodo.comment else texto
+
+
+def anotar_partida(grupo: GrupoMotores, partida: "chess.pgn.Game", tiempo_ms: Optional[int],
+                   nodos: Optional[int], plies_variante: int = PLIES_VARIANTE) -> ResumenPartida:
+    """Analiza la línea principal con un motor del grupo y anota `partida` en su sitio.
+
+    Si el motor falla a mitad de partida se devuelve sin tocar (`completa` False).
+    """
+    inicio = time.perf_counter()
+    nodos_pgn = list(partida.mainline())
+    board = partida.board()
+    fen = board.fen()
+    jugadas = [nodo.move.uci() for nodo in nodos_pgn]
+    # Posición tras cada prefijo de la partida (la 0 es la inicial)
+    tableros = [board.copy(stack=False)]
+    for nodo in nodos_pgn:
+        board.push(nodo.move)
+        tableros.append(board.copy(stack=False))
+
+    evaluaciones: List[Optional[Evaluacion]] = [None] * len(tableros)
+    nodos_total = 0
+    with grupo.usar() as motor:
+        motor.nueva_partida()
+        for i in range(len(tableros) - 1, -1, -1):
+            if tableros[i].is_checkmate() or tableros[i].is_stalemate():
+                evaluaciones[i] = _evaluacion_final(tableros[i])
+                continue
+            respuesta = motor.analizar(fen, tiempo_ms, nodos, jugadas=jugadas[:i])
+            if respuesta is None or "score" not in respuesta[1]:
+                return ResumenPartida(partida, len(jugadas), (0, 0, 0), nodos_total,
+                                      time.perf_counter() - inicio, False)
+            info = respuesta[1]
+            nodos_total += info.get("nodes", 0)
+            pv = info.get("pv") or [chess.Move.from_uci(respuesta[0])]
+            evaluaciones[i] = Evaluacion(info["score"].white(), pv)
+        identidad = motor.identidad
+
+    marcas = [0, 0, 0]
+    for i, nodo in enumerate(nodos_pgn):
+        antes, despues = evaluaciones[i], evaluaciones[i + 1]
+        blancas = tableros[i].turn == chess.WHITE
+        _comentar(nodo, _texto_eval(despues.puntuacion))
+        if not antes.pv or nodo.move == antes.pv[0]:
+            continue
+        perdida = _centipeones(antes.puntuacion, blancas) - _centipeones(despues.puntuacion, blancas)
+        for indice, (umbral, nag) in enumerate(_MARCAS):
+            if perdida >= umbral:
+                nodo.nags.add(nag)
+                marcas[indice] += 1
+                if nodo.parent.has_variation(antes.pv[0]):
+                    break
+                # La mejor jugada como variante, con la evaluación que le daba el motor
+                variante = nodo.parent.add_variation(antes.pv[0])
+                for mov in antes.pv[1:plies_variante]:
+                    variante = variante.add_variation(mov)
+                _comentar(variante, _texto_eval(antes.puntuacion))
+                break
+
+    limite = " ".join(f"{n} {v}" for n, v in (("movetime", tiempo_ms), ("nodes", nodos)) if v)
+    partida.headers["Annotator"] = f"{identidad} ({limite})"
+    return ResumenPartida(partida, len(jugadas), tuple(marcas), nodos_total,
+                          time.perf_counter() - inicio, True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pgn", help="archivo PGN ('-' para la entrada estándar)")
+    parser.add_argument("-o", "--salida", default="-", help="PGN anotado ('-' para la salida estándar)")
+    parser.add_argument("--motor", default="stockfish",
+                        help="'stockfish', 'lc0' o la ruta de un binario UCI")
+    parser.add_argument("-j", "--motores", type=int, default=1,
+                        help="procesos de motor en paralelo (una partida por motor)")
+    parser.add_argument("--tiempo-ms", type=int, default=None,
+                        help=f"tiempo por posición (por defecto {TIEMPO_MS_POR_DEFECTO} si no hay --nodos)")
+    parser.add_argument("--nodos", type=int, default=None, help="nodos por posición")
+    parser.add_argument("--plies-variante", type=int, default=PLIES_VARIANTE,
+                        help="longitud de la variante con la mejor jugada")
+    parser.add_argument("--opcion", action="append", default=[], metavar="NOMBRE=VALOR",
+                        help="opción UCI para cada motor (p. ej. Hash=64); se puede repetir")
+    args = parser.parse_args(argv)
+
+    if chess is None:
+        print("Anotar partidas requiere python-chess", file=sys.stderr)
+        return 1
+    tiempo_ms = args.tiempo_ms
+    if tiempo_ms is None and args.nodos is None:
+        tiempo_ms = TIEMPO_MS_POR_DEFECTO
+    ruta = ruta_motor(args.motor)
+    if ruta is None:
+        print(f"No se encontró el motor UCI {args.motor!r}", file=sys.stderr)
+        return 1
+    cantidad = max(1, args.motores)
+    grupo = GrupoMotores(ruta, cantidad, opciones_uci(args.opcion))
+    if not grupo.arrancar():
+        print(f"El motor UCI {ruta} no responde", file=sys.stderr)
+        grupo.cerrar()
+        return 1
+
+    entrada = salida = None
+    try:
+        entrada = sys.stdin if args.pgn == "-" else open(args.pgn, encoding="utf-8-sig")
+        salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    except OSError as e:
+        if entrada not in (None, sys.stdin):
+            entrada.close()
+        grupo.cerrar()
+        parser.error(f"no se puede abrir {e.filename}: {e.strerror}")
+    resolver = functools.partial(anotar_partida, grupo, tiempo_ms=tiempo_ms, nodos=args.nodos,
+                                 plies_variante=args.plies_variante)
+    inicio = time.perf_counter()
+    partidas = jugadas = nodos = fallidas = 0
+    marcas = [0, 0, 0]
+    try:
+        with ThreadPoolExecutor(cantidad) as ejecutor:
+            for r in repartir(leer_partidas(entrada), resolver, ejecutor, cantidad):
+                r.partida.accept(chess.pgn.FileExporter(salida))
+                salida.flush()
+                partidas += 1
+                jugadas += r.jugadas
+                nodos += r.nodos
+                fallidas += not r.completa
+                marcas = [a + b for a, b in zip(marcas, r.marcas)]
+                pared = time.perf_counter() - inicio
+                cabecera = r.partida.headers
+                estado = "" if r.completa else " (sin anotar: fallo del motor)"
+                print(f"[{partidas}] {cabecera.get('White', '?')} - {cabecera.get('Black', '?')}: "
+                      f"{r.jugadas} jugadas, {r.marcas[0]} ??, {r.marcas[1]} ?, {r.marcas[2]} ?! "
+                      f"en {r.segundos:.1f} s{estado} | {partidas / pared:.2f} partidas/s, "
+                      f"{jugadas / pared:.1f} jugadas/s", file=sys.stderr)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+        grupo.cerrar()
+
+    pared = time.perf_counter() - inicio
+    print(f"{partidas} partidas ({fallidas} sin anotar), {jugadas} jugadas en {pared:.1f} s: "
+          f"{marcas[0]} ??, {marcas[1]} ?, {marcas[2]} ?!; "
+          f"{nodos / max(pared, 1e-9):,.0f} nps con {cantidad} motores", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Microbenchmarks del núcleo de ajedrez (ejecutar con `python -m benchmarks.<nombre>`)."""
@@ -0,0 +1,73 @@
+"""Microbenchmark: ataques deslizantes por tablas vs. recorrido de rayos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.deslizantes [--muestras 20000] [--repeticiones 5]
+
+Genera ocupaciones aleatorias con densidad de medio juego, comprueba que
+ambas implementaciones coinciden y reporta nanosegundos por consulta.
+"""
+import argparse
+import random
+import time
+from ajedrez_clasico.ataques import (
+    DIRECCIONES_TORRE, DIRECCIONES_ALFIL, ataques_rayos,
+    TABLA_TORRE, TABLA_ALFIL, MASCARA_TORRE, MASCARA_ALFIL,
+)
+
+
+def _muestras(n: int, semilla: int):
+    """Pares (casilla, ocupación) con ~24 piezas en el tablero."""
+    rng = random.Random(semilla)
+    muestras = []
+    for _ in range(n):
+        ocupadas = 0
+        for sq in rng.sample(range(64), 24):
+            ocupadas |= 1 << sq
+        muestras.append((rng.randrange(64), ocupadas))
+    return muestras
+
+
+def _rayos(muestras):
+    for sq, ocupadas in muestras:
+        ataques_rayos(sq, ocupadas, DIRECCIONES_TORRE)
+        ataques_rayos(sq, ocupadas, DIRECCIONES_ALFIL)
+
+
+def _tablas(muestras):
+    for sq, ocupadas in muestras:
+        TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]]
+        TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]]
+
+
+def _medir(funcion, muestras, repeticiones: int) -> float:
+    """Mejor tiempo por consulta (torre + alfil) en nanosegundos."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(muestras)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(muestras) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--muestras", type=int, default=20000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=2024)
+    args = parser.parse_args()
+
+    muestras = _muestras(args.muestras, args.semilla)
+    for sq, ocupadas in muestras:
+        assert TABLA_TORRE[sq][ocupadas & MASCARA_TORRE[sq]] == ataques_rayos(sq, ocupadas, DIRECCIONES_TORRE)
+        assert TABLA_ALFIL[sq][ocupadas & MASCARA_ALFIL[sq]] == ataques_rayos(sq, ocupadas, DIRECCIONES_ALFIL)
+
+    ns_rayos = _medir(_rayos, muestras, args.repeticiones)
+    ns_tablas = _medir(_tablas, muestras, args.repeticiones)
+    print(f"Muestras: {len(muestras)} (torre + alfil por muestra)")
+    print(f"Recorrido de rayos: {ns_rayos:8.0f} ns/consulta")
+    print(f"Tablas PEXT:        {ns_tablas:8.0f} ns/consulta")
+    print(f"Aceleración:        {ns_rayos / ns_tablas:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
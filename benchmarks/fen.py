@@ -0,0 +1,109 @@
+"""Microbenchmark: rendimiento del códec FEN/EPD frente a reproducir las jugadas.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.fen [--posiciones 2000] [--lineas 100000] [--repeticiones 3]
+
+Genera partidas aleatorias, guarda una FEN por posición y comprueba que
+decodificar y volver a codificar devuelve el mismo texto. Después mide
+líneas por segundo para analizar, cargar en un `Tablero` reutilizado y
+codificar, y lo compara con llegar a las mismas posiciones reproduciendo
+las jugadas desde el inicio (y con python-chess si está instalado).
+"""
+import argparse
+import itertools
+import random
+import time
+
+try:
+    import chess
+except Exception:
+    chess = None
+
+from ajedrez_clasico.tablero import Tablero
+from ajedrez_clasico.fen import FEN_INICIAL, analizar_lote, codificar_lote, decodificar_lote
+
+
+def _partidas(posiciones: int, semilla: int):
+    """(FEN, jugadas desde el inicio) de posiciones tomadas de partidas aleatorias."""
+    rng = random.Random(semilla)
+    muestras = []
+    while len(muestras) < posiciones:
+        tablero = Tablero()
+        jugadas = []
+        for _ in range(rng.randint(10, 120)):
+            movimientos = tablero.movimientos_legales()
+            if not movimientos or tablero.es_regla_cincuenta():
+                break
+            mov = rng.choice(movimientos)
+            tablero.hacer_movimiento(mov)
+            jugadas.append(mov)
+            if rng.random() < 0.1:
+                muestras.append((tablero.a_fen(), list(jugadas)))
+    return muestras[:posiciones]
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    """Mejor tiempo en segundos de `repeticiones` ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def _consumir(iterador):
+    for _ in iterador:
+        pass
+
+
+def _reproducir(muestras):
+    """Llega a cada posición jugando desde el inicio con comprobación de legalidad."""
+    tablero = Tablero()
+    for _, jugadas in muestras:
+        tablero.cargar_fen(FEN_INICIAL)
+        for mov in jugadas:
+            if mov not in tablero.movimientos_legales():
+                raise AssertionError("jugada ilegal al reproducir")
+            tablero.hacer_movimiento(mov)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posiciones", type=int, default=2000, help="posiciones distintas")
+    parser.add_argument("--lineas", type=int, default=100000, help="líneas del lote medido")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=2024)
+    args = parser.parse_args()
+
+    muestras = _partidas(args.posiciones, args.semilla)
+    fens = [fen for fen, _ in muestras]
+    for tablero, (fen, _) in zip((t for t, _ in decodificar_lote(fens)), muestras):
+        assert tablero.a_fen() == fen, fen
+    lineas = list(itertools.islice(itertools.cycle(fens), args.lineas))
+
+    tablero = Tablero()
+    resultados = [
+        ("Analizar (sin tablero)", _medir(lambda: _consumir(analizar_lote(lineas)), args.repeticiones)),
+        ("Cargar en Tablero", _medir(lambda: _consumir(decodificar_lote(lineas, tablero)), args.repeticiones)),
+        ("Cargar y codificar", _medir(
+            lambda: _consumir(codificar_lote(t for t, _ in decodificar_lote(lineas, tablero))),
+            args.repeticiones)),
+    ]
+    if chess is not None:
+        resultados.append(("python-chess Board(fen)", _medir(
+            lambda: _consumir(chess.Board(fen) for fen in lineas), args.repeticiones)))
+
+    plies = sum(len(jugadas) for _, jugadas in muestras) / len(muestras)
+    segundos_reproducir = _medir(lambda: _reproducir(muestras), 1)
+    print(f"Líneas: {len(lineas)} ({len(fens)} posiciones distintas, {plies:.0f} plies de media)")
+    for nombre, segundos in resultados:
+        print(f"{nombre:<26} {len(lineas) / segundos:>10,.0f} líneas/s")
+    por_segundo = len(muestras) / segundos_reproducir
+    print(f"{'Reproducir las jugadas':<26} {por_segundo:>10,.0f} posiciones/s")
+    cargar = len(lineas) / resultados[1][1]
+    print(f"Cargar por FEN es {cargar / por_segundo:.1f}x más rápido que reproducir la partida")
+
+
+if __name__ == "__main__":
+    main()
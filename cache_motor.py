@@ -0,0 +1,177 @@
+"""Caché de jugadas del motor en dos niveles (memoria y SQLite).
+
+Responsabilidades:
+- Normalizar la posición (FEN sin contadores de medio movimiento ni jugada)
+- Primer nivel: LRU en memoria para repetir respuestas sin tocar disco
+- Segundo nivel: tabla SQLite que sobrevive entre partidas y ejecuciones,
+  con un máximo de filas; al superarlo se borran las menos usadas
+- Clave: posición, identidad del motor (nombre y opciones) y límite de búsqueda
+
+La clave no guarda historial: ni repeticiones ni el contador de la regla de
+50 jugadas. En esas posiciones la mejor jugada puede depender de lo ya jugado
+(evitar o buscar las tablas), así que `admite` las deja fuera de la caché.
+
+Si la base de datos no se puede abrir (carpeta de solo lectura, disco lleno)
+la caché sigue funcionando solo en memoria.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import os
+import sqlite3
+import threading
+import time
+
+# ===== CONFIGURACIÓN POR DEFECTO =====
+RUTA_POR_DEFECTO = os.path.join(os.path.expanduser("~"), ".ajedrez", "cache_motor.sqlite3")
+CAPACIDAD_MEMORIA = 4096
+CAPACIDAD_DISCO = 100000
+# A partir de aquí la regla de 50 jugadas empieza a pesar en la búsqueda
+RELOJ_MEDIO_MAXIMO = 80
+
+# (jugada, réplica esperada) en LAN, p. ej. ("e2e4", "e7e5")
+Respuesta = Tuple[str, Optional[str]]
+
+
+def normalizar_fen(fen: str) -> str:
+    """Colocación, turno, enroques y al paso: lo que decide la mejor jugada."""
+    return " ".join(fen.split()[:4])
+
+
+def admite(fen: str, repetida: bool = False) -> bool:
+    """Si la respuesta para `fen` se puede guardar y reutilizar con la clave normalizada.
+
+    No se admiten posiciones repetidas en la partida ni con el reloj de medio
+    movimiento en `RELOJ_MEDIO_MAXIMO` o más (quinto campo de la FEN).
+    """
+    campos = fen.split()
+    reloj_medio = int(campos[4]) if len(campos) > 4 and campos[4].isdigit() else 0
+    return not repetida and reloj_medio < RELOJ_MEDIO_MAXIMO
+
+
+class CacheJugadas:
+    """Respuestas del motor por (posición, motor, límite).
+
+    Es segura entre hilos: la usan tanto el bucle de pygame como el hilo de
+    fondo que calcula las jugadas.
+    """
+
+    def __init__(self, ruta: Optional[str] = RUTA_POR_DEFECTO,
+                 capacidad_memoria: int = CAPACIDAD_MEMORIA,
+                 capacidad_disco: int = CAPACIDAD_DISCO):
+        self.ruta = ruta
+        self.capacidad_memoria = capacidad_memoria
+        self.capacidad_disco = capacidad_disco
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self._memoria: "OrderedDict[Tuple[str, str, str], Respuesta]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._filas = 0
+        # La base se abre al primer uso para no crear archivos al importar
+        self._abierta = ruta is None
+
+    def _abrir(self):
+        self._abierta = True
+        try:
+            carpeta = os.path.dirname(self.ruta)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS jugadas ("
+                " fen TEXT NOT NULL, motor TEXT NOT NULL, limite TEXT NOT NULL,"
+                " jugada TEXT NOT NULL, ponder TEXT, usado REAL NOT NULL,"
+                " PRIMARY KEY (fen, motor, limite))")
+            conexion.execute("CREATE INDEX IF NOT EXISTS jugadas_usado ON jugadas (usado)")
+            conexion.commit()
+            self._filas = conexion.execute("SELECT COUNT(*) FROM jugadas").fetchone()[0]
+            self._conexion = conexion
+        except (OSError, sqlite3.Error) as e:
+            print(f"Caché de jugadas solo en memoria ({e})")
+            self._conexion = None
+
+    def _recordar(self, clave: Tuple[str, str, str], respuesta: Respuesta):
+        self._memoria[clave] = respuesta
+        self._memoria.move_to_end(clave)
+        if len(self._memoria) > self.capacidad_memoria:
+            self._memoria.popitem(last=False)
+
+    def obtener(self, fen: str, motor: str, limite: str) -> Optional[Respuesta]:
+        """Respuesta guardada para la posición, o None."""
+        clave = (normalizar_fen(fen), motor, limite)
+        with self._lock:
+            respuesta = self._memoria.get(clave)
+            if respuesta is not None:
+                self._memoria.move_to_end(clave)
+                self.aciertos_memoria += 1
+                return respuesta
+            if not self._abierta:
+                self._abrir()
+            if self._conexion is not None:
+                try:
+                    fila = self._conexion.execute(
+                        "SELECT jugada, ponder FROM jugadas WHERE fen = ? AND motor = ? AND limite = ?",
+                        clave).fetchone()
+                    if fila is not None:
+                        self._conexion.execute(
+                            "UPDATE jugadas SET usado = ? WHERE fen = ? AND motor = ? AND limite = ?",
+                            (time.time(),) + clave)
+                        self._conexion.commit()
+                        respuesta = (fila[0], fila[1])
+                        self._recordar(clave, respuesta)
+                        self.aciertos_disco += 1
+                        return respuesta
+                except sqlite3.Error:
+                    pass
+            self.fallos += 1
+            return None
+
+    def guardar(self, fen: str, motor: str, limite: str, jugada: str,
+                ponder: Optional[str] = None):
+        """Guarda la respuesta en ambos niveles."""
+        clave = (normalizar_fen(fen), motor, limite)
+        with self._lock:
+            self._recordar(clave, (jugada, ponder))
+            if not self._abierta:
+                self._abrir()
+            if self._conexion is None:
+                return
+            try:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO jugadas (fen, motor, limite, jugada, ponder, usado)"
+                    " VALUES (?, ?, ?, ?, ?, ?)", clave + (jugada, ponder, time.time()))
+                self._filas += 1
+                if self._filas > self.capacidad_disco:
+                    self._expulsar()
+                self._conexion.commit()
+            except sqlite3.Error:
+                pass
+
+    def _expulsar(self):
+        """Borra las filas menos usadas y deja un 10 % de holgura bajo el máximo."""
+        self._filas = self._conexion.execute("SELECT COUNT(*) FROM jugadas").fetchone()[0]
+        sobran = self._filas - self.capacidad_disco * 9 // 10
+        if self._filas <= self.capacidad_disco or sobran <= 0:
+            return
+        self._conexion.execute(
+            "DELETE FROM jugadas WHERE rowid IN"
+            " (SELECT rowid FROM jugadas ORDER BY usado LIMIT ?)", (sobran,))
+        self._filas -= sobran
+
+    def limpiar(self):
+        """Vacía los dos niveles."""
+        with self._lock:
+            self._memoria.clear()
+            if not self._abierta:
+                self._abrir()
+            if self._conexion is not None:
+                self._conexion.execute("DELETE FROM jugadas")
+                self._conexion.commit()
+                self._filas = 0
+
+    def cerrar(self):
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
@@ -11,10 +11,15 @@ import socket
 import threading
 from ui import Menu, InterfazUsuario
 from lan import ServidorAjedrez, ClienteAjedrez, DescubridorServidores, PUERTO_JUEGO
-from modelos import Color
-from reglas import sugerir_movimiento
+from modelos import Color, EstadoJuego
+from reglas import POOL_MOTORES, CACHE_JUGADAS, TrabajadorMotor
+from ajedrez_clasico import motor as motor_nativo
 from ajedrez_sombras import TableroSombras, IASombras
 
+# Procesos del motor nativo en la partida: uno. Lazy SMP es para las herramientas
+# de análisis en equipos con núcleos libres (`suite_epd.py --procesos`)
+PROCESOS_MOTOR_NATIVO = 1
+
 def main():
     try:
         # Menú principal: seleccionar modo
@@ -64,7 +69,12 @@ def main():
     except Exception as e:
         print(f"Error inesperado: {e}")
     finally:
-        # Salida limpia de Pygame
+        # Cerrar los motores UCI que sigan vivos, los auxiliares del motor nativo
+        # (el hilo del motor ya terminó en `TrabajadorMotor.cerrar`), la caché de
+        # jugadas y salir limpio de Pygame
+        POOL_MOTORES.cerrar_todos()
+        motor_nativo.cerrar_paralela()
+        CACHE_JUGADAS.cerrar()
         pygame.quit()
 
 
@@ -124,66 +134,91 @@ def _lan_a_coords(lan: str):
 
 
 def juego_vs_maquina():
-    """Ejecuta una partida contra Stockfish local (jugador blancas, IA negras)."""
+    """Ejecuta una partida contra el motor local (jugador blancas, IA negras).
+
+    Usa Stockfish si hay binario; si no, el motor nativo de ajedrez_clasico.
+    El motor piensa en segundo plano: la ventana sigue respondiendo, el reloj
+    corre y Escape o cerrar la ventana abandonan la partida deteniendo su
+    búsqueda.
+    Durante el turno del jugador el motor pondera la réplica que espera.
+    """
     interfaz = InterfazUsuario()
     seleccionado = None
     clock = pygame.time.Clock()
+    # Los motores del pool siguen vivos entre partidas: avisar de que empieza otra
+    POOL_MOTORES.nueva_partida()
+    # El motor se detecta automáticamente (PATH o carpeta stockfish/); sin binario, motor nativo
+    trabajador = TrabajadorMotor(motor="stockfish", nivel="medio", ponder=True,
+                                 procesos=PROCESOS_MOTOR_NATIVO)
+    jugada_ia = None
     
-    while True:
-        dt = clock.tick(60) / 1000.0
-        interfaz.actualizar_tiempos(dt)
-        
-        # Si es turno de la IA (negras), pedir jugada al motor local
-        if interfaz.tablero.turno == Color.NEGRO:
-            # Mostrar estado mientras el motor calcula (bloqueante por diseño)
-            interfaz.mensaje_estado = "Pensando..."
-            interfaz.dibujar_tablero(seleccionado)
-            pygame.display.flip()
+    try:
+        while True:
+            dt = clock.tick(60) / 1000.0
+            interfaz.actualizar_tiempos(dt)
+            en_juego = interfaz.tablero.estado in (EstadoJuego.JUGANDO, EstadoJuego.JAQUE)
             
-            # El motor se detecta automáticamente (PATH o carpeta stockfish/)
-            lan = sugerir_movimiento(interfaz.tablero.casillas, interfaz.tablero.turno, motor="stockfish", nivel="medio")
-            coords = _lan_a_coords(lan) if lan else None
-            if coords:
-                origen, destino = coords
-                if interfaz.tablero.realizar_movimiento(origen, destino):
-                    interfaz.reproducir_sonido_movimiento()
+            # Si es turno de la IA (negras), lanzar la petición sin bloquear el bucle
+            if interfaz.tablero.turno == Color.NEGRO and en_juego and jugada_ia is None:
+                interfaz.mensaje_estado = "Pensando... (Esc para abandonar)"
+                jugada_ia = trabajador.pedir(interfaz.tablero.casillas, interfaz.tablero.turno)
+            elif jugada_ia is not None and not en_juego:
+                # Se agotó el reloj mientras pensaba: la respuesta ya no sirve
+                trabajador.cancelar()
+                jugada_ia = None
+                interfaz.mensaje_estado = None
+            
+            if jugada_ia is not None and jugada_ia.done():
+                lan = jugada_ia.result()
+                jugada_ia = None
+                interfaz.mensaje_estado = None
+                coords = _lan_a_coords(lan) if lan else None
+                if coords:
+                    origen, destino = coords
+                    if interfaz.tablero.realizar_movimiento(origen, destino):
+                        interfaz.reproducir_sonido_movimiento()
+                        # Aprovechar el turno del jugador pensando sobre su réplica probable
+                        trabajador.ponderar(interfaz.tablero.casillas, interfaz.tablero.turno)
+                    else:
+                        # Evitar bucle infinito si el movimiento del motor no encaja en el tablero interno
+                        print("Movimiento del motor inválido para el tablero actual")
+                        break
                 else:
-                    # Evitar bucle infinito si el movimiento del motor no encaja en el tablero interno
-                    print("Movimiento de Stockfish inválido para el tablero actual")
+                    print("No se pudo obtener jugada del motor")
                     break
-            else:
-                print("No se pudo obtener jugada de Stockfish")
+            
+            # Manejo de eventos: clics y cierre de ventana
+            continuar, click = interfaz.manejar_eventos()
+            if not continuar:
+                break
+            if trabajador.pensando() and pygame.key.get_pressed()[pygame.K_ESCAPE]:
+                print("Partida abandonada mientras el motor pensaba")
                 break
             
-            interfaz.mensaje_estado = None
-        
-        # Manejo de eventos: clics y cierre de ventana
-        continuar, click = interfaz.manejar_eventos()
-        if not continuar:
-            break
-        
-        # Turno del jugador (blancas)
-        if click and interfaz.tablero.turno == Color.BLANCO:
-            if seleccionado is None:
-                if (click in interfaz.tablero.casillas and 
-                    interfaz.tablero.casillas[click] and 
-                    interfaz.tablero.casillas[click].color == interfaz.tablero.turno):
-                    seleccionado = click
-            else:
-                if interfaz.tablero.realizar_movimiento(seleccionado, click):
-                    interfaz.reproducir_sonido_movimiento()
-                    seleccionado = None
-                else:
+            # Turno del jugador (blancas)
+            if click and interfaz.tablero.turno == Color.BLANCO:
+                if seleccionado is None:
                     if (click in interfaz.tablero.casillas and 
                         interfaz.tablero.casillas[click] and 
                         interfaz.tablero.casillas[click].color == interfaz.tablero.turno):
                         seleccionado = click
-                    else:
+                else:
+                    if interfaz.tablero.realizar_movimiento(seleccionado, click):
+                        interfaz.reproducir_sonido_movimiento()
                         seleccionado = None
-        
-        # Redibujar tablero y actualizar pantalla
-        interfaz.dibujar_tablero(seleccionado)
-        pygame.display.flip()
+                    else:
+                        if (click in interfaz.tablero.casillas and 
+                            interfaz.tablero.casillas[click] and 
+                            interfaz.tablero.casillas[click].color == interfaz.tablero.turno):
+                            seleccionado = click
+                        else:
+                            seleccionado = None
+            
+            # Redibujar tablero y actualizar pantalla
+            interfaz.dibujar_tablero(seleccionado)
+            pygame.display.flip()
+    finally:
+        trabajador.cerrar()
 
 
 def juego_lan_servidor():
@@ -2,10 +2,17 @@
 
 - Color, TipoPieza, EstadoJuego: enumeraciones del juego
 - GestorRecursos: carga y entrega imágenes de piezas con tolerancia a faltantes
+
+pygame solo hace falta para GestorRecursos: las enumeraciones (y con ellas el
+núcleo de ajedrez_clasico) se pueden usar sin él, p. ej. en análisis por lotes.
 """
 from enum import Enum
 import os
-import pygame
+
+try:
+    import pygame
+except Exception:
+    pygame = None
 
 class Color(Enum):
     BLANCO = "blanco"
@@ -29,6 +36,8 @@ class EstadoJuego(Enum):
 class GestorRecursos:
     def __init__(self):
         """Inicializa el gestor y carga recursos (imágenes y sonidos) desde el directorio del proyecto."""
+        if pygame is None:
+            raise ImportError("GestorRecursos necesita pygame (pip install pygame-ce)")
         self.imagenes = {}
         self.sonidos = {}
         self.directorio_actual = os.path.dirname(os.path.abspath(__file__))
@@ -99,7 +108,7 @@ class GestorRecursos:
                 print(f"Advertencia: No se pudo cargar sonido {archivo} en {ruta}.")
                 self.sonidos[nombre] = None
                 
-    def obtener_imagen(self, color: Color, tipo: TipoPieza) -> pygame.Surface:
+    def obtener_imagen(self, color: Color, tipo: TipoPieza) -> "pygame.Surface":
         """Devuelve la imagen correspondiente a color/tipo; retorna un placeholder si no existe."""
         nombre_imagen = f"{tipo.value.upper()}_{'BLANCO' if color == Color.BLANCO else 'NEGRO'}"
         if nombre_imagen not in self.imagenes:
@@ -4,58 +4,97 @@ Responsabilidades:
 - Conversión entre el modelo Tablero y FEN (python-chess)
 - Aplicación de movimientos en formato LAN (e2e4)
 - Wrapper de motores UCI (Stockfish, LCZero) para obtener mejores jugadas
+- Pool de motores UCI persistentes reutilizados entre jugadas y partidas
+- Grupos de motores UCI iguales para repartir trabajos en lote
+- Recurrir al motor nativo de ajedrez_clasico cuando no hay binario UCI
+- Calcular jugadas en un hilo de fondo para no congelar el bucle de pygame
+- Reutilizar respuestas ya calculadas (caché en memoria y SQLite)
 """
-from typing import Optional, Tuple, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, Dict, List
 import os
+import queue
 import sys
 import subprocess
+import threading
+import time
 
 try:
     import chess
     import chess.engine
+    import chess.polyglot
 except Exception:
     chess = None
     chess_engine = None
 
 from modelos import Color, TipoPieza
-from ajedrez_clasico import Pieza
+from ajedrez_clasico import Pieza, Tablero
+from ajedrez_clasico import motor as motor_nativo
+from ajedrez_clasico.movimiento import movimiento_a_uci, uci_a_movimiento
+from cache_motor import CacheJugadas, admite
+
+# Identidad del motor nativo en la caché de jugadas (cambia con su código)
+MOTOR_NATIVO = f"ajedrez_clasico@{motor_nativo.huella()}"
+
+# Letra FEN de cada tipo de pieza (minúscula; mayúscula para las blancas)
+_LETRAS_FEN = {
+    TipoPieza.PEON: "p",
+    TipoPieza.TORRE: "r",
+    TipoPieza.CABALLO: "n",
+    TipoPieza.ALFIL: "b",
+    TipoPieza.REINA: "q",
+    TipoPieza.REY: "k",
+}
+# Enroque -> (casilla del rey, casilla de la torre, color), en el orden de FEN
+_ENROQUES_FEN = (
+    ("K", (4, 0), (7, 0), Color.BLANCO),
+    ("Q", (4, 0), (0, 0), Color.BLANCO),
+    ("k", (4, 7), (7, 7), Color.NEGRO),
+    ("q", (4, 7), (0, 7), Color.NEGRO),
+)
+
+
+def _sin_mover(casillas, pos: Tuple[int, int], tipo: TipoPieza, color: Color) -> bool:
+    p = casillas.get(pos)
+    return bool(p) and p.tipo == tipo and p.color == color and not getattr(p, "movimientos", 0)
+
 
 def tablero_a_fen(casillas: Dict[Tuple[int, int], Optional[Pieza]], turno: Color) -> str:
     """Convierte el diccionario de casillas a FEN estándar.
-    Nota: Asume (0,0) en la esquina superior-izquierda y filas 0..7 de arriba a abajo.
+
+    Si `casillas` es la vista de un `Tablero` se devuelve su FEN completa
+    (enroques, al paso y contadores). Con un dict suelto, los enroques se
+    deducen de reyes y torres que no se han movido; sin historial no hay al
+    paso ni contadores. Las casillas usan y = fila - 1 (y=0 es la fila 1).
     """
+    tablero = getattr(casillas, "tablero", None)
+    if isinstance(tablero, Tablero) and tablero.turno == turno:
+        return tablero.a_fen()
     filas = []
-    for y in range(7, -1, -1):  # de fila 7 (abajo) a 0 (arriba) para FEN 8..1
+    for y in range(7, -1, -1):  # de la fila 8 a la 1
         vacias = 0
         fila_fen = ""
         for x in range(8):
             p = casillas.get((x, y))
             if not p:
                 vacias += 1
-            else:
-                if vacias > 0:
-                    fila_fen += str(vacias)
-                    vacias = 0
-                tipo = p.tipo
-                mapa = {
-                    TipoPieza.PEON: "p",
-                    TipoPieza.TORRE: "r",
-                    TipoPieza.CABALLO: "n",
-                    TipoPieza.ALFIL: "b",
-                    TipoPieza.REINA: "q",
-                    TipoPieza.REY: "k",
-                }
-                letra = mapa.get(tipo, "p")
-                if p.color == Color.BLANCO:
-                    letra = letra.upper()
-                fila_fen += letra
+                continue
+            if vacias > 0:
+                fila_fen += str(vacias)
+                vacias = 0
+            letra = _LETRAS_FEN.get(p.tipo, "p")
+            fila_fen += letra.upper() if p.color == Color.BLANCO else letra
         if vacias > 0:
             fila_fen += str(vacias)
         filas.append(fila_fen)
     fen_pos = "/".join(filas)
     turno_char = "w" if turno == Color.BLANCO else "b"
-    # Sin enroques, sin peón al paso, contadores en 0
-    return f"{fen_pos} {turno_char} - - 0 1"
+    enroques = "".join(
+        letra for letra, rey, torre, color in _ENROQUES_FEN
+        if _sin_mover(casillas, rey, TipoPieza.REY, color)
+        and _sin_mover(casillas, torre, TipoPieza.TORRE, color)) or "-"
+    return f"{fen_pos} {turno_char} {enroques} - 0 1"
 
 def aplicar_movimiento_lan(casillas: Dict[Tuple[int, int], Optional[Pieza]], lan: str) -> bool:
     """Aplica un movimiento tipo 'e2e4' en el diccionario de casillas."""
@@ -80,73 +119,404 @@ def aplicar_movimiento_lan(casillas: Dict[Tuple[int, int], Optional[Pieza]], lan
     return True
 
 class MotorUCI:
-    """Wrapper simple para motores UCI usando python-chess."""
-    def __init__(self, ruta_motor: str, tiempo_ms: int = 1000):
+    """Wrapper de un motor UCI usando python-chess.
+
+    El proceso se arranca al primer uso (`disponible` o `mejor_jugada`) y se
+    reutiliza entre jugadas; `nueva_partida` hace que la siguiente petición
+    envíe `ucinewgame`. Con `ponder` el motor sigue pensando tras responder
+    sobre la réplica que espera; si llega esa posición, python-chess envía
+    `ponderhit` en lugar de empezar de cero.
+    """
+    def __init__(self, ruta_motor: str, tiempo_ms: int = 1000,
+                 opciones: Optional[Dict[str, object]] = None):
         self.ruta_motor = ruta_motor
         self.tiempo_ms = tiempo_ms
+        self.opciones = dict(opciones or {})
         self.proc = None
         self.engine = None
-        if chess is not None:
-            try:
-                self.engine = chess.engine.SimpleEngine.popen_uci(ruta_motor)
-            except Exception:
-                self.engine = None
-    
+        self.fallo = False
+        self.ultimo_uso = 0.0
+        self.lock = threading.Lock()
+        self._partida = object()
+        # Posición (con historial) sobre la que el motor está ponderando
+        self._ponder: Optional["chess.Board"] = None
+        # Si la última jugada salió de un `ponderhit` (pensó más que su límite)
+        self.tras_ponderhit = False
+
+    def _iniciar(self):
+        if self.engine is not None or chess is None:
+            return
+        try:
+            self.engine = chess.engine.SimpleEngine.popen_uci(self.ruta_motor)
+            if self.opciones:
+                self.engine.configure(self.opciones)
+            self.fallo = False
+        except Exception:
+            self.cerrar()
+
     def disponible(self) -> bool:
+        self._iniciar()
         return self.engine is not None
-    
-    def mejor_jugada(self, fen: str) -> Optional[str]:
+
+    @property
+    def identidad(self) -> str:
+        """Nombre que anuncia el motor más sus opciones (para la caché de jugadas)."""
+        nombre = self.engine.id.get("name") if self.engine is not None else None
+        nombre = nombre or os.path.basename(self.ruta_motor)
+        return nombre + "".join(f";{k}={v}" for k, v in sorted(self.opciones.items()))
+
+    def saludable(self) -> bool:
+        """Comprueba con `isready` que el proceso sigue respondiendo."""
+        if self.engine is None:
+            return False
+        try:
+            self.engine.ping()
+            return True
+        except Exception:
+            return False
+
+    @property
+    def ponderando(self) -> bool:
+        return self._ponder is not None
+
+    def nueva_partida(self):
+        self._partida = object()
+        self._ponder = None
+
+    def detener_ponder(self):
+        """Corta el `go ponder` en curso: python-chess envía `stop` antes del `isready`."""
+        if self._ponder is None or self.engine is None:
+            return
+        self._ponder = None
+        try:
+            self.engine.ping()
+        except Exception:
+            self.fallo = True
+
+    def _tablero_para(self, fen: str) -> "chess.Board":
+        """Tablero de la petición; si es la posición ponderada, con su mismo historial.
+
+        python-chess solo envía `ponderhit` si la pila de jugadas coincide. Se
+        compara la clave Zobrist: colocación, turno, enroques y al paso solo si
+        hay captura posible, como en el tablero de python-chess; los contadores
+        no cuentan porque una FEN sin historial no los trae.
+        """
+        board = chess.Board(fen)
+        if (self._ponder is not None
+                and chess.polyglot.zobrist_hash(self._ponder) == chess.polyglot.zobrist_hash(board)):
+            return self._ponder
+        return board
+
+    def mejor_jugada(self, fen: str, tiempo_ms: Optional[int] = None,
+                     ponder: bool = False) -> Optional[str]:
+        self._iniciar()
         if not self.engine or chess is None:
             return None
         try:
-            board = chess.Board(fen)
-            info = self.engine.play(board, chess.engine.Limit(time=self.tiempo_ms/1000.0))
+            board = self._tablero_para(fen) if ponder else chess.Board(fen)
+            self.tras_ponderhit = board is self._ponder
+            self._ponder = None
+            limite = (tiempo_ms if tiempo_ms is not None else self.tiempo_ms) / 1000.0
+            info = self.engine.play(board, chess.engine.Limit(time=limite),
+                                    game=self._partida, ponder=ponder)
             move = info.move
+            if ponder and move and info.ponder:
+                # python-chess ya lanzó `go ponder` sobre esta posición
+                self._ponder = board.copy()
+                self._ponder.push(move)
+                self._ponder.push(info.ponder)
             # Devolver en formato LAN (e2e4)
             uci = move.uci()
             return uci
         except Exception:
+            self.fallo = True
+            return None
+        finally:
+            self.ultimo_uso = time.monotonic()
+
+    def analizar(self, fen: str, tiempo_ms: Optional[int] = None, nodos: Optional[int] = None,
+                 informar: Optional[Callable[[dict], None]] = None,
+                 jugadas: Optional[List[str]] = None) -> Optional[Tuple[str, dict]]:
+        """Busca `fen` con límite de tiempo y/o de nodos; devuelve (jugada LAN, último `info`).
+
+        `informar` recibe cada `info` con variante principal mientras el motor
+        piensa (para ver cuándo cambia de jugada). `jugadas` (LAN) se juegan
+        desde `fen` antes de buscar, así el motor conoce las repeticiones. Sin
+        límites usa `tiempo_ms` del motor.
+        """
+        self._iniciar()
+        if not self.engine or chess is None:
+            return None
+        try:
+            self._ponder = None
+            if tiempo_ms is None and nodos is None:
+                tiempo_ms = self.tiempo_ms
+            limite = chess.engine.Limit(
+                time=tiempo_ms / 1000.0 if tiempo_ms is not None else None, nodes=nodos)
+            board = chess.Board(fen)
+            for jugada in jugadas or ():
+                board.push_uci(jugada)
+            with self.engine.analysis(board, limite, game=self._partida) as analisis:
+                for info in analisis:
+                    if informar is not None and info.get("pv"):
+                        informar(info)
+                final = analisis.wait()
+            if final.move is None:
+                return None
+            return final.move.uci(), dict(analisis.info)
+        except Exception:
+            self.fallo = True
             return None
-    
+        finally:
+            self.ultimo_uso = time.monotonic()
+
+    def reiniciar(self):
+        self.cerrar()
+        self._iniciar()
+
     def cerrar(self):
         try:
             if self.engine:
                 self.engine.quit()
         except Exception:
             pass
+        self.engine = None
+        self._ponder = None
+
+
+class PoolMotores:
+    """Motores UCI de larga vida, uno por (ruta, opciones), compartidos entre partidas.
+
+    - Arranque diferido: el proceso se lanza en la primera petición
+    - Comprobación de salud si el motor lleva tiempo ocioso o acaba de fallar
+    - Cierre ordenado de todos los procesos con `cerrar_todos`
+    """
+    INTERVALO_SALUD_S = 30.0
+
+    def __init__(self):
+        self._motores: Dict[Tuple[str, tuple], MotorUCI] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(ruta_motor: str, opciones: Optional[Dict[str, object]]) -> Tuple[str, tuple]:
+        return os.path.abspath(ruta_motor), tuple(sorted((opciones or {}).items()))
+
+    def obtener(self, ruta_motor: str, opciones: Optional[Dict[str, object]] = None) -> MotorUCI:
+        """Motor registrado para la ruta y opciones (sin arrancarlo todavía)."""
+        clave = self._clave(ruta_motor, opciones)
+        with self._lock:
+            motor = self._motores.get(clave)
+            if motor is None:
+                motor = MotorUCI(ruta_motor, opciones=opciones)
+                self._motores[clave] = motor
+            return motor
+
+    def disponible(self, ruta_motor: str, opciones: Optional[Dict[str, object]] = None) -> bool:
+        """Arranca el motor si hace falta e indica si respondió al handshake."""
+        motor = self.obtener(ruta_motor, opciones)
+        with motor.lock:
+            return motor.disponible()
+
+    def mejor_jugada(self, ruta_motor: str, fen: str, tiempo_ms: int,
+                     opciones: Optional[Dict[str, object]] = None,
+                     ponder: bool = False) -> Optional[str]:
+        """Pide una jugada al motor del pool; si el proceso murió lo relanza una vez."""
+        motor = self.obtener(ruta_motor, opciones)
+        with motor.lock:
+            if not motor.disponible():
+                return None
+            # Un `isready` cortaría el ponder: mientras pondera no se comprueba
+            ocioso = time.monotonic() - motor.ultimo_uso > self.INTERVALO_SALUD_S
+            if ocioso and motor.ultimo_uso and not motor.ponderando and not motor.saludable():
+                motor.reiniciar()
+            jugada = motor.mejor_jugada(fen, tiempo_ms, ponder)
+            if jugada is None and motor.fallo and not motor.saludable():
+                motor.reiniciar()
+                jugada = motor.mejor_jugada(fen, tiempo_ms, ponder)
+            return jugada
+
+    def detener_ponder(self, ruta_motor: str, opciones: Optional[Dict[str, object]] = None):
+        """Deja ocioso el motor del pool si estaba ponderando."""
+        motor = self.obtener(ruta_motor, opciones)
+        with motor.lock:
+            motor.detener_ponder()
+
+    def nueva_partida(self):
+        """Avisa a todos los motores de que empieza otra partida (`ucinewgame`)."""
+        with self._lock:
+            motores = list(self._motores.values())
+        for motor in motores:
+            motor.nueva_partida()
+
+    def cerrar_todos(self):
+        with self._lock:
+            motores = list(self._motores.values())
+            self._motores.clear()
+        for motor in motores:
+            with motor.lock:
+                motor.cerrar()
+
+
+class GrupoMotores:
+    """N motores UCI iguales (misma ruta y opciones) para trabajos en lote en paralelo.
+
+    Cada trabajo toma un motor libre con `usar()` y lo devuelve al terminar; si
+    falló y ya no responde a `isready` se relanza antes de devolverlo.
+    """
+
+    def __init__(self, ruta_motor: str, cantidad: int,
+                 opciones: Optional[Dict[str, object]] = None):
+        self.motores = [MotorUCI(ruta_motor, opciones=opciones) for _ in range(max(1, cantidad))]
+        self._libres: "queue.Queue[MotorUCI]" = queue.Queue()
+        for motor in self.motores:
+            self._libres.put(motor)
+
+    def arrancar(self) -> bool:
+        """Lanza todos los procesos; False si alguno no completa el handshake."""
+        return all(motor.disponible() for motor in self.motores)
+
+    @contextmanager
+    def usar(self) -> Iterator[MotorUCI]:
+        motor = self._libres.get()
+        try:
+            yield motor
+        finally:
+            if motor.fallo and not motor.saludable():
+                motor.reiniciar()
+            self._libres.put(motor)
+
+    def cerrar(self):
+        for motor in self.motores:
+            motor.cerrar()
+
+
+# Los hilos de python-chess no son daemon: el intérprete los espera antes de
+# ejecutar `atexit`, así que quien use el pool debe llamar a `cerrar_todos`.
+POOL_MOTORES = PoolMotores()
+# Las aperturas se repiten en cada partida: sus respuestas se guardan en disco
+CACHE_JUGADAS = CacheJugadas()
+
+
 class Reglas:
+    """Consultas de reglas con python-chess sobre un espejo incremental del tablero.
+
+    Con la vista de casillas de un `Tablero`, el espejo (`board`) sigue su pila
+    de movimientos con `push`/`pop`, comparando el hash Zobrist de cada
+    posición: una consulta tras una jugada cuesta un `push`, no un FEN. Solo
+    se reconstruye desde FEN (`sincronizar`) si deja de coincidir: otra
+    partida, un FEN cargado o una edición a mano. Con un dict de casillas
+    suelto se compara la colocación y se resincroniza si cambió.
+
+    Las casillas (x, y) usan y = fila - 1, igual que `chess.square`.
+    """
     def __init__(self):
         self.board = chess.Board() if chess is not None else None
+        self.resincronizaciones = 0
+        self._tablero: Optional[Tablero] = None
+        # Profundidad de la pila del Tablero en la que se sincronizó el espejo
+        self._base = 0
+        # Hash del Tablero en cada posición del espejo: la base y una por push
+        self._hashes: List[int] = []
+
+    def sincronizar(self, casillas: Dict[Tuple[int, int], Optional[Pieza]], turno: Color):
+        """Reconstruye el espejo desde FEN (resincronización completa)."""
+        self.resincronizaciones += 1
+        tablero = getattr(casillas, "tablero", None)
+        if isinstance(tablero, Tablero) and tablero.turno == turno:
+            self.board.set_fen(tablero.a_fen())
+            self._tablero = tablero
+            self._base = tablero.profundidad_pila
+            self._hashes = [tablero.hash]
+        else:
+            self.board.set_fen(tablero_a_fen(casillas, turno))
+            self._tablero = None
+            self._hashes = []
+
+    def _seguir(self, tablero: Tablero) -> bool:
+        """Alinea el espejo con la pila de `tablero`; False si hay que resincronizar."""
+        hashes = self._hashes
+        jugados = tablero.profundidad_pila - self._base
+        if jugados < 0:
+            return False
+
+        def hash_tras(i: int) -> int:
+            # Hash del Tablero tras `i` movimientos desde la base
+            if i == jugados:
+                return tablero.hash
+            return tablero.registro_pila(self._base + i)[1]
+
+        # Deshacer lo que el Tablero deshizo (o cambió por otra jugada)
+        while len(hashes) > 1 and (len(hashes) - 1 > jugados
+                                   or hashes[-1] != hash_tras(len(hashes) - 1)):
+            self.board.pop()
+            hashes.pop()
+        if hashes[0] != hash_tras(0):
+            return False
+        # Rehacer lo que el Tablero jugó después
+        for i in range(len(hashes) - 1, jugados):
+            mov = tablero.registro_pila(self._base + i)[0]
+            if not mov:
+                return False
+            promo = mov >> 12
+            self.board.push(chess.Move(mov & 63, (mov >> 6) & 63, promo + 1 if promo else None))
+            hashes.append(hash_tras(i + 1))
+        return True
+
     def actualizar(self, casillas: Dict[Tuple[int, int], Optional[Pieza]], turno: Color):
+        """Deja el espejo en la posición de `casillas` con `turno` al mover."""
         if self.board is None:
             return
-        fen = tablero_a_fen(casillas, turno)
-        self.board.set_fen(fen)
+        tablero = getattr(casillas, "tablero", None)
+        if isinstance(tablero, Tablero):
+            if (tablero is self._tablero and tablero.turno == turno
+                    and self._seguir(tablero)):
+                return
+        else:
+            fen = tablero_a_fen(casillas, turno)
+            if (self._tablero is None and self.board.board_fen() == fen.split()[0]
+                    and self.board.turn == (turno == Color.BLANCO)):
+                return
+        self.sincronizar(casillas, turno)
+
     def es_legal(self, casillas: Dict[Tuple[int, int], Optional[Pieza]], turno: Color, origen: Tuple[int, int], destino: Tuple[int, int]) -> bool:
         if self.board is None:
             return False
         self.actualizar(casillas, turno)
-        o = chess.square(origen[0], 7 - origen[1])
-        d = chess.square(destino[0], 7 - destino[1])
-        return chess.Move(o, d) in self.board.legal_moves
+        o = chess.square(origen[0], origen[1])
+        d = chess.square(destino[0], destino[1])
+        # python-chess toma rey sobre torre propia (e1h1) por un enroque; aquí no lo es
+        if self.board.color_at(d) is not None and self.board.color_at(d) == self.board.color_at(o):
+            return False
+        promocion = None
+        if self.board.piece_type_at(o) == chess.PAWN and chess.square_rank(d) in (0, 7):
+            promocion = chess.QUEEN
+        return self.board.is_legal(chess.Move(o, d, promocion))
+
     def esta_en_jaque(self, casillas: Dict[Tuple[int, int], Optional[Pieza]], turno_consulta: Color) -> bool:
         if self.board is None:
             return False
-        original = self.board.turn
-        self.actualizar(casillas, turno_consulta)
-        self.board.turn = (turno_consulta == Color.BLANCO)
-        res = self.board.is_check()
-        self.board.turn = original
-        return res
+        self.actualizar(casillas, _turno_de(casillas, turno_consulta))
+        color = turno_consulta == Color.BLANCO
+        rey = self.board.king(color)
+        return rey is not None and self.board.is_attacked_by(not color, rey)
+
     def esta_en_jaque_mate(self, casillas: Dict[Tuple[int, int], Optional[Pieza]], turno_consulta: Color) -> bool:
         if self.board is None:
             return False
+        self.actualizar(casillas, _turno_de(casillas, turno_consulta))
         original = self.board.turn
-        self.actualizar(casillas, turno_consulta)
         self.board.turn = (turno_consulta == Color.BLANCO)
         res = self.board.is_checkmate()
         self.board.turn = original
         return res
+
+
+def _turno_de(casillas, por_defecto: Color) -> Color:
+    """Turno real si `casillas` es la vista de un Tablero (para no romper el espejo)."""
+    tablero = getattr(casillas, "tablero", None)
+    return tablero.turno if isinstance(tablero, Tablero) else por_defecto
+
+
 def _ruta_motor_por_defecto(nombre_motor: str) -> Optional[str]:
     """Resuelve una ruta probable del motor UCI según el SO.
 
@@ -200,31 +570,243 @@ def _ruta_motor_por_defecto(nombre_motor: str) -> Optional[str]:
     return None
 
 
+def _copia_tablero(casillas, turno: Color) -> Tablero:
+    """Copia independiente de la posición para buscar sobre ella.
+
+    Si `casillas` es la vista de un `Tablero` se conserva su estado completo
+    (enroques, al paso, repeticiones); si es un dict suelto se pasa por FEN.
+    """
+    tablero = getattr(casillas, "tablero", None)
+    if isinstance(tablero, Tablero):
+        copia = tablero.copiar()
+    else:
+        copia = Tablero()
+        copia.cargar_fen(tablero_a_fen(casillas, turno))
+    copia.turno = turno
+    return copia
+
+
+def _buscar_nativo(busqueda, tiempo_ms: int,
+                   ponder: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """(jugada, réplica esperada) del motor nativo, pasando por la caché de jugadas.
+
+    Una búsqueda cortada por su `parada` no se guarda: su jugada es provisional.
+    Tampoco se guarda la de `ponder`, que pudo pensar mucho más que `tiempo_ms`
+    antes del `ponderhit` y no es comparable con las de `movetime {tiempo_ms}`.
+    En posiciones repetidas o cerca de la regla de 50 no se usa la caché.
+    """
+    fen = busqueda.tablero.a_fen()
+    limite = f"movetime {tiempo_ms}"
+    usar_cache = admite(fen, busqueda.tablero.veces_repetida() > 1)
+    guardada = CACHE_JUGADAS.obtener(fen, MOTOR_NATIVO, limite) if usar_cache else None
+    if guardada is not None:
+        return guardada
+    resultado = busqueda.buscar(tiempo_ms=tiempo_ms, ponder=ponder)
+    esperada = movimiento_a_uci(resultado.pv[1]) if len(resultado.pv) > 1 else None
+    detenida = busqueda.parada is not None and busqueda.parada.is_set()
+    if usar_cache and not ponder and resultado.uci is not None and not detenida:
+        CACHE_JUGADAS.guardar(fen, MOTOR_NATIVO, limite, resultado.uci, esperada)
+    return resultado.uci, esperada
+
+
+def _sugerir_nativo(casillas, turno: Color, tiempo_ms: int,
+                    parada: Optional[threading.Event] = None,
+                    procesos: int = 1) -> Optional[str]:
+    """Busca con el motor nativo sobre una copia del tablero de la partida.
+
+    Activar `parada` corta la búsqueda y devuelve la mejor jugada hallada.
+    Con `procesos` > 1 usa el motor Lazy SMP persistente del proceso.
+    """
+    busqueda = motor_nativo.crear_busqueda(_copia_tablero(casillas, turno), procesos)
+    busqueda.parada = parada
+    return _buscar_nativo(busqueda, tiempo_ms)[0]
+
+
+def _repetida(casillas) -> bool:
+    """Si la posición ya salió antes en la partida (solo se sabe con la vista de un `Tablero`)."""
+    tablero = getattr(casillas, "tablero", None)
+    return isinstance(tablero, Tablero) and tablero.veces_repetida() > 1
+
+
+def _mejor_jugada_uci(ruta_motor: str, fen: str, tiempo_ms: int,
+                      ponder: bool = False, repetida: bool = False) -> Optional[str]:
+    """Jugada del motor UCI del pool, pasando por la caché de jugadas.
+
+    Si la respuesta sale de la caché se detiene el ponder que el motor
+    tuviera en marcha de la jugada anterior, para que no siga gastando CPU.
+    """
+    identidad = POOL_MOTORES.obtener(ruta_motor).identidad
+    limite = f"movetime {tiempo_ms}"
+    usar_cache = admite(fen, repetida)
+    guardada = CACHE_JUGADAS.obtener(fen, identidad, limite) if usar_cache else None
+    if guardada is not None:
+        POOL_MOTORES.detener_ponder(ruta_motor)
+        return guardada[0]
+    jugada = POOL_MOTORES.mejor_jugada(ruta_motor, fen, tiempo_ms, ponder=ponder)
+    # Tras un `ponderhit` el motor pensó más que `tiempo_ms`: no se guarda
+    ponderada = POOL_MOTORES.obtener(ruta_motor).tras_ponderhit
+    if usar_cache and jugada is not None and not ponderada:
+        CACHE_JUGADAS.guardar(fen, identidad, limite, jugada)
+    return jugada
+
+
+def _ruta_uci(motor: str, ruta_motor: Optional[str]) -> Optional[str]:
+    """Ruta del motor UCI listo para usar, o None si toca el motor nativo."""
+    if motor == "nativo":
+        return None
+    if ruta_motor is None:
+        ruta_motor = _ruta_motor_por_defecto(motor)
+    if not ruta_motor:
+        print("No se encontró el binario del motor UCI; se usa el motor nativo.")
+        return None
+    if not POOL_MOTORES.disponible(ruta_motor):
+        print("El motor UCI no está disponible; se usa el motor nativo.")
+        return None
+    return ruta_motor
+
+
 def sugerir_movimiento(
     casillas: Dict[Tuple[int, int], Optional[Pieza]],
     turno: Color,
     motor: str = "stockfish",
     nivel: str = "medio",
-    ruta_motor: Optional[str] = None
+    ruta_motor: Optional[str] = None,
+    parada: Optional[threading.Event] = None,
+    ponder: bool = False,
+    procesos: int = 1
 ) -> Optional[str]:
-    """Devuelve la mejor jugada LAN usando un motor UCI local.
+    """Devuelve la mejor jugada LAN usando un motor UCI local o el nativo.
 
     - Si no se pasa `ruta_motor`, intenta resolver el binario automáticamente.
+    - El motor UCI sale de `POOL_MOTORES` y sigue vivo para las jugadas siguientes.
+    - `motor="nativo"` o la falta de binario usan el motor en Python puro.
+    - `parada` permite cancelar desde otro hilo (ver `TrabajadorMotor`).
+    - `ponder` deja al motor UCI pensando sobre la réplica esperada.
+    - `procesos` > 1 hace que el motor nativo busque con Lazy SMP.
+    - Las respuestas se guardan en `CACHE_JUGADAS` por posición, motor y tiempo.
     """
-    niveles = {"facil": 200, "medio": 500, "dificil": 2000}
-    tiempo_ms = niveles.get(nivel, 500)
-
+    tiempo_ms = motor_nativo.NIVELES_MS.get(nivel, 500)
+    ruta_motor = _ruta_uci(motor, ruta_motor)
     if ruta_motor is None:
-        ruta_motor = _ruta_motor_por_defecto(motor)
-    if not ruta_motor:
-        print("No se encontró el binario del motor UCI.")
+        return _sugerir_nativo(casillas, turno, tiempo_ms, parada, procesos)
+    if parada is not None and parada.is_set():
         return None
+    return _mejor_jugada_uci(ruta_motor, tablero_a_fen(casillas, turno), tiempo_ms, ponder,
+                             _repetida(casillas))
 
-    fen = tablero_a_fen(casillas, turno)
-    m = MotorUCI(ruta_motor, tiempo_ms=tiempo_ms)
-    if not m.disponible():
-        print("El motor UCI no está disponible. Verifica la ruta y permisos del binario.")
-        return None
-    jugada = m.mejor_jugada(fen)
-    m.cerrar()
-    return jugada
+
+class TrabajadorMotor:
+    """Pide jugadas al motor en un hilo de fondo, con ponder opcional.
+
+    `pedir` copia la posición en el hilo que llama y devuelve enseguida un
+    `Future` con la jugada LAN (o None), así el bucle de pygame sigue
+    dibujando y atendiendo eventos mientras el motor piensa. `cancelar`
+    corta la búsqueda nativa al momento; una jugada UCI ya lanzada termina
+    en su tiempo límite y su resultado se descarta.
+
+    Con `ponder`, tras cada respuesta el motor sigue pensando sobre la
+    réplica que espera del rival: el UCI por su cuenta (`go ponder`) y el
+    nativo con una búsqueda sin reloj que lanza `ponderar`. Si el rival
+    juega esa réplica la búsqueda recibe `ponderhit` y suele responder al
+    instante; si no, se detiene y se busca la posición real.
+
+    Con `procesos` > 1 el motor nativo busca con Lazy SMP; sus auxiliares se
+    crean en la primera jugada y siguen vivos hasta `cerrar_paralela`.
+    """
+    def __init__(self, motor: str = "stockfish", nivel: str = "medio",
+                 ruta_motor: Optional[str] = None, ponder: bool = False,
+                 procesos: int = 1):
+        self.motor = motor
+        self.procesos = procesos
+        # El binario se busca una sola vez; si no está o no arranca se queda el nativo
+        self.ruta_motor = None
+        if motor != "nativo":
+            self.ruta_motor = ruta_motor or _ruta_motor_por_defecto(motor)
+            if not self.ruta_motor:
+                print("No se encontró el binario del motor UCI; se usa el motor nativo.")
+        self.tiempo_ms = motor_nativo.NIVELES_MS.get(nivel, 500)
+        self.ponder = ponder
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="motor")
+        self._parada = threading.Event()
+        self._futuro: Optional[Future] = None
+        # Réplica esperada (UCI) tras la última respuesta del motor nativo
+        self._esperada: Optional[str] = None
+        # (búsqueda, futuro, FEN de la posición ponderada) del ponder nativo en curso
+        self._ponder_nativo: Optional[Tuple[object, Future, str]] = None
+
+    def _calcular(self, copia: Tablero, turno: Color, parada: threading.Event) -> Optional[str]:
+        self._esperada = None
+        if self.ruta_motor is not None and not POOL_MOTORES.disponible(self.ruta_motor):
+            print("El motor UCI no está disponible; se usa el motor nativo.")
+            self.ruta_motor = None
+        ruta_motor = self.ruta_motor
+        if ruta_motor is None:
+            busqueda = motor_nativo.crear_busqueda(copia, self.procesos)
+            busqueda.parada = parada
+            return self._buscar_nativo(busqueda)
+        if parada.is_set():
+            return None
+        return _mejor_jugada_uci(ruta_motor, tablero_a_fen(copia.casillas, turno),
+                                 self.tiempo_ms, self.ponder, copia.veces_repetida() > 1)
+
+    def _buscar_nativo(self, busqueda, ponder: bool = False) -> Optional[str]:
+        jugada, self._esperada = _buscar_nativo(busqueda, self.tiempo_ms, ponder)
+        return jugada
+
+    def pedir(self, casillas, turno: Color) -> Future:
+        if self._ponder_nativo is not None:
+            busqueda, futuro, fen_ponder = self._ponder_nativo
+            self._ponder_nativo = None
+            if tablero_a_fen(casillas, turno) == fen_ponder:
+                busqueda.ponderhit()
+                self._futuro = futuro
+                return futuro
+            busqueda.parada.set()
+        self.cancelar()
+        # El tablero de la partida no debe tocarse desde el hilo del motor
+        copia = _copia_tablero(casillas, turno)
+        self._parada = threading.Event()
+        self._futuro = self._ejecutor.submit(self._calcular, copia, turno, self._parada)
+        return self._futuro
+
+    def ponderar(self, casillas, turno: Color):
+        """Tras aplicar la jugada del motor, piensa sobre la réplica esperada (nativo).
+
+        El motor UCI ya pondera solo; aquí no hay nada que hacer para él.
+        """
+        esperada, self._esperada = self._esperada, None
+        if not self.ponder or esperada is None:
+            return
+        copia = _copia_tablero(casillas, turno)
+        mov = uci_a_movimiento(esperada)
+        if mov not in copia.movimientos_legales():
+            return
+        copia.hacer_movimiento(mov)
+        fen_ponder = tablero_a_fen(copia.casillas, copia.turno)
+        busqueda = motor_nativo.crear_busqueda(copia, self.procesos)
+        busqueda.parada = threading.Event()
+        futuro = self._ejecutor.submit(self._buscar_nativo, busqueda, True)
+        self._ponder_nativo = (busqueda, futuro, fen_ponder)
+
+    def pensando(self) -> bool:
+        return self._futuro is not None and not self._futuro.done()
+
+    def cancelar(self):
+        """Descarta la petición en curso (si la hay) y detiene la búsqueda nativa."""
+        if self._futuro is not None:
+            self._futuro.cancel()
+            self._futuro = None
+        self._parada.set()
+        if self._ponder_nativo is not None:
+            self._ponder_nativo[0].parada.set()
+            self._ponder_nativo = None
+
+    def cerrar(self):
+        """Detiene la búsqueda en curso y espera a que el hilo del motor termine.
+
+        Después ya se pueden cerrar los auxiliares de Lazy SMP y su memoria
+        compartida (`cerrar_paralela`). La búsqueda nativa para al momento;
+        una jugada UCI ya lanzada se espera hasta su tiempo límite.
+        """
+        self.cancelar()
+        self._ejecutor.shutdown(wait=True, cancel_futures=True)
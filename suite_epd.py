@@ -0,0 +1,340 @@
+"""Suites de posiciones EPD (WAC, STS...): cuántas resuelve un motor y a qué velocidad.
+
+Responsabilidades:
+- Leer la suite en streaming con `ajedrez_clasico.fen`, sin cargarla entera
+- Repartir las posiciones entre N trabajadores: procesos con el motor nativo
+  o motores UCI persistentes (`reglas.GrupoMotores`), uno por trabajador
+- Con `--procesos`, cada trabajador nativo busca además con Lazy SMP
+- Limitar cada posición por tiempo o por nodos
+- Dar una posición por resuelta si la jugada final está en `bm` y no en `am`,
+  y medir desde cuándo el motor ya no cambió de jugada
+- Resumen: tasa de resueltas, percentiles del tiempo hasta la solución y NPS
+
+Uso:
+    python suite_epd.py wac.epd --tiempo-ms 1000 -j 4
+    python suite_epd.py sts.epd --motor stockfish --nodos 200000 -j 8 --detalle
+    python suite_epd.py wac.epd --tiempo-ms 5000 -j 1 --procesos 8
+
+El motor nativo es Python puro y ligado a CPU: cada trabajador es un proceso
+con su propio tablero y tabla de transposición. Los motores UCI ya corren en
+su propio proceso, así que basta un hilo por motor para mantenerlos ocupados.
+`-j` reparte posiciones (más posiciones por segundo); `--procesos` reparte
+cada búsqueda (más profundidad por posición). Conviene que `-j` por
+`--procesos` no pase del número de núcleos.
+"""
+import argparse
+import functools
+import math
+import os
+import sys
+import time
+from multiprocessing.util import Finalize
+from concurrent.futures import (FIRST_COMPLETED, Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional
+
+try:
+    import chess
+except Exception:
+    chess = None
+
+from ajedrez_clasico import Tablero
+from ajedrez_clasico.fen import codificar, decodificar_lote
+from ajedrez_clasico.motor import Busqueda, BusquedaParalela, TablaTransposicion
+from ajedrez_clasico.movimiento import movimiento_a_uci
+
+# ===== CONFIGURACIÓN POR DEFECTO =====
+TIEMPO_MS_POR_DEFECTO = 1000
+TAMANO_TT_MB = 16
+# Posiciones en vuelo por trabajador: las justas para que ninguno espere
+POSICIONES_EN_VUELO = 2
+PERCENTILES = (50, 90, 99)
+
+
+class Tarea(NamedTuple):
+    """Una posición de la suite con sus jugadas buscadas (`bm`) y prohibidas (`am`) en LAN."""
+    indice: int
+    id: str
+    fen: str
+    mejores: FrozenSet[str]
+    evitar: FrozenSet[str]
+
+
+class ResultadoPosicion(NamedTuple):
+    indice: int
+    id: str
+    jugada: Optional[str]
+    resuelta: bool
+    # Desde cuándo la jugada final fue la elegida (solo si está resuelta)
+    tiempo_solucion: Optional[float]
+    segundos: float
+    nodos: int
+    profundidad: int
+
+
+def _jugadas_epd(tablero: Tablero, fen: str, texto: str, id_posicion: str) -> FrozenSet[str]:
+    """Jugadas de un operando `bm`/`am` (SAN o LAN) convertidas a LAN."""
+    legales = {movimiento_a_uci(m) for m in tablero.movimientos_legales()}
+    jugadas = set()
+    for token in texto.split():
+        limpio = token.rstrip("+#!?")
+        if limpio in legales:
+            jugadas.add(limpio)
+            continue
+        if chess is None:
+            raise ValueError(f"{id_posicion}: leer la jugada SAN {token!r} requiere python-chess")
+        try:
+            jugadas.add(chess.Board(fen).parse_san(limpio).uci())
+        except ValueError:
+            raise ValueError(f"{id_posicion}: jugada {token!r} no válida en {fen}") from None
+    return frozenset(jugadas)
+
+
+def leer_suite(lineas: Iterable[str], omitir_invalidas: bool = False) -> Iterator[Tarea]:
+    """Tareas de una suite EPD, una por línea; se saltan las que no tienen `bm` ni `am`."""
+    indice = 0
+    for tablero, operaciones in decodificar_lote(lineas, omitir_invalidas=omitir_invalidas):
+        if "bm" not in operaciones and "am" not in operaciones:
+            continue
+        indice += 1
+        fen = codificar(tablero)
+        id_posicion = operaciones.get("id", f"#{indice}")
+        try:
+            mejores = _jugadas_epd(tablero, fen, operaciones.get("bm", ""), id_posicion)
+            evitar = _jugadas_epd(tablero, fen, operaciones.get("am", ""), id_posicion)
+        except ValueError:
+            if omitir_invalidas:
+                continue
+            raise
+        yield Tarea(indice, id_posicion, fen, mejores, evitar)
+
+
+def _resultado(tarea: Tarea, jugada: Optional[str], cambio: float, segundos: float,
+               nodos: int, profundidad: int) -> ResultadoPosicion:
+    resuelta = (jugada is not None and jugada not in tarea.evitar
+                and (not tarea.mejores or jugada in tarea.mejores))
+    return ResultadoPosicion(tarea.indice, tarea.id, jugada, resuelta,
+                             cambio if resuelta else None, segundos, nodos, profundidad)
+
+
+# ===== TRABAJADOR NATIVO (un proceso por trabajador) =====
+_busqueda_nativa: Optional[Busqueda] = None
+
+
+def _iniciar_nativo(tamano_mb: int, procesos: int = 1):
+    global _busqueda_nativa
+    if procesos > 1:
+        # Auxiliares persistentes durante toda la suite; se cierran al salir el
+        # trabajador, antes de que multiprocessing cierre las colas (prioridad 10)
+        paralela = BusquedaParalela(procesos, tamano_mb)
+        Finalize(paralela, paralela.cerrar, exitpriority=100)
+        _busqueda_nativa = paralela.busqueda(Tablero())
+    else:
+        _busqueda_nativa = Busqueda(Tablero(), TablaTransposicion(tamano_mb))
+
+
+def _resolver_nativo(tarea: Tarea, tiempo_ms: Optional[int],
+                     nodos: Optional[int]) -> ResultadoPosicion:
+    """Busca la posición con el motor nativo del proceso y la tabla recién vaciada."""
+    busqueda = _busqueda_nativa
+    busqueda.tablero.cargar_fen(tarea.fen)
+    busqueda.tt.limpiar()
+    ultima: List = [None, 0.0]
+
+    def informar(r):
+        if r.uci != ultima[0]:
+            ultima[0], ultima[1] = r.uci, r.segundos
+
+    r = busqueda.buscar(tiempo_ms=tiempo_ms, informar=informar, nodos=nodos)
+    # Al cortar una iteración la jugada aún puede cambiar sin pasar por `informar`
+    cambio = ultima[1] if r.uci == ultima[0] else r.segundos
+    return _resultado(tarea, r.uci, cambio, r.segundos, r.nodos, r.profundidad)
+
+
+# ===== TRABAJADOR UCI (un hilo por motor) =====
+def _resolver_uci(grupo, tarea: Tarea, tiempo_ms: Optional[int],
+                  nodos: Optional[int]) -> ResultadoPosicion:
+    """Busca la posición con un motor libre; `ucinewgame` antes para no heredar la tabla."""
+    with grupo.usar() as motor:
+        motor.nueva_partida()
+        inicio = time.perf_counter()
+        ultima: List = [None, 0.0]
+
+        def informar(info):
+            jugada = info["pv"][0].uci()
+            if jugada != ultima[0]:
+                ultima[0], ultima[1] = jugada, time.perf_counter() - inicio
+
+        respuesta = motor.analizar(tarea.fen, tiempo_ms, nodos, informar)
+        segundos = time.perf_counter() - inicio
+        if respuesta is None:
+            return _resultado(tarea, None, 0.0, segundos, 0, 0)
+        jugada, info = respuesta
+        cambio = ultima[1] if jugada == ultima[0] else segundos
+        return _resultado(tarea, jugada, cambio, segundos,
+                          info.get("nodes", 0), info.get("depth", 0))
+
+
+def repartir(tareas: Iterable, resolver: Callable, ejecutor: Executor,
+             trabajadores: int) -> Iterator:
+    """Resultados de `resolver(tarea)` en el orden en que terminan, con pocas tareas en vuelo.
+
+    No se envía toda la entrada de golpe: así se lee según se consume y la
+    memoria no crece con el tamaño del archivo.
+    """
+    en_vuelo = max(1, trabajadores) * POSICIONES_EN_VUELO
+    pendientes = set()
+    for tarea in tareas:
+        pendientes.add(ejecutor.submit(resolver, tarea))
+        if len(pendientes) >= en_vuelo:
+            hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                yield futuro.result()
+    while pendientes:
+        hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+        for futuro in hechos:
+            yield futuro.result()
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    return ordenados[max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))]
+
+
+class Resumen:
+    """Acumula los resultados según llegan y forma el informe final."""
+
+    def __init__(self):
+        self.total = 0
+        self.resueltas = 0
+        self.sin_respuesta = 0
+        self.nodos = 0
+        self.segundos = 0.0
+        self.tiempos_solucion: List[float] = []
+        self._inicio = time.perf_counter()
+
+    def anotar(self, r: ResultadoPosicion):
+        self.total += 1
+        self.nodos += r.nodos
+        self.segundos += r.segundos
+        if r.jugada is None:
+            self.sin_respuesta += 1
+        if r.resuelta:
+            self.resueltas += 1
+            self.tiempos_solucion.append(r.tiempo_solucion)
+
+    def lineas(self) -> List[str]:
+        pared = time.perf_counter() - self._inicio
+        tasa = 100.0 * self.resueltas / max(self.total, 1)
+        lineas = [f"resueltas: {self.resueltas}/{self.total} ({tasa:.1f} %)"]
+        if self.sin_respuesta:
+            lineas.append(f"sin respuesta del motor: {self.sin_respuesta}")
+        if self.tiempos_solucion:
+            ordenados = sorted(self.tiempos_solucion)
+            lineas.append("tiempo hasta la solución: " + ", ".join(
+                f"p{p} {_percentil(ordenados, p):.3f} s" for p in PERCENTILES))
+        lineas.append(f"nodos: {self.nodos:,} en {self.segundos:.1f} s de búsqueda, "
+                      f"{self.nodos / max(self.segundos, 1e-9):,.0f} nps por trabajador")
+        lineas.append(f"total: {pared:.1f} s de reloj, {self.nodos / max(pared, 1e-9):,.0f} nps, "
+                      f"{self.total / max(pared, 1e-9):.2f} posiciones/s")
+        return lineas
+
+
+def opciones_uci(valores: List[str]) -> Dict[str, object]:
+    """`--opcion Hash=64` -> {"Hash": 64}."""
+    opciones: Dict[str, object] = {}
+    for valor in valores:
+        nombre, igual, dato = valor.partition("=")
+        if not igual:
+            raise ValueError(f"opción UCI sin valor: {valor!r} (se espera NOMBRE=VALOR)")
+        opciones[nombre.strip()] = int(dato) if dato.strip().isdigit() else dato.strip()
+    return opciones
+
+
+def ruta_motor(motor: str) -> Optional[str]:
+    """Ruta de un binario UCI dado por ruta o por nombre ('stockfish', 'lc0')."""
+    if os.path.isfile(motor):
+        return motor
+    from reglas import _ruta_motor_por_defecto
+    return _ruta_motor_por_defecto(motor)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("suite", help="archivo EPD ('-' para la entrada estándar)")
+    parser.add_argument("--motor", default="nativo",
+                        help="'nativo', 'stockfish', 'lc0' o la ruta de un binario UCI")
+    parser.add_argument("-j", "--trabajadores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tiempo-ms", type=int, default=None,
+                        help=f"tiempo por posición (por defecto {TIEMPO_MS_POR_DEFECTO} si no hay --nodos)")
+    parser.add_argument("--nodos", type=int, default=None, help="nodos por posición")
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="procesos Lazy SMP por trabajador nativo (1: sin Lazy SMP)")
+    parser.add_argument("--tt-mb", type=int, default=TAMANO_TT_MB,
+                        help="tabla de transposición de cada proceso nativo")
+    parser.add_argument("--opcion", action="append", default=[], metavar="NOMBRE=VALOR",
+                        help="opción UCI para cada motor (p. ej. Hash=64); se puede repetir")
+    parser.add_argument("--omitir-invalidas", action="store_true",
+                        help="saltar las líneas mal formadas en lugar de abortar")
+    parser.add_argument("--detalle", action="store_true", help="mostrar cada posición al terminar")
+    args = parser.parse_args(argv)
+
+    tiempo_ms = args.tiempo_ms
+    if tiempo_ms is None and args.nodos is None:
+        tiempo_ms = TIEMPO_MS_POR_DEFECTO
+    trabajadores = max(1, args.trabajadores)
+
+    grupo = None
+    if args.motor == "nativo":
+        ejecutor = ProcessPoolExecutor(trabajadores, initializer=_iniciar_nativo,
+                                       initargs=(args.tt_mb, max(1, args.procesos)))
+        resolver = functools.partial(_resolver_nativo, tiempo_ms=tiempo_ms, nodos=args.nodos)
+    else:
+        from reglas import GrupoMotores
+        ruta = ruta_motor(args.motor)
+        if ruta is None:
+            print(f"No se encontró el motor UCI {args.motor!r}", file=sys.stderr)
+            return 1
+        grupo = GrupoMotores(ruta, trabajadores, opciones_uci(args.opcion))
+        if not grupo.arrancar():
+            print(f"El motor UCI {ruta} no responde", file=sys.stderr)
+            grupo.cerrar()
+            return 1
+        ejecutor = ThreadPoolExecutor(trabajadores)
+        resolver = functools.partial(_resolver_uci, grupo, tiempo_ms=tiempo_ms, nodos=args.nodos)
+
+    try:
+        archivo = sys.stdin if args.suite == "-" else open(args.suite, encoding="utf-8")
+    except OSError as e:
+        if grupo is not None:
+            grupo.cerrar()
+        parser.error(f"no se puede abrir la suite: {e}")
+    limite = " ".join(f"{n} {v}" for n, v in (("movetime", tiempo_ms), ("nodes", args.nodos)) if v)
+    smp = f" x {args.procesos} procesos Lazy SMP" if args.motor == "nativo" and args.procesos > 1 else ""
+    print(f"{args.motor}, {trabajadores} trabajadores{smp}, {limite} por posición")
+    resumen = Resumen()
+    try:
+        with ejecutor:
+            tareas = leer_suite(archivo, args.omitir_invalidas)
+            for r in repartir(tareas, resolver, ejecutor, trabajadores):
+                resumen.anotar(r)
+                if args.detalle:
+                    marca = "ok " if r.resuelta else "MAL"
+                    tiempo = f"{r.tiempo_solucion:7.3f} s" if r.resuelta else " " * 9
+                    print(f"  {r.indice:>5} {r.id:<16} {marca} {r.jugada or '-':<6} "
+                          f"{tiempo} p{r.profundidad:<3} {r.nodos:>10} nodos {r.segundos:6.2f} s")
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        if archivo is not sys.stdin:
+            archivo.close()
+        if grupo is not None:
+            grupo.cerrar()
+    for linea in resumen.lineas():
+        print(linea)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
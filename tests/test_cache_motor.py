@@ -0,0 +1,90 @@
+"""Pruebas de la caché de jugadas del motor."""
+import itertools
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from cache_motor import CacheJugadas, RELOJ_MEDIO_MAXIMO, admite
+
+FEN = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+
+
+class TestAdmite(unittest.TestCase):
+
+    def test_reloj_medio(self):
+        self.assertTrue(admite(FEN))
+        self.assertTrue(admite(f"4k3/8/8/8/8/8/8/4K2R w K - {RELOJ_MEDIO_MAXIMO - 1} 60"))
+        self.assertFalse(admite(f"4k3/8/8/8/8/8/8/4K2R w K - {RELOJ_MEDIO_MAXIMO} 60"))
+
+    def test_sin_contadores(self):
+        self.assertTrue(admite("4k3/8/8/8/8/8/8/4K2R w K -"))
+
+    def test_repetida(self):
+        self.assertFalse(admite(FEN, repetida=True))
+
+
+class TestMemoria(unittest.TestCase):
+
+    def test_los_contadores_no_forman_parte_de_la_clave(self):
+        cache = CacheJugadas(ruta=None)
+        cache.guardar(FEN, "motor", "movetime 100", "e7e5", "g1f3")
+        self.assertEqual(cache.obtener(FEN.replace(" 0 1", " 3 7"), "motor", "movetime 100"),
+                         ("e7e5", "g1f3"))
+        self.assertIsNone(cache.obtener(FEN, "otro", "movetime 100"))
+        self.assertIsNone(cache.obtener(FEN, "motor", "movetime 200"))
+
+    def test_expulsa_la_menos_usada(self):
+        cache = CacheJugadas(ruta=None, capacidad_memoria=2)
+        cache.guardar(FEN, "motor", "a", "e7e5")
+        cache.guardar(FEN, "motor", "b", "c7c5")
+        cache.obtener(FEN, "motor", "a")
+        cache.guardar(FEN, "motor", "c", "e7e6")
+        self.assertIsNone(cache.obtener(FEN, "motor", "b"))
+        self.assertEqual(cache.obtener(FEN, "motor", "a"), ("e7e5", None))
+        self.assertEqual(cache.obtener(FEN, "motor", "c"), ("e7e6", None))
+        self.assertEqual((cache.aciertos_memoria, cache.fallos), (3, 1))
+
+
+class TestDisco(unittest.TestCase):
+
+    def setUp(self):
+        carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(carpeta.cleanup)
+        self.ruta = os.path.join(carpeta.name, "sub", "cache.sqlite3")
+        # Un reloj que avanza en cada consulta deja el orden de uso sin empates
+        reloj = mock.patch("cache_motor.time")
+        reloj.start().time.side_effect = itertools.count()
+        self.addCleanup(reloj.stop)
+
+    def _cache(self):
+        cache = CacheJugadas(self.ruta, capacidad_memoria=1, capacidad_disco=10)
+        self.addCleanup(cache.cerrar)
+        return cache
+
+    def test_sobrevive_entre_instancias(self):
+        cache = self._cache()
+        cache.guardar(FEN, "motor", "movetime 100", "e7e5", "g1f3")
+        cache.cerrar()
+        otra = self._cache()
+        self.assertEqual(otra.obtener(FEN, "motor", "movetime 100"), ("e7e5", "g1f3"))
+        self.assertEqual(otra.aciertos_disco, 1)
+
+    def test_expulsa_las_filas_menos_usadas(self):
+        cache = self._cache()
+        for i in range(10):
+            cache.guardar(FEN, "motor", f"movetime {i}", "e7e5")
+        # La 5 y la 0 se vuelven a leer de disco: pasan a ser las más recientes
+        cache.obtener(FEN, "motor", "movetime 5")
+        self.assertEqual(cache.obtener(FEN, "motor", "movetime 0"), ("e7e5", None))
+        cache.guardar(FEN, "motor", "movetime 10", "e7e5")
+        cache.cerrar()
+        with sqlite3.connect(self.ruta) as conexion:
+            limites = {fila[0] for fila in conexion.execute("SELECT limite FROM jugadas")}
+        conexion.close()
+        self.assertEqual(limites, {f"movetime {i}" for i in (0, 3, 4, 5, 6, 7, 8, 9, 10)})
+
+
+if __name__ == "__main__":
+    unittest.main()
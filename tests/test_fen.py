@@ -0,0 +1,124 @@
+"""Pruebas del códec FEN/EPD."""
+import unittest
+
+from ajedrez_clasico import Tablero
+from ajedrez_clasico.fen import FEN_INICIAL, analizar_fen, decodificar_lote
+from ajedrez_clasico.movimiento import movimiento_a_uci
+from ajedrez_clasico.zobrist import calcular_hash
+from modelos import EstadoJuego
+
+
+class TestFENInvalida(unittest.TestCase):
+
+    def assertInvalida(self, fen):
+        with self.assertRaises(ValueError):
+            analizar_fen(fen)
+        with self.assertRaises(ValueError):
+            Tablero().cargar_fen(fen)
+
+    def test_sin_rey(self):
+        self.assertInvalida("8/8/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertInvalida("4k3/8/8/8/8/8/8/8 b - - 0 1")
+
+    def test_dos_reyes_del_mismo_bando(self):
+        self.assertInvalida("4k3/8/8/8/8/8/8/3KK3 w - - 0 1")
+        self.assertInvalida("k3k3/8/8/8/8/8/8/4K3 w - - 0 1")
+
+    def test_digitos_seguidos(self):
+        self.assertInvalida("4k3/8/8/44/8/8/8/4K3 w - - 0 1")
+        self.assertInvalida("4k3/8/8/8/8/8/8/4K12 w - - 0 1")
+
+    def test_peon_en_la_fila_8(self):
+        self.assertInvalida("4k2P/8/8/8/8/8/8/4K3 w - - 0 1")
+
+    def test_peon_en_la_fila_1(self):
+        self.assertInvalida("4k3/8/8/8/8/8/8/p3K3 b - - 0 1")
+
+    def test_al_paso_en_fila_equivocada(self):
+        # Con blancas al turno el al paso va en la fila 6
+        self.assertInvalida("4k3/8/8/3pP3/8/8/8/4K3 w - d3 0 1")
+        self.assertInvalida("4k3/8/8/8/3Pp3/8/8/4K3 b - d6 0 1")
+        self.assertInvalida("4k3/8/8/3pP3/8/8/8/4K3 w - d5 0 1")
+
+    def test_al_paso_sin_peon_que_avanzara_dos(self):
+        # No hay peón negro en d5
+        self.assertInvalida("4k3/8/8/4P3/8/8/8/4K3 w - d6 0 1")
+        # El peón de d5 no pudo pasar por d6: está ocupada
+        self.assertInvalida("4k3/8/3n4/3pP3/8/8/8/4K3 w - d6 0 1")
+
+    def test_lote_omite_las_invalidas(self):
+        lineas = [
+            "4k2P/8/8/8/8/8/8/4K3 w - - 0 1",
+            "8/8/8/8/8/8/8/4K3 w - - 0 1",
+            FEN_INICIAL,
+        ]
+        fens = [t.a_fen() for t, _ in decodificar_lote(lineas, omitir_invalidas=True)]
+        self.assertEqual(fens, [FEN_INICIAL])
+        with self.assertRaises(ValueError):
+            list(decodificar_lote(lineas))
+
+
+class TestFENValida(unittest.TestCase):
+
+    def test_al_paso(self):
+        tablero = Tablero()
+        tablero.cargar_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+        self.assertIn("e5d6", {movimiento_a_uci(m) for m in tablero.movimientos_legales()})
+        self.assertEqual(analizar_fen("4k3/8/8/8/3Pp3/8/8/4K3 b - d3 0 1").al_paso, 19)
+
+    def test_enroque_sin_rey_en_casa_se_descarta(self):
+        tablero = Tablero()
+        tablero.cargar_fen("4k3/8/8/8/8/8/8/R2K3R w K - 0 1")
+        self.assertEqual(tablero.enroques, 0)
+        self.assertEqual(tablero.a_fen(), "4k3/8/8/8/8/8/8/R2K3R w - - 0 1")
+
+    def test_enroque_sin_torres_se_descarta(self):
+        posicion = analizar_fen("4k3/8/8/8/8/8/8/4K3 w KQkq - 0 1")
+        self.assertEqual(posicion.enroques, 0)
+
+    def test_solo_se_conservan_los_enroques_posibles(self):
+        # Falta la torre de h8 y la de a1 es negra
+        tablero = Tablero()
+        tablero.cargar_fen("r3k3/8/8/8/8/8/8/r3K2R w KQkq - 0 1")
+        self.assertEqual(tablero.a_fen().split()[2], "Kq")
+
+    def test_ida_y_vuelta(self):
+        tablero = Tablero()
+        for fen in (FEN_INICIAL,
+                    "r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 3 20",
+                    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"):
+            tablero.cargar_fen(fen)
+            self.assertEqual(tablero.a_fen(), fen)
+
+
+class TestCargaEnLote(unittest.TestCase):
+
+    def test_reutiliza_piezas_sin_arrastrar_estado(self):
+        tablero = Tablero()
+        lineas = [
+            FEN_INICIAL,
+            "r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 3 20",
+            "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1",
+            FEN_INICIAL,
+        ]
+        for (cargado, _), fen in zip(decodificar_lote(lineas, tablero), lineas):
+            self.assertIs(cargado, tablero)
+            self.assertEqual(tablero.a_fen(), fen)
+            self.assertEqual(tablero.hash, calcular_hash(tablero))
+            piezas = [p for p in tablero._tabla if p is not None]
+            self.assertCountEqual(piezas, tablero.listas_piezas[0] + tablero.listas_piezas[1])
+        # Los peones vuelven a poder avanzar dos casillas
+        self.assertIn("e2e4", {movimiento_a_uci(m) for m in tablero.movimientos_legales()})
+
+    def test_estado_se_calcula_al_consultarlo(self):
+        tablero = Tablero()
+        tablero.cargar_fen("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1")
+        self.assertEqual(tablero.estado, EstadoJuego.JAQUE_MATE)
+        tablero.cargar_fen("7k/8/6QK/8/8/8/8/8 b - - 0 1")
+        self.assertEqual(tablero.estado, EstadoJuego.EMPATE)
+        tablero.cargar_fen(FEN_INICIAL)
+        self.assertEqual(tablero.estado, EstadoJuego.JUGANDO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Pruebas del generador de movimientos legales."""
+import unittest
+
+from ajedrez_clasico import Pieza, Tablero
+from ajedrez_clasico.bitboards import ENROQUE_BLANCO_CORTO, ENROQUE_BLANCO_LARGO
+from ajedrez_clasico.movimiento import movimiento_a_uci
+from modelos import Color, TipoPieza
+
+
+def _legales(tablero):
+    return {movimiento_a_uci(m) for m in tablero.movimientos_legales()}
+
+
+def _posicion(piezas, enroques):
+    """Tablero con solo `piezas` ({(x, y): (color, tipo)}), blancas al turno."""
+    tablero = Tablero()
+    for pos in tablero.casillas:
+        tablero.casillas[pos] = None
+    for pos, (color, tipo) in piezas.items():
+        tablero.casillas[pos] = Pieza(color, tipo)
+    tablero.enroques = enroques
+    return tablero
+
+
+REY_NEGRO = {(4, 7): (Color.NEGRO, TipoPieza.REY)}
+
+
+class TestEnroque(unittest.TestCase):
+
+    def test_sin_rey_en_casa_no_hay_enroque(self):
+        # Derecho de enroque incoherente: el rey está en d1, no en e1
+        tablero = _posicion({**REY_NEGRO, (3, 0): (Color.BLANCO, TipoPieza.REY),
+                             (0, 0): (Color.BLANCO, TipoPieza.TORRE),
+                             (7, 0): (Color.BLANCO, TipoPieza.TORRE)},
+                            ENROQUE_BLANCO_CORTO | ENROQUE_BLANCO_LARGO)
+        legales = _legales(tablero)
+        self.assertNotIn("e1g1", legales)
+        self.assertNotIn("e1c1", legales)
+        for mov in tablero.movimientos_legales():
+            tablero.hacer_movimiento(mov)
+            tablero.deshacer_movimiento()
+
+    def test_sin_torre_en_casa_no_hay_enroque(self):
+        tablero = _posicion({**REY_NEGRO, (4, 0): (Color.BLANCO, TipoPieza.REY),
+                             (7, 1): (Color.BLANCO, TipoPieza.TORRE)},
+                            ENROQUE_BLANCO_CORTO)
+        self.assertNotIn("e1g1", _legales(tablero))
+
+    def test_enroque_normal(self):
+        tablero = _posicion({**REY_NEGRO, (4, 0): (Color.BLANCO, TipoPieza.REY),
+                             (0, 0): (Color.BLANCO, TipoPieza.TORRE),
+                             (7, 0): (Color.BLANCO, TipoPieza.TORRE)},
+                            ENROQUE_BLANCO_CORTO | ENROQUE_BLANCO_LARGO)
+        legales = _legales(tablero)
+        self.assertIn("e1g1", legales)
+        self.assertIn("e1c1", legales)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Pruebas del motor nativo: búsqueda, SEE, tabla de transposición y ordenación."""
+import unittest
+
+from ajedrez_clasico import Tablero
+from ajedrez_clasico.evaluacion import VALORES_PIEZA
+from ajedrez_clasico.bitboards import CABALLO, PEON, REINA, TORRE
+from ajedrez_clasico.movimiento import movimiento_a_uci, uci_a_movimiento
+from ajedrez_clasico.motor import MATE, buscar
+from ajedrez_clasico.motor.bench import ejecutar
+from ajedrez_clasico.motor.busqueda import Opciones
+from ajedrez_clasico.motor.intercambio import see
+from ajedrez_clasico.motor.ordenacion import Ordenacion
+from ajedrez_clasico.motor.transposicion import (
+    TablaTransposicion, EXACTA, INFERIOR, SUPERIOR,
+)
+
+
+def _tablero(fen):
+    tablero = Tablero()
+    tablero.cargar_fen(fen)
+    return tablero
+
+
+class TestMate(unittest.TestCase):
+
+    def test_mate_en_1(self):
+        resultado = buscar(_tablero("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), profundidad=2)
+        self.assertEqual(resultado.uci, "a1a8")
+        self.assertEqual(resultado.puntuacion, MATE - 1)
+
+    def test_mate_del_pastor(self):
+        fen = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
+        resultado = buscar(_tablero(fen), profundidad=2)
+        self.assertEqual(resultado.uci, "h5f7")
+        self.assertEqual(resultado.puntuacion, MATE - 1)
+
+    def test_mate_en_2(self):
+        resultado = buscar(_tablero("k7/8/2K5/8/8/8/8/7R w - - 0 1"), profundidad=4)
+        self.assertEqual(resultado.puntuacion, MATE - 3)
+        self.assertEqual(len(resultado.pv), 3)
+
+    def test_mate_en_2_con_sacrificio(self):
+        fen = "6k1/pp4p1/2p5/2bp4/8/P5Pb/1P3rrP/2BRRN1K b - - 0 1"
+        resultado = buscar(_tablero(fen), profundidad=4)
+        self.assertEqual(resultado.uci, "g2g1")
+        self.assertEqual(resultado.puntuacion, MATE - 3)
+
+    def test_mateado_y_ahogado(self):
+        mateado = buscar(_tablero("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1"), profundidad=2)
+        self.assertIsNone(mateado.mejor)
+        self.assertEqual(mateado.puntuacion, -MATE)
+        ahogado = buscar(_tablero("7k/8/6QK/8/8/8/8/8 b - - 0 1"), profundidad=2)
+        self.assertIsNone(ahogado.mejor)
+        self.assertEqual(ahogado.puntuacion, 0)
+
+
+class TestSEE(unittest.TestCase):
+
+    def _see(self, fen, uci):
+        return see(_tablero(fen), uci_a_movimiento(uci))
+
+    def test_captura_defendida_que_gana(self):
+        self.assertEqual(self._see("4k3/8/3p4/4n3/3P4/8/8/4K3 w - - 0 1", "d4e5"),
+                         VALORES_PIEZA[CABALLO] - VALORES_PIEZA[PEON])
+
+    def test_captura_defendida_que_pierde(self):
+        self.assertEqual(self._see("4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1", "e1e5"),
+                         VALORES_PIEZA[PEON] - VALORES_PIEZA[REINA])
+
+    def test_captura_sin_defensa(self):
+        self.assertEqual(self._see("4k3/8/8/4p3/8/8/8/4RK2 w - - 0 1", "e1e5"),
+                         VALORES_PIEZA[PEON])
+
+    def test_rayos_x(self):
+        # La segunda torre blanca recaptura a través de la primera
+        self.assertEqual(self._see("4r1k1/8/8/4p3/8/8/4R3/4R1K1 w - - 0 1", "e2e5"),
+                         VALORES_PIEZA[PEON])
+        self.assertEqual(self._see("4r1k1/8/8/4p3/8/8/8/4R1K1 w - - 0 1", "e1e5"),
+                         VALORES_PIEZA[PEON] - VALORES_PIEZA[TORRE])
+
+    def test_al_paso(self):
+        self.assertEqual(self._see("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6"),
+                         VALORES_PIEZA[PEON])
+
+
+class TestTablaTransposicion(unittest.TestCase):
+
+    def test_guardar_y_sondear(self):
+        tt = TablaTransposicion(1)
+        mov = uci_a_movimiento("e7e8q")
+        entradas = [
+            (0x1234_5678_9ABC_DEF0, 7, -350, SUPERIOR, 0),
+            (0x0FED_CBA9_8765_4321, 12, MATE - 5, EXACTA, mov),
+            ((1 << 64) - 1, 0, 25, INFERIOR, uci_a_movimiento("g1f3")),
+        ]
+        for clave, profundidad, puntuacion, cota, jugada in entradas:
+            tt.guardar(clave, profundidad, puntuacion, cota, jugada)
+        for clave, profundidad, puntuacion, cota, jugada in entradas:
+            self.assertEqual(tt.sondear(clave), (jugada, puntuacion, profundidad, cota))
+        self.assertIsNone(tt.sondear(0x1111_2222_3333_4444))
+
+    def test_conserva_la_jugada_conocida(self):
+        tt = TablaTransposicion(1)
+        mov = uci_a_movimiento("d2d4")
+        tt.guardar(42, 3, 10, EXACTA, mov)
+        tt.guardar(42, 5, -20, SUPERIOR)
+        self.assertEqual(tt.sondear(42), (mov, -20, 5, SUPERIOR))
+
+    def test_la_entrada_profunda_no_se_pierde(self):
+        tt = TablaTransposicion(1)
+        cubetas = len(tt.datos) // 4
+        profunda, somera = 7, 7 + cubetas
+        tt.guardar(profunda, 10, 1, EXACTA)
+        tt.guardar(somera, 2, 2, EXACTA)
+        self.assertEqual(tt.sondear(profunda)[2], 10)
+        self.assertEqual(tt.sondear(somera)[2], 2)
+        tt.limpiar()
+        self.assertIsNone(tt.sondear(profunda))
+
+
+class TestOrdenacion(unittest.TestCase):
+
+    def test_hash_capturas_y_capturas_malas(self):
+        # Dxe5 pierde la dama (defiende d6); cxd5 y Cxd5 ganan material
+        tablero = _tablero("4k3/8/3p4/3qp3/2P5/4N3/8/Q3K3 w - - 0 1")
+        orden = Ordenacion()
+        movimientos = tablero.movimientos_legales()
+        mov_tt = uci_a_movimiento("e1f2")
+        ordenadas = [movimiento_a_uci(m) for m in orden.ordenar(tablero, movimientos, mov_tt)]
+        self.assertEqual(ordenadas[0], "e1f2")
+        self.assertEqual(ordenadas[1:3], ["c4d5", "e3d5"])
+        self.assertEqual(ordenadas[-1], "a1e5")
+        capturas = [m for m in movimientos if not orden.es_tranquilo(tablero, m)]
+        self.assertEqual([movimiento_a_uci(m) for m in orden.ordenar_capturas(tablero, capturas)],
+                         ["c4d5", "e3d5"])
+
+    def test_killers_e_historia(self):
+        tablero = _tablero("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+        orden = Ordenacion()
+        killer = uci_a_movimiento("a1a7")
+        historia = uci_a_movimiento("a1a2")
+        orden.registrar_corte(tablero, historia, 1, 3)
+        orden.registrar_corte(tablero, killer, 4, 0)
+        ordenadas = orden.ordenar(tablero, tablero.movimientos_legales(), ply=0)
+        self.assertEqual(ordenadas[0], killer)
+        self.assertEqual(ordenadas[1], historia)
+
+
+class TestBench(unittest.TestCase):
+    """Nodos del banco a profundidad fija: cualquier cambio en la búsqueda los mueve."""
+
+    NODOS_PROFUNDIDAD_4 = {
+        None: 59710,
+        "ordenacion": 391869,
+        "quiescencia": 53083,
+        "poda_see": 152198,
+        "pvs": 69025,
+        "nulo": 69718,
+        "lmr": 65329,
+        "aspiracion": 59729,
+    }
+
+    def test_nodos_por_opcion(self):
+        for campo, esperados in self.NODOS_PROFUNDIDAD_4.items():
+            opciones = Opciones() if campo is None else Opciones(**{campo: False})
+            with self.subTest(desactivada=campo):
+                self.assertEqual(ejecutar(opciones, 4)[0], esperados)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Pruebas de reglas.py: el espejo de python-chess, el trabajador de fondo y el ponder nativo."""
+import concurrent.futures
+import random
+import time
+import unittest
+from unittest import mock
+
+from ajedrez_clasico import Tablero
+from ajedrez_clasico.movimiento import movimiento_a_uci, uci_a_movimiento
+from cache_motor import CacheJugadas
+from reglas import Reglas, TrabajadorMotor, chess
+
+
+def _legales(tablero):
+    return {movimiento_a_uci(m) for m in tablero.movimientos_legales()}
+
+
+def _cache_en_memoria(prueba):
+    """Sustituye la caché de jugadas global por una vacía que no toca disco."""
+    parche = mock.patch("reglas.CACHE_JUGADAS", CacheJugadas(ruta=None))
+    prueba.addCleanup(parche.stop)
+    return parche.start()
+
+
+@unittest.skipIf(chess is None, "python-chess no está instalado")
+class TestReglas(unittest.TestCase):
+
+    POSICIONES = (
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1",
+    )
+
+    def _comparar(self, reglas, tablero):
+        board = chess.Board(tablero.a_fen())
+        legales = {(m.from_square, m.to_square) for m in board.legal_moves}
+        for origen in range(64):
+            for destino in range(64):
+                esperado = (origen, destino) in legales
+                obtenido = reglas.es_legal(tablero.casillas, tablero.turno,
+                                           (origen % 8, origen // 8), (destino % 8, destino // 8))
+                if obtenido != esperado:
+                    self.fail(f"{tablero.a_fen()}: {chess.square_name(origen)}"
+                              f"{chess.square_name(destino)} debería ser {esperado}")
+
+    def test_es_legal_coincide_con_python_chess(self):
+        # Partidas al azar: el espejo se sigue con push/pop y a veces se deshace
+        azar = random.Random(2024)
+        reglas = Reglas()
+        for fen in self.POSICIONES:
+            tablero = Tablero()
+            tablero.cargar_fen(fen)
+            for _ in range(8):
+                self._comparar(reglas, tablero)
+                movimientos = tablero.movimientos_legales()
+                if not movimientos:
+                    break
+                if tablero.profundidad_pila and azar.random() < 0.25:
+                    tablero.deshacer_movimiento()
+                else:
+                    tablero.hacer_movimiento(azar.choice(movimientos))
+        self.assertEqual(reglas.resincronizaciones, len(self.POSICIONES))
+
+
+class TestTrabajadorMotor(unittest.TestCase):
+
+    def setUp(self):
+        self.tablero = Tablero()
+        self.cache = _cache_en_memoria(self)
+
+    def _trabajador(self, **opciones):
+        trabajador = TrabajadorMotor(motor="nativo", **opciones)
+        self.addCleanup(trabajador.cerrar)
+        return trabajador
+
+    def test_pedir_devuelve_una_jugada_legal(self):
+        trabajador = self._trabajador(nivel="facil")
+        futuro = trabajador.pedir(self.tablero.casillas, self.tablero.turno)
+        self.assertIn(futuro.result(timeout=10), _legales(self.tablero))
+        self.assertFalse(trabajador.pensando())
+
+    def test_la_segunda_peticion_sale_de_la_cache(self):
+        trabajador = self._trabajador(nivel="facil")
+        primera = trabajador.pedir(self.tablero.casillas, self.tablero.turno).result(timeout=10)
+        segunda = trabajador.pedir(self.tablero.casillas, self.tablero.turno).result(timeout=10)
+        self.assertEqual(primera, segunda)
+        self.assertEqual(self.cache.aciertos_memoria, 1)
+
+    def test_cancelar_corta_la_busqueda(self):
+        trabajador = self._trabajador(nivel="dificil")
+        futuro = trabajador.pedir(self.tablero.casillas, self.tablero.turno)
+        time.sleep(0.05)
+        inicio = time.perf_counter()
+        trabajador.cancelar()
+        hechos, _ = concurrent.futures.wait([futuro], timeout=1)
+        self.assertEqual(hechos, {futuro})
+        self.assertLess(time.perf_counter() - inicio, 1)
+        self.assertFalse(trabajador.pensando())
+
+    def test_el_tablero_de_la_partida_no_se_toca(self):
+        trabajador = self._trabajador(nivel="facil")
+        fen = self.tablero.a_fen()
+        jugada = trabajador.pedir(self.tablero.casillas, self.tablero.turno).result(timeout=10)
+        self.assertEqual(self.tablero.a_fen(), fen)
+        self.tablero.hacer_movimiento(uci_a_movimiento(jugada))
+        self.assertNotEqual(self.tablero.a_fen(), fen)
+
+
+class TestPonderNativo(unittest.TestCase):
+
+    def setUp(self):
+        self.tablero = Tablero()
+        self.cache = _cache_en_memoria(self)
+        self.trabajador = TrabajadorMotor(motor="nativo", nivel="facil", ponder=True)
+        self.addCleanup(self.trabajador.cerrar)
+        jugada = self.trabajador.pedir(self.tablero.casillas, self.tablero.turno).result(timeout=10)
+        self.tablero.hacer_movimiento(uci_a_movimiento(jugada))
+        self.esperada = self.trabajador._esperada
+        self.assertIsNotNone(self.esperada)
+        self.trabajador.ponderar(self.tablero.casillas, self.tablero.turno)
+        self.assertIsNotNone(self.trabajador._ponder_nativo)
+        self.busqueda, self.futuro_ponder, _ = self.trabajador._ponder_nativo
+
+    def test_ponderhit_reutiliza_la_busqueda(self):
+        self.tablero.hacer_movimiento(uci_a_movimiento(self.esperada))
+        futuro = self.trabajador.pedir(self.tablero.casillas, self.tablero.turno)
+        self.assertIs(futuro, self.futuro_ponder)
+        self.assertIn(futuro.result(timeout=10), _legales(self.tablero))
+        self.assertFalse(self.busqueda.parada.is_set())
+        # Pensó sin reloj antes del ponderhit: su respuesta no va a la caché
+        self.assertEqual(len(self.cache._memoria), 1)
+
+    def test_otra_replica_detiene_el_ponder(self):
+        otra = sorted(_legales(self.tablero) - {self.esperada})[0]
+        self.tablero.hacer_movimiento(uci_a_movimiento(otra))
+        futuro = self.trabajador.pedir(self.tablero.casillas, self.tablero.turno)
+        self.assertIsNot(futuro, self.futuro_ponder)
+        self.assertTrue(self.busqueda.parada.is_set())
+        self.assertIn(futuro.result(timeout=10), _legales(self.tablero))
+        self.assertIsNone(self.trabajador._ponder_nativo)
+
+
+if __name__ == "__main__":
+    unittest.main()
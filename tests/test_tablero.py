@@ -0,0 +1,75 @@
+"""Pruebas del estado incremental de `Tablero` (hash Zobrist)."""
+import unittest
+
+from ajedrez_clasico import Tablero
+from ajedrez_clasico.movimiento import crear_movimiento
+from ajedrez_clasico.zobrist import calcular_hash
+from modelos import Color
+
+
+class TestHash(unittest.TestCase):
+
+    def test_cambiar_turno_tras_avance_doble(self):
+        # Tras 1.h3 d5 2.h4 d4 3.e4 el peón de d4 puede capturar al paso: la clave cuenta
+        tablero = Tablero()
+        for origen, destino in ((15, 23), (51, 35), (23, 31), (35, 27), (12, 28)):
+            tablero.hacer_movimiento(crear_movimiento(origen, destino))
+        self.assertEqual(tablero.al_paso, 20)
+        self.assertEqual(tablero.hash, calcular_hash(tablero))
+        tablero.turno = Color.BLANCO
+        self.assertIsNone(tablero.al_paso)
+        self.assertEqual(tablero.hash, calcular_hash(tablero))
+        tablero.turno = Color.NEGRO
+        self.assertEqual(tablero.hash, calcular_hash(tablero))
+
+    def test_hacer_y_deshacer_conserva_el_hash(self):
+        tablero = Tablero()
+        inicial = tablero.hash
+        for mov in tablero.movimientos_legales():
+            tablero.hacer_movimiento(mov)
+            self.assertEqual(tablero.hash, calcular_hash(tablero))
+            tablero.deshacer_movimiento()
+        self.assertEqual(tablero.hash, inicial)
+
+
+class TestRepeticion(unittest.TestCase):
+
+    def _jugar(self, tablero, *movimientos):
+        for origen, destino in movimientos:
+            tablero.hacer_movimiento(crear_movimiento(origen, destino))
+
+    def test_repeticion_normal(self):
+        tablero = Tablero()
+        tablero.cargar_fen("7k/8/8/8/8/8/8/K7 w - - 0 1")
+        self._jugar(tablero, (0, 1), (63, 62), (1, 0), (62, 63))
+        self.assertEqual(tablero.veces_repetida(), 2)
+
+    def test_el_nulo_corta_la_repeticion(self):
+        # Ka1 / Kh8 con blancas al turno vuelve a salir tras un nulo y un triángulo
+        tablero = Tablero()
+        tablero.cargar_fen("7k/8/8/8/8/8/8/K7 w - - 0 1")
+        self._jugar(tablero, (0, 1), (63, 62), (1, 9), (62, 63))
+        tablero.hacer_nulo()
+        self.assertEqual(tablero.veces_repetida(), 1)
+        self._jugar(tablero, (63, 62), (9, 0), (62, 63))
+        self.assertEqual(tablero.veces_repetida(), 1)
+        # Dentro de la línea del nulo las repeticiones sí cuentan
+        self._jugar(tablero, (0, 1), (63, 62), (1, 0), (62, 63))
+        self.assertEqual(tablero.veces_repetida(), 2)
+        for _ in range(7):
+            tablero.deshacer_movimiento()
+        tablero.deshacer_nulo()
+        self.assertEqual(tablero.veces_repetida(), 1)
+        self._jugar(tablero, (9, 0))
+        self.assertEqual(tablero.veces_repetida(), 1)
+
+    def test_la_vuelta_a_la_posicion_del_nulo_cuenta(self):
+        tablero = Tablero()
+        tablero.cargar_fen("7k/8/8/8/8/8/8/K7 w - - 0 1")
+        tablero.hacer_nulo()
+        self._jugar(tablero, (63, 62), (0, 1), (62, 63), (1, 0))
+        self.assertEqual(tablero.veces_repetida(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()